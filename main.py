@@ -3,6 +3,13 @@ Main application entry point for YouTube Dubbing AI Agent.
 Railway deployment entry point.
 """
 
+# Patch blocking I/O (sockets, subprocess) before Flask and the services are imported
+try:
+    from gevent import monkey
+    monkey.patch_all()
+except ImportError:
+    pass
+
 import os
 import sys
 import logging
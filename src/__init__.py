@@ -458,6 +458,7 @@ def initialize_celery(app):
             task_time_limit=1800,  # 30 minutes
             task_soft_time_limit=1500,  # 25 minutes
             worker_prefetch_multiplier=1,
+            worker_max_tasks_per_child=100,  # Recycle workers that may have leaked DB state
             task_acks_late=True
         )
         
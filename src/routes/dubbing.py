@@ -1,9 +1,19 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, make_response
 from flask_cors import cross_origin
+import fastjsonschema
 import logging
 import os
+import re
 import tempfile
 import shutil
+import time
+from functools import lru_cache
+from urllib.parse import quote
+from celery import chain
+from celery.exceptions import Ignore
+from celery.signals import worker_process_shutdown
+from celery.utils import uuid
+from requests.exceptions import RequestException
 from src.models.video_task import VideoTask, db
 from src.services import (
     GeminiCLIService, 
@@ -13,10 +23,40 @@ from src.services import (
 )
 from src.celery_app import celery  # Import from separate celery app file
 
+try:
+    import gevent
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 dubbing_bp = Blueprint('dubbing', __name__)
 
+# Request payload schema, compiled once at import time
+validate_start_dubbing = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['youtube_url', 'target_language', 'user_id'],
+    'properties': {
+        'youtube_url': {'type': 'string', 'minLength': 1},
+        'target_language': {'type': 'string', 'minLength': 1},
+        'source_language': {'type': 'string', 'default': 'auto'},
+        # Clients may send the id as a JSON number or a numeric string
+        'user_id': {'type': ['integer', 'string'], 'minimum': 1, 'pattern': '^[1-9][0-9]*$'},
+        'voice_style': {'type': 'string', 'default': 'natural'},
+        'quality_level': {'type': 'string', 'default': 'high'}
+    }
+})
+
+# How long the supported-languages payload may be cached (seconds)
+SUPPORTED_LANGUAGES_TTL = 3600
+
+# Cache lifetime for a payload built while a Gemini or Polly lookup failed
+SUPPORTED_LANGUAGES_RETRY_TTL = 60
+
+# Characters stripped from video titles when building download filenames
+UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]+')
+
 # Initialize services
 gemini_service = GeminiCLIService()
 youtube_service = YouTubeService()
@@ -27,25 +67,18 @@ audio_service = AudioService()
 def start_dubbing():
     """Start the video dubbing process."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-
-        # Extract and validate required parameters
-        youtube_url = data.get('youtube_url')
-        target_language = data.get('target_language')
-        source_language = data.get('source_language', 'auto')
-        user_id = data.get('user_id')
-        
-        # Additional parameters
-        voice_style = data.get('voice_style', 'natural')
-        quality_level = data.get('quality_level', 'high')
-
-        # Validation
-        if not all([youtube_url, target_language, user_id]):
-            return jsonify({
-                'error': 'youtube_url, target_language, and user_id are required'
-            }), 400
+        # Validate payload and fill in defaults for optional parameters
+        try:
+            data = validate_start_dubbing(request.get_json(silent=True) or {})
+        except fastjsonschema.JsonSchemaException as e:
+            return jsonify({'error': e.message}), 400
+
+        youtube_url = data['youtube_url']
+        target_language = data['target_language']
+        source_language = data['source_language']
+        user_id = int(data['user_id'])
+        voice_style = data['voice_style']
+        quality_level = data['quality_level']
 
         # Enhanced URL validation
         if not youtube_service.validate_video_url(youtube_url):
@@ -79,8 +112,8 @@ def start_dubbing():
         db.session.add(task)
         db.session.commit()
 
-        # Queue the dubbing task
-        celery_task = dubbing_task.delay(task.id)
+        # Queue the dubbing pipeline; its final stage id is used for progress tracking
+        celery_task = build_dubbing_pipeline(task.id).apply_async()
         
         # Update task with Celery task ID
         task.celery_task_id = celery_task.id
@@ -192,36 +225,18 @@ def list_tasks():
 def get_supported_languages():
     """Get list of supported languages for dubbing."""
     try:
-        # Get languages from Gemini CLI
-        gemini_languages = gemini_service.get_supported_languages()
-        
-        # Get available voices from AWS Polly
-        polly_voices = audio_service.get_available_voices()
-
-        # Enhanced language mappings with voice support
-        common_languages = {
-            'en-US': {'name': 'English (US)', 'voices': ['Joanna', 'Matthew', 'Amy']},
-            'en-GB': {'name': 'English (UK)', 'voices': ['Emma', 'Brian']},
-            'es-ES': {'name': 'Spanish (Spain)', 'voices': ['Lucia', 'Enrique']},
-            'es-MX': {'name': 'Spanish (Mexico)', 'voices': ['Mia']},
-            'fr-FR': {'name': 'French', 'voices': ['Lea', 'Mathieu']},
-            'de-DE': {'name': 'German', 'voices': ['Marlene', 'Hans']},
-            'it-IT': {'name': 'Italian', 'voices': ['Bianca', 'Giorgio']},
-            'pt-BR': {'name': 'Portuguese (Brazil)', 'voices': ['Camila', 'Ricardo']},
-            'ja-JP': {'name': 'Japanese', 'voices': ['Mizuki', 'Takumi']},
-            'ko-KR': {'name': 'Korean', 'voices': ['Seoyeon']},
-            'zh-CN': {'name': 'Chinese (Mandarin)', 'voices': ['Zhiyu']},
-            'hi-IN': {'name': 'Hindi', 'voices': ['Aditi', 'Raveena']},
-            'ar-AE': {'name': 'Arabic', 'voices': ['Zeina']},
-            'ru-RU': {'name': 'Russian', 'voices': ['Tatyana', 'Maxim']}
-        }
-
-        return jsonify({
-            'supported_languages': common_languages,
-            'gemini_languages': gemini_languages or {},
-            'polly_voices': polly_voices,
-            'total_languages': len(common_languages)
-        }), 200
+        # The payload changes at most hourly, so it is built once per TTL window
+        time_bucket = int(time.time() // SUPPORTED_LANGUAGES_TTL)
+        payload, complete, built_at = build_supported_languages(time_bucket)
+        if not complete and time.monotonic() - built_at >= SUPPORTED_LANGUAGES_RETRY_TTL:
+            # A degraded payload is only kept for the retry window, then the lookups run again
+            build_supported_languages.cache_clear()
+            payload, complete, built_at = build_supported_languages(time_bucket)
+        max_age = SUPPORTED_LANGUAGES_TTL if complete else SUPPORTED_LANGUAGES_RETRY_TTL
+
+        response = jsonify(payload)
+        response.headers['Cache-Control'] = f'public, max-age={max_age}'
+        return response, 200
 
     except Exception as e:
         logger.error(f"Error getting supported languages: {e}")
@@ -231,6 +246,54 @@ def get_supported_languages():
             'fallback': True
         }), 500
 
+@lru_cache(maxsize=1)
+def build_supported_languages(time_bucket):
+    """
+    Build the supported-languages payload; cached per time bucket.
+
+    Returns (payload, complete, built_at), where complete is False if the
+    Gemini or Polly lookup failed and the payload is missing their data, and
+    built_at is the time.monotonic() reading when it was built.
+    """
+    # Query Gemini CLI languages and AWS Polly voices concurrently
+    if GEVENT_AVAILABLE:
+        gemini_job = gevent.spawn(gemini_service.get_supported_languages)
+        polly_job = gevent.spawn(audio_service.get_available_voices)
+        gevent.joinall([gemini_job, polly_job])
+        # A greenlet that raised leaves value as None
+        gemini_languages = gemini_job.value
+        polly_voices = polly_job.value or []
+    else:
+        gemini_languages = gemini_service.get_supported_languages()
+        polly_voices = audio_service.get_available_voices()
+
+    # Enhanced language mappings with voice support
+    common_languages = {
+        'en-US': {'name': 'English (US)', 'voices': ['Joanna', 'Matthew', 'Amy']},
+        'en-GB': {'name': 'English (UK)', 'voices': ['Emma', 'Brian']},
+        'es-ES': {'name': 'Spanish (Spain)', 'voices': ['Lucia', 'Enrique']},
+        'es-MX': {'name': 'Spanish (Mexico)', 'voices': ['Mia']},
+        'fr-FR': {'name': 'French', 'voices': ['Lea', 'Mathieu']},
+        'de-DE': {'name': 'German', 'voices': ['Marlene', 'Hans']},
+        'it-IT': {'name': 'Italian', 'voices': ['Bianca', 'Giorgio']},
+        'pt-BR': {'name': 'Portuguese (Brazil)', 'voices': ['Camila', 'Ricardo']},
+        'ja-JP': {'name': 'Japanese', 'voices': ['Mizuki', 'Takumi']},
+        'ko-KR': {'name': 'Korean', 'voices': ['Seoyeon']},
+        'zh-CN': {'name': 'Chinese (Mandarin)', 'voices': ['Zhiyu']},
+        'hi-IN': {'name': 'Hindi', 'voices': ['Aditi', 'Raveena']},
+        'ar-AE': {'name': 'Arabic', 'voices': ['Zeina']},
+        'ru-RU': {'name': 'Russian', 'voices': ['Tatyana', 'Maxim']}
+    }
+
+    payload = {
+        'supported_languages': common_languages,
+        'gemini_languages': gemini_languages or {},
+        'polly_voices': polly_voices,
+        'total_languages': len(common_languages)
+    }
+    # Both services report failure as an empty result
+    return payload, bool(gemini_languages) and bool(polly_voices), time.monotonic()
+
 @dubbing_bp.route('/cancel-task/<int:task_id>', methods=['POST'])
 @cross_origin()
 def cancel_task(task_id):
@@ -246,20 +309,20 @@ def cancel_task(task_id):
                 'current_status': task.status
             }), 400
 
-        # Revoke the Celery task if it exists
+        # Revoke the running stage as well as the pipeline's tracking id
         if task.celery_task_id:
-            try:
-                celery.control.revoke(task.celery_task_id, terminate=True)
-                logger.info(f"Celery task {task.celery_task_id} revoked")
-            except Exception as e:
-                logger.warning(f"Failed to revoke Celery task: {e}")
+            for celery_task_id in get_pipeline_task_ids(task.celery_task_id):
+                try:
+                    celery.control.revoke(celery_task_id, terminate=True)
+                    logger.info(f"Celery task {celery_task_id} revoked")
+                except Exception as e:
+                    logger.warning(f"Failed to revoke Celery task: {e}")
 
         # Update task status
         task.update_status('cancelled', error_message='Task cancelled by user')
 
-        # Clean up any temporary files
-        if hasattr(task, 'temp_directory') and task.temp_directory:
-            cleanup_temp_files(task.temp_directory)
+        # The terminated stage never reaches load_stage_task or the errback, so clean up here
+        cleanup_temp_files(get_work_dir(task.id))
 
         return jsonify({
             'message': 'Task cancelled successfully',
@@ -291,20 +354,73 @@ def download_dubbed_video(task_id):
             return jsonify({'error': 'Dubbed video file not found on server'}), 404
 
         # Generate download filename
-        safe_title = "".join(c for c in task.video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = UNSAFE_FILENAME_CHARS.sub('', task.video_title or '').rstrip()
         filename = f"{safe_title}_dubbed_{task.target_language}.mp4"
 
+        # Hand the transfer off to the fronting proxy when it is configured
+        accel_response = build_accel_redirect_response(task.final_video_path, filename)
+        if accel_response is not None:
+            return accel_response
+
         return send_file(
             task.final_video_path,
             as_attachment=True,
             download_name=filename,
-            mimetype='video/mp4'
+            mimetype='video/mp4',
+            conditional=True,
+            etag=True
         )
 
     except Exception as e:
         logger.error(f"Error downloading dubbed video for task {task_id}: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+def build_accel_redirect_response(file_path, filename):
+    """
+    Build an X-Accel-Redirect response so Nginx streams the file with sendfile().
+
+    Enabled by setting X_ACCEL_REDIRECT_PREFIX (e.g. '/_protected/') to an
+    internal Nginx location aliased to DUBBED_VIDEO_ROOT. Returns None when
+    offloading is disabled or the file lives outside the served root.
+    """
+    accel_prefix = os.getenv('X_ACCEL_REDIRECT_PREFIX')
+    if not accel_prefix:
+        return None
+
+    video_root = os.path.realpath(os.getenv('DUBBED_VIDEO_ROOT', '/tmp/dubbing'))
+    relative_path = os.path.relpath(os.path.realpath(file_path), video_root)
+    if relative_path.startswith(os.pardir):
+        logger.warning(f"File {file_path} is outside {video_root}, serving through Flask")
+        return None
+
+    response = make_response('')
+    response.headers['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{quote(relative_path)}"
+    response.headers['Content-Type'] = 'video/mp4'
+    response.headers['Content-Disposition'] = (
+        f"attachment; filename*=UTF-8''{quote(filename)}"
+    )
+    return response
+
+def get_pipeline_task_ids(progress_id):
+    """
+    Get the Celery ids to revoke for a pipeline tracked under progress_id.
+
+    progress_id belongs to the merge stage, so revoking it alone would let the
+    stage that is running finish first. Each stage publishes its own id in
+    the progress meta, which is revoked as well.
+    """
+    task_ids = [progress_id]
+    try:
+        meta = celery.AsyncResult(progress_id).info
+    except Exception as e:
+        logger.warning(f"Could not read pipeline progress for {progress_id}: {e}")
+        return task_ids
+
+    stage_task_id = meta.get('stage_task_id') if isinstance(meta, dict) else None
+    if stage_task_id and stage_task_id != progress_id:
+        task_ids.insert(0, stage_task_id)
+    return task_ids
+
 def cleanup_temp_files(directory):
     """Clean up temporary files."""
     try:
@@ -314,117 +430,264 @@ def cleanup_temp_files(directory):
     except Exception as e:
         logger.warning(f"Failed to clean up directory {directory}: {e}")
 
-# Celery task definition (should be moved to separate file)
-@celery.task(bind=True)
-def dubbing_task(self, task_id):
-    """Celery task for processing video dubbing."""
-    from src.models.video_task import VideoTask, db
-    
+@worker_process_shutdown.connect
+def flush_download_outcomes(**kwargs):
+    """Write queued download outcomes before a pool child exits; children skip atexit."""
+    youtube_service.flush_outcomes()
+
+# Celery task definitions (should be moved to separate file)
+class DubbingStageTask(celery.Task):
+    """Base task that releases the DB session once a stage returns."""
+
+    def after_return(self, *args, **kwargs):
+        # Don't hold a pooled connection while the worker waits for the next stage
+        db.session.remove()
+
+class StageFailed(Exception):
+    """A stage's service call failed; retried with backoff until retries run out."""
+
+# Attempts a stage gets after its first failure before the task is marked failed
+STAGE_MAX_RETRIES = 3
+
+# Each stage is its own task so it can be retried and scheduled independently.
+# The services swallow their own errors and return None, so stages signal a
+# failed call by raising StageFailed.
+STAGE_TASK_OPTIONS = {
+    'base': DubbingStageTask,
+    'bind': True,
+    'acks_late': True,
+    'autoretry_for': (RequestException, StageFailed),
+    'max_retries': STAGE_MAX_RETRIES,
+    'retry_backoff': True,
+    'retry_backoff_max': 60,
+    'retry_jitter': True
+}
+
+def get_work_dir(task_id):
+    """Get the shared working directory used by all stages of a task."""
+    output_dir = os.getenv('DUBBED_VIDEO_ROOT', '/tmp/dubbing')
+    return os.path.join(output_dir, f"dubbing_{task_id}")
+
+def build_dubbing_pipeline(task_id):
+    """
+    Build the Celery chain that processes a dubbing task.
+
+    Stages pass a JSON-serializable context dict along the chain, and their
+    outputs are only written to the DB when the task completes. The last
+    stage is given a pre-assigned id that also receives progress updates,
+    so clients can poll a single AsyncResult for the whole pipeline.
+    """
+    progress_id = uuid()
+    context = {'task_id': task_id, 'progress_id': progress_id}
+
+    return chain(
+        download_stage.s(context),
+        extract_audio_stage.s(),
+        transcribe_stage.s(),
+        translate_stage.s(),
+        tts_stage.s(),
+        merge_stage.s().set(task_id=progress_id)
+    ).on_error(dubbing_pipeline_failed.s(task_id))
+
+def load_stage_task(context):
+    """Load the VideoTask for a stage, stopping the chain if it was cancelled."""
+    # Start every stage from a clean session so a broken one can't leak in
+    db.session.remove()
+    task = VideoTask.query.get(context['task_id'])
+    if not task:
+        logger.error(f"Task {context['task_id']} not found")
+        raise Ignore()
+
+    if task.status == 'cancelled':
+        logger.info(f"Task {context['task_id']} was cancelled, stopping pipeline")
+        cleanup_temp_files(get_work_dir(context['task_id']))
+        raise Ignore()
+
+    return task
+
+def report_progress(stage_task, context, progress, stage):
+    """Publish fine-grained progress on the pipeline's tracking id.
+
+    The running stage's own id is included so cancel_task can terminate it.
+    """
+    stage_task.update_state(
+        task_id=context['progress_id'],
+        state='PROGRESS',
+        meta={
+            'progress': progress,
+            'stage': stage,
+            'stage_task_id': stage_task.request.id
+        }
+    )
+
+def fail_stage(stage_task, task, message):
+    """Retry the stage, or once retries are used up, mark the task failed and stop the chain."""
+    if stage_task.request.retries < stage_task.max_retries:
+        logger.warning(f"{message} for task {task.id}, retrying")
+        raise StageFailed(message)
+
+    task.update_status('failed', error_message=message)
+    cleanup_temp_files(get_work_dir(task.id))
+    raise Ignore()
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def download_stage(self, context):
+    """Pipeline stage 1: download the source video."""
+    task = load_stage_task(context)
+    task.update_status('downloading', 10)
+    report_progress(self, context, 10, 'downloading')
+
+    work_dir = get_work_dir(task.id)
+    os.makedirs(work_dir, exist_ok=True)
+
+    logger.info(f"Downloading video: {task.youtube_url}")
+    download_result = youtube_service.download_video(task.youtube_url, work_dir)
+    if not download_result:
+        fail_stage(self, task, 'Failed to download video')
+
+    # Coarse transition persisted to the DB; finer progress goes through update_state
+    task.original_video_path = download_result['video_path']
+    task.update_status('processing', 30)
+
+    return {**context, 'work_dir': work_dir, 'video_path': download_result['video_path']}
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def extract_audio_stage(self, context):
+    """Pipeline stage 2: extract and preprocess the audio track."""
+    task = load_stage_task(context)
+    report_progress(self, context, 30, 'extracting_audio')
+
+    logger.info("Extracting audio from video")
+    # Pipe ffmpeg's PCM straight into preprocessing; only the final WAV touches disk
+    processed_audio_path = audio_service.extract_preprocessed_audio(
+        context['video_path'],
+        output_path=os.path.join(context['work_dir'], 'audio_processed.wav')
+    )
+    if processed_audio_path:
+        return {**context, 'audio_path': processed_audio_path}
+
+    audio_path = audio_service.extract_audio_from_video(context['video_path'])
+    if not audio_path:
+        fail_stage(self, task, 'Failed to extract audio')
+
+    processed_audio_path = audio_service.preprocess_audio(audio_path)
+    if not processed_audio_path:
+        processed_audio_path = audio_path
+
+    return {**context, 'audio_path': processed_audio_path}
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def transcribe_stage(self, context):
+    """Pipeline stage 3: transcribe audio using Gemini CLI."""
+    task = load_stage_task(context)
+    report_progress(self, context, 50, 'transcribing')
+
+    logger.info("Transcribing audio")
+    transcription_result = gemini_service.transcribe_audio(
+        context['audio_path'],
+        task.source_language
+    )
+
+    if not transcription_result:
+        fail_stage(self, task, 'Failed to transcribe audio')
+
+    return {**context, 'transcription_text': transcription_result['text']}
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def translate_stage(self, context):
+    """Pipeline stage 4: translate the transcription using Gemini CLI."""
+    task = load_stage_task(context)
+    report_progress(self, context, 70, 'translating')
+
+    logger.info("Translating text")
+    translation_result = gemini_service.translate_text(
+        context['transcription_text'],
+        task.target_language,
+        task.source_language
+    )
+
+    if not translation_result:
+        fail_stage(self, task, 'Failed to translate text')
+
+    return {**context, 'translated_text': translation_result['translated_text']}
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def tts_stage(self, context):
+    """Pipeline stage 5: generate speech from the translated text."""
+    task = load_stage_task(context)
+    report_progress(self, context, 80, 'generating_speech')
+
+    logger.info("Generating dubbed audio")
+    language_code = task.target_language
+    if '-' not in language_code:
+        language_code = f"{task.target_language}-US"
+
+    dubbed_audio_path = audio_service.text_to_speech(
+        context['translated_text'],
+        language_code,
+        output_path=os.path.join(context['work_dir'], 'dubbed_audio.wav'),
+        output_format='pcm'
+    )
+
+    if not dubbed_audio_path:
+        fail_stage(self, task, 'Failed to generate dubbed audio')
+
+    return {**context, 'dubbed_audio_path': dubbed_audio_path}
+
+@celery.task(**STAGE_TASK_OPTIONS)
+def merge_stage(self, context):
+    """Pipeline stage 6: merge dubbed audio with the original video."""
+    task = load_stage_task(context)
+    report_progress(self, context, 90, 'merging')
+
+    logger.info("Merging audio with video")
+    output_dir = os.path.dirname(context['work_dir'])
+    final_video_path = audio_service.merge_audio_with_video(
+        context['video_path'],
+        context['dubbed_audio_path'],
+        output_path=os.path.join(output_dir, f"{task.id}_dubbed.mp4")
+    )
+
+    if not final_video_path:
+        fail_stage(self, task, 'Failed to merge audio with video')
+
+    # Persist the stage outputs together with the final status in one commit
+    task.original_audio_path = context['audio_path']
+    task.transcription_text = context['transcription_text']
+    task.translated_text = context['translated_text']
+    task.dubbed_audio_path = context['dubbed_audio_path']
+    task.final_video_path = final_video_path
+    task.update_status('completed', 100)
+
+    # Finished videos outlive the per-task working directory
+    cleanup_temp_files(context['work_dir'])
+
+    logger.info(f"Dubbing task completed successfully: {task.id}")
+    return {'task_id': task.id, 'final_video_path': final_video_path}
+
+@celery.task
+def dubbing_pipeline_failed(request, exc, traceback, task_id):
+    """Error callback for the pipeline: record the failure and clean up."""
+    logger.error(f"Error in dubbing task {task_id}: {exc}")
+    cleanup_temp_files(get_work_dir(task_id))
+
+    # The failure may have come from SQLAlchemy itself; record it on a fresh session
+    db.session.remove()
     try:
-        # Get task from database
         task = VideoTask.query.get(task_id)
-        if not task:
-            logger.error(f"Task {task_id} not found")
-            return
-
-        # Update task status
-        task.update_status('downloading', 10)
-
-        # Step 1: Download video
-        logger.info(f"Downloading video: {task.youtube_url}")
-        download_dir = f"/tmp/dubbing/{task_id}"
-        os.makedirs(download_dir, exist_ok=True)
-        
-        download_result = youtube_service.download_video(task.youtube_url, download_dir)
-        if not download_result:
-            task.update_status('failed', error_message='Failed to download video')
-            return
-
-        task.original_video_path = download_result['video_path']
-        task.update_status('processing', 30)
-
-        # Step 2: Extract and preprocess audio
-        logger.info("Extracting audio from video")
-        audio_path = audio_service.extract_audio_from_video(task.original_video_path)
-        if not audio_path:
-            task.update_status('failed', error_message='Failed to extract audio')
-            return
-
-        processed_audio_path = audio_service.preprocess_audio(audio_path)
-        if not processed_audio_path:
-            processed_audio_path = audio_path
-
-        task.original_audio_path = processed_audio_path
-        task.update_status('processing', 50)
-
-        # Step 3: Transcribe audio using Gemini CLI
-        logger.info("Transcribing audio")
-        transcription_result = gemini_service.transcribe_audio(
-            processed_audio_path,
-            task.source_language
-        )
-
-        if not transcription_result:
-            task.update_status('failed', error_message='Failed to transcribe audio')
-            return
-
-        task.transcription_text = transcription_result['text']
-        task.update_status('processing', 70)
-
-        # Step 4: Translate text using Gemini CLI
-        logger.info("Translating text")
-        translation_result = gemini_service.translate_text(
-            task.transcription_text,
-            task.target_language,
-            task.source_language
-        )
-
-        if not translation_result:
-            task.update_status('failed', error_message='Failed to translate text')
-            return
-
-        task.translated_text = translation_result['translated_text']
-        task.update_status('processing', 80)
-
-        # Step 5: Generate speech from translated text
-        logger.info("Generating dubbed audio")
-        language_code = task.target_language
-        if '-' not in language_code:
-            language_code = f"{task.target_language}-US"
-
-        dubbed_audio_path = audio_service.text_to_speech(
-            task.translated_text,
-            language_code
-        )
-
-        if not dubbed_audio_path:
-            task.update_status('failed', error_message='Failed to generate dubbed audio')
-            return
-
-        task.dubbed_audio_path = dubbed_audio_path
-        task.update_status('processing', 90)
-
-        # Step 6: Merge dubbed audio with original video
-        logger.info("Merging audio with video")
-        final_video_path = audio_service.merge_audio_with_video(
-            task.original_video_path,
-            dubbed_audio_path
-        )
-
-        if not final_video_path:
-            task.update_status('failed', error_message='Failed to merge audio with video')
-            return
-
-        task.final_video_path = final_video_path
-        task.update_status('completed', 100)
-
-        logger.info(f"Dubbing task completed successfully: {task_id}")
+        if task:
+            task.update_status('failed', error_message=str(exc))
+    except Exception as e:
+        logger.error(f"Failed to record failure for task {task_id}: {e}")
+        db.session.rollback()
+    finally:
+        db.session.remove()
 
-        # Clean up temporary files
-        cleanup_temp_files(download_dir)
+@celery.task(bind=True)
+def dubbing_task(self, task_id):
+    """Celery task for processing video dubbing.
 
-    except Exception as e:
-        logger.error(f"Error in dubbing task {task_id}: {e}")
-        task = VideoTask.query.get(task_id)
-        if task:
-            task.update_status('failed', error_message=str(e))
\ No newline at end of file
+    Kept for messages queued before the pipeline was split into stages;
+    it simply dispatches the stage chain.
+    """
+    return build_dubbing_pipeline(task_id).apply_async().id
@@ -1,5 +1,6 @@
 from flask import Blueprint, jsonify, request
 from flask_cors import cross_origin
+import fastjsonschema
 import logging
 from src.models.user import User, db
 
@@ -7,6 +8,16 @@ logger = logging.getLogger(__name__)
 
 user_bp = Blueprint('user', __name__)
 
+# Request payload schema, compiled once at import time
+validate_create_user = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['username', 'email'],
+    'properties': {
+        'username': {'type': 'string', 'minLength': 1},
+        'email': {'type': 'string', 'minLength': 1}
+    }
+})
+
 @user_bp.route('/users', methods=['GET'])
 @cross_origin()
 def get_users():
@@ -42,13 +53,10 @@ def get_users():
 def create_user():
     """Create a new user."""
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-        
-        # Validate required fields
-        if not data.get('username') or not data.get('email'):
-            return jsonify({'error': 'Username and email are required'}), 400
+        try:
+            data = validate_create_user(request.get_json(silent=True) or {})
+        except fastjsonschema.JsonSchemaException as e:
+            return jsonify({'error': e.message}), 400
         
         # Check if user already exists
         existing_user = User.query.filter(
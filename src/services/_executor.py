@@ -0,0 +1,16 @@
+"""
+Shared worker pool for service-level fan-out (batch translation, chunked TTS).
+"""
+
+import atexit
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# One long-lived pool so worker threads (and the boto3/HTTP connections they
+# keep warm) survive between batches instead of being torn down per call
+service_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv('SERVICE_POOL', 8)),
+    thread_name_prefix='svc'
+)
+
+atexit.register(service_pool.shutdown)
@@ -1,53 +1,209 @@
 import logging
 import json
+import mmap
 import os
 import random
+import tempfile
+import threading
 from collections import defaultdict
+from typing import Optional
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Persist aggregates once this many new log bytes have been folded in
+CHECKPOINT_INTERVAL_BYTES = 64 * 1024
+
 class AdaptiveMitigationService:
     """Service for adaptive bot detection mitigation based on past performance."""
     
+    # Constant, so shared by every instance rather than rebuilt per service
+    user_agents = (
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    )
+    
     def __init__(self, log_file_path: str = "./download_logs.json"):
         self.log_file_path = log_file_path
-        self.user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        ]
+        self.checkpoint_file_path = f"{log_file_path}.offset"
+        
+        # Aggregates are folded in incrementally; only bytes past the offset are parsed
+        self._success_counts = defaultdict(lambda: {'success': 0, 'total': 0})
+        self._log_offset = 0
+        self._checkpoint_offset = 0
+        # Identify which log file and which rotation the offset refers to
+        self._log_inode = None
+        self._generation = 0
+        # stat of the checkpoint last read or written, to notice other processes' saves
+        self._checkpoint_stat = None
+        # Concurrent downloads share one instance; serializes log appends and aggregate updates
+        self._lock = threading.RLock()
+        self._load_checkpoint()
     
-    def _analyze_logs(self) -> dict:
-        """Analyzes past download outcomes to determine effective mitigation strategies."""
-        success_counts = defaultdict(lambda: {'success': 0, 'total': 0})
+    @staticmethod
+    def _stat_key(file_stat: os.stat_result) -> tuple:
+        """Identify one version of a file, changing whenever it is replaced or rewritten."""
+        return (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+    
+    def _read_checkpoint(self) -> Optional[dict]:
+        """Read the shared checkpoint file, or None if it is missing or unreadable."""
+        try:
+            with open(self.checkpoint_file_path, 'rb') as f:
+                self._checkpoint_stat = self._stat_key(os.fstat(f.fileno()))
+                checkpoint = json_loads(f.read())
+            
+            return {
+                'offset': int(checkpoint.get('offset', 0)),
+                'inode': checkpoint.get('inode'),
+                'generation': int(checkpoint.get('generation', 0)),
+                'counts': {
+                    key: {'success': int(counts.get('success', 0)), 'total': int(counts.get('total', 0))}
+                    for key, counts in checkpoint.get('counts', {}).items()
+                }
+            }
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_file_path}: {e}")
+            return None
+    
+    def _apply_checkpoint(self, checkpoint: dict):
+        """Replace the in-memory offset and aggregates with a checkpoint's."""
+        self._success_counts.clear()
+        self._success_counts.update(checkpoint['counts'])
+        self._log_offset = self._checkpoint_offset = checkpoint['offset']
+        self._log_inode = checkpoint['inode']
+        self._generation = checkpoint['generation']
+    
+    def _load_checkpoint(self):
+        """Restore the log offset and aggregate counts saved by a previous run."""
+        checkpoint = self._read_checkpoint()
+        if checkpoint:
+            self._apply_checkpoint(checkpoint)
+    
+    def _save_checkpoint(self):
+        """Persist the current log offset, log identity and aggregate counts."""
+        checkpoint_dir = os.path.dirname(self.checkpoint_file_path) or '.'
+        try:
+            # Web and worker processes share the checkpoint, so each write gets its own temp file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=checkpoint_dir,
+                prefix=f"{os.path.basename(self.checkpoint_file_path)}.",
+                suffix='.tmp'
+            )
+        except OSError as e:
+            logger.warning(f"Failed to write checkpoint {self.checkpoint_file_path}: {e}")
+            return
         
-        if not os.path.exists(self.log_file_path):
-            return {}
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'offset': self._log_offset,
+                    'inode': self._log_inode,
+                    'generation': self._generation,
+                    'counts': dict(self._success_counts)
+                }, f)
+                f.flush()
+                checkpoint_stat = self._stat_key(os.fstat(f.fileno()))
+            os.replace(tmp_path, self.checkpoint_file_path)
+        except OSError as e:
+            logger.warning(f"Failed to write checkpoint {self.checkpoint_file_path}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
         
+        self._checkpoint_offset = self._log_offset
+        self._checkpoint_stat = checkpoint_stat
+    
+    def _sync_with_checkpoint(self, log_stat: os.stat_result):
+        """Re-base the offset if the log was rotated, replaced or truncated since it was read."""
         try:
-            with open(self.log_file_path, 'r') as f:
-                for line in f:
-                    try:
-                        log_entry = json.loads(line)
-                        params = log_entry.get('mitigation_params', {})
-                        proxy_used = params.get('proxy_used', False)
-                        cookies_used = params.get('cookies_used', False)
+            checkpoint_stat = self._stat_key(os.stat(self.checkpoint_file_path))
+        except FileNotFoundError:
+            checkpoint_stat = None
+        
+        if checkpoint_stat is not None and checkpoint_stat != self._checkpoint_stat:
+            checkpoint = self._read_checkpoint()
+            if checkpoint and checkpoint['generation'] > self._generation:
+                # Another process rotated the log; its checkpoint holds the counts up to the rotation
+                self._apply_checkpoint(checkpoint)
+        
+        if self._log_inode is None:
+            # First sight of this log, or a checkpoint written before inodes were recorded
+            self._log_inode = log_stat.st_ino
+        
+        if log_stat.st_ino != self._log_inode or log_stat.st_size < self._log_offset:
+            # Replaced or truncated outside rotate_logs; earlier counts remain valid
+            self._log_inode = log_stat.st_ino
+            self._log_offset = 0
+    
+    def _refresh_aggregates(self):
+        """Fold log lines appended since the last offset into the cached counts."""
+        try:
+            with open(self.log_file_path, 'rb') as f:
+                log_stat = os.fstat(f.fileno())
+                self._sync_with_checkpoint(log_stat)
+                
+                if log_stat.st_size == self._log_offset:
+                    return
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log_map:
+                    # Only consume complete lines; a partial trailing write is read next time
+                    end = log_map.rfind(b'\n', self._log_offset) + 1
+                    if end <= 0:
+                        return
+                    
+                    start = self._log_offset
+                    while start < end:
+                        line_end = log_map.find(b'\n', start, end)
+                        line = log_map[start:line_end]
+                        start = line_end + 1
                         
-                        key = f"proxy_{proxy_used}_cookies_{cookies_used}"
-                        success_counts[key]['total'] += 1
+                        if not line.strip():
+                            continue
                         
-                        if log_entry.get('success'):
-                            success_counts[key]['success'] += 1
-                    except json.JSONDecodeError:
-                        logger.warning(f"Skipping malformed log line during analysis: {line.strip()}")
-            
-            # Calculate success rates
-            success_rates = {}
-            for key, counts in success_counts.items():
-                if counts['total'] > 0:
-                    success_rates[key] = counts['success'] / counts['total']
-                else:
-                    success_rates[key] = 0.0
+                        try:
+                            log_entry = json_loads(line)
+                            params = log_entry.get('mitigation_params', {})
+                            proxy_used = params.get('proxy_used', False)
+                            cookies_used = params.get('cookies_used', False)
+                            
+                            key = f"proxy_{proxy_used}_cookies_{cookies_used}"
+                            self._success_counts[key]['total'] += 1
+                            
+                            if log_entry.get('success'):
+                                self._success_counts[key]['success'] += 1
+                        except ValueError:
+                            logger.warning(f"Skipping malformed log line during analysis: {line.strip()!r}")
+                    
+                    self._log_offset = end
+        except FileNotFoundError:
+            return
+        
+        if self._log_offset - self._checkpoint_offset >= CHECKPOINT_INTERVAL_BYTES:
+            self._save_checkpoint()
+    
+    def _analyze_logs(self) -> dict:
+        """Analyzes past download outcomes to determine effective mitigation strategies."""
+        try:
+            with self._lock:
+                self._refresh_aggregates()
+                
+                # Calculate success rates
+                success_rates = {}
+                for key, counts in self._success_counts.items():
+                    if counts['total'] > 0:
+                        success_rates[key] = counts['success'] / counts['total']
+                    else:
+                        success_rates[key] = 0.0
             
             logger.info(f"Analyzed success rates: {success_rates}")
             return success_rates
@@ -56,6 +212,23 @@ class AdaptiveMitigationService:
             logger.error(f"Error analyzing logs: {e}")
             return {}
     
+    def rotate_logs(self):
+        """Truncate the outcome log in place, keeping its aggregates in the checkpoint."""
+        try:
+            with self._lock:
+                self._refresh_aggregates()
+                with open(self.log_file_path, 'r+b') as f:
+                    f.truncate(0)
+                self._log_offset = 0
+                # Other processes see the new generation and adopt these counts
+                self._generation += 1
+                self._save_checkpoint()
+            logger.info(f"Rotated outcome log {self.log_file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error rotating logs: {e}")
+    
     def get_adaptive_params(self) -> dict:
         """Provides adaptive mitigation parameters based on learned patterns."""
         success_rates = self._analyze_logs()
@@ -87,17 +260,25 @@ class AdaptiveMitigationService:
     
     def record_outcome(self, outcome_data: dict):
         """Records the outcome of a download attempt for future analysis."""
+        self.record_outcomes([outcome_data])
+    
+    def record_outcomes(self, outcomes: list):
+        """Records several download outcomes with a single append to the log file."""
+        if not outcomes:
+            return
+        
         try:
             # Ensure the directory exists
             log_dir = os.path.dirname(self.log_file_path)
-            if log_dir and not os.path.exists(log_dir):
-                os.makedirs(log_dir)
+            if log_dir:
+                os.makedirs(log_dir, exist_ok=True)
             
-            # Append new data to log file
-            with open(self.log_file_path, 'a') as f:
-                f.write(json.dumps(outcome_data) + '\n')
+            # Append new data to log file; one writer at a time keeps lines whole
+            lines = ''.join(json.dumps(outcome) + '\n' for outcome in outcomes)
+            with self._lock, open(self.log_file_path, 'a') as f:
+                f.write(lines)
             
-            logger.info(f"Recorded outcome to {self.log_file_path}")
+            logger.info(f"Recorded {len(outcomes)} outcome(s) to {self.log_file_path}")
             
         except Exception as e:
             logger.error(f"Error recording outcome: {e}")
@@ -1,21 +1,100 @@
 import os
 import boto3
+import hashlib
+from botocore.config import Config
 import logging
+import re
+import shutil
+import subprocess
 import tempfile
+import time
+import numpy as np
+import soundfile as sf
 from pydub import AudioSegment
-from pydub.effects import normalize
-from typing import Optional, Dict, Any, List
+from scipy.signal import resample_poly
+from typing import Optional, Dict, Any, List, Tuple, Union
 import ffmpeg
+from fractions import Fraction
+from types import MappingProxyType
+from urllib.parse import urlparse
+
+from ._executor import service_pool
+
+try:
+    import pyrubberband as pyrb
+    PYRUBBERBAND_AVAILABLE = True
+except ImportError:
+    PYRUBBERBAND_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Format produced by audio extraction: 16 kHz mono signed 16-bit PCM
+EXTRACT_SAMPLE_RATE = 16000
+
+# Edge silence trimming: RMS window length and -40 dBFS threshold
+SILENCE_WINDOW_MS = 20
+SILENCE_THRESH_AMPLITUDE = 32768 * 10 ** (-40 / 20)
+
+# Polly rejects requests over 3000 characters; longer text is split at sentence boundaries
+POLLY_MAX_CHARS = 2800
+POLLY_PCM_SAMPLE_RATE = 16000
+TTS_STREAM_CHUNK_SIZE = 64 * 1024
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+# Dubbed audio in these containers is already AAC and can be muxed without re-encoding
+AAC_EXTENSIONS = frozenset(['.m4a', '.aac'])
+
+# Polly's voice catalog changes rarely; reuse describe_voices results for an hour
+VOICE_CACHE_TTL = 3600
+
+# Inputs this long are rendered by an asynchronous Polly synthesis task into S3
+SYNTHESIS_TASK_MIN_CHARS = 100000
+SYNTHESIS_TASK_POLL_INTERVAL = 5
+SYNTHESIS_TASK_TIMEOUT = 1800
+
+# Fail fast on stale pooled connections instead of waiting out botocore's 60 s default
+POLLY_CLIENT_CONFIG = Config(
+    connect_timeout=5,
+    read_timeout=15,
+    retries={'max_attempts': 2, 'mode': 'standard'},
+    max_pool_connections=20,
+    tcp_keepalive=True
+)
+
 class AudioService:
     """Service for audio processing, text-to-speech, and audio manipulation."""
     
+    # Default Polly voice per language code
+    _VOICE_MAPPING = MappingProxyType({
+        'en-US': 'Joanna',
+        'en-GB': 'Emma',
+        'es-ES': 'Lucia',
+        'es-MX': 'Mia',
+        'fr-FR': 'Lea',
+        'de-DE': 'Marlene',
+        'it-IT': 'Bianca',
+        'pt-BR': 'Camila',
+        'ja-JP': 'Mizuki',
+        'ko-KR': 'Seoyeon',
+        'zh-CN': 'Zhiyu',
+        'hi-IN': 'Aditi',
+        'ar-AE': 'Zeina',
+        'ru-RU': 'Tatyana'
+    })
+    
+    # Neural-capable voices, used when the Polly catalog can't be loaded
+    _NEURAL_VOICES = frozenset([
+        'Joanna', 'Matthew', 'Amy', 'Emma', 'Brian', 'Olivia',
+        'Aria', 'Ayanda', 'Ivy', 'Kendra', 'Kimberly', 'Salli',
+        'Joey', 'Justin', 'Kevin', 'Ruth'
+    ])
+    
     def __init__(self, aws_access_key: str = None, aws_secret_key: str = None, aws_region: str = 'us-east-1'):
         self.aws_access_key = aws_access_key or os.getenv('AWS_ACCESS_KEY_ID')
         self.aws_secret_key = aws_secret_key or os.getenv('AWS_SECRET_ACCESS_KEY')
         self.aws_region = aws_region
+        self.polly_output_bucket = os.getenv('POLLY_OUTPUT_BUCKET')
+        self._s3_client = None
         
         # Initialize AWS Polly client
         if self.aws_access_key and self.aws_secret_key:
@@ -23,11 +102,16 @@ class AudioService:
                 'polly',
                 aws_access_key_id=self.aws_access_key,
                 aws_secret_access_key=self.aws_secret_key,
-                region_name=self.aws_region
+                region_name=self.aws_region,
+                config=POLLY_CLIENT_CONFIG
             )
         else:
             self.polly_client = None
             logger.warning("AWS credentials not provided, TTS functionality will be limited")
+        
+        # describe_voices results keyed by language code (None = full catalog),
+        # each stored as (fetched_at, {voice Id: voice})
+        self._voices_by_language = {}
     
     def extract_audio_from_video(self, video_path: str, output_path: str = None) -> Optional[str]:
         """
@@ -69,44 +153,96 @@ class AudioService:
             logger.error(f"Error extracting audio: {e}")
             return None
     
-    def preprocess_audio(self, audio_path: str, output_path: str = None) -> Optional[str]:
+    def extract_audio_to_buffer(self, video_path: str) -> Optional[np.ndarray]:
         """
-        Preprocess audio for better transcription quality.
+        Extract audio from video file straight into memory, skipping the WAV on disk.
         
         Args:
-            audio_path: Path to the input audio file
-            output_path: Path for the processed audio file (optional)
+            video_path: Path to the video file
             
         Returns:
-            Path to the processed audio file or None if failed
+            16 kHz mono int16 samples or None if failed
         """
         try:
-            if not os.path.exists(audio_path):
-                logger.error(f"Audio file not found: {audio_path}")
+            if not os.path.exists(video_path):
+                logger.error(f"Video file not found: {video_path}")
                 return None
             
-            if not output_path:
-                audio_name = os.path.splitext(os.path.basename(audio_path))[0]
-                output_path = os.path.join(os.path.dirname(audio_path), f"{audio_name}_processed.wav")
+            proc = subprocess.run(
+                ["ffmpeg", "-v", "quiet", "-i", video_path,
+                 "-f", "s16le", "-ac", "1", "-ar", str(EXTRACT_SAMPLE_RATE), "pipe:1"],
+                capture_output=True,
+                check=True
+            )
             
-            # Load audio with pydub
-            audio = AudioSegment.from_file(audio_path)
+            samples = np.frombuffer(proc.stdout, dtype=np.int16)
+            logger.info(f"Audio extracted to buffer: {len(samples)} samples")
+            return samples
             
-            # Convert to mono if stereo
-            if audio.channels > 1:
-                audio = audio.set_channels(1)
+        except Exception as e:
+            logger.error(f"Error extracting audio to buffer: {e}")
+            return None
+    
+    def extract_preprocessed_audio(self, video_path: str, output_path: str = None) -> Optional[str]:
+        """
+        Extract and preprocess a video's audio in memory, writing only the final WAV.
+        
+        Args:
+            video_path: Path to the video file
+            output_path: Path for the processed audio file (optional)
+            
+        Returns:
+            Path to the processed audio file or None if failed
+        """
+        if not output_path:
+            video_name = os.path.splitext(os.path.basename(video_path))[0]
+            output_path = os.path.join(os.path.dirname(video_path), f"{video_name}_audio_processed.wav")
+        
+        samples = self.extract_audio_to_buffer(video_path)
+        if samples is None:
+            return None
+        
+        return self.preprocess_audio(samples, output_path)
+    
+    def preprocess_audio(self, audio: Union[str, np.ndarray, AudioSegment],
+                         output_path: str = None) -> Optional[Union[str, np.ndarray]]:
+        """
+        Preprocess audio for better transcription quality.
+        
+        Args:
+            audio: Path to the input audio file, int16 samples from
+                extract_audio_to_buffer, or an AudioSegment
+            output_path: Path for the processed audio file (optional)
             
-            # Set sample rate to 16kHz (good for speech recognition)
-            audio = audio.set_frame_rate(16000)
+        Returns:
+            Path to the processed audio file, the processed 16 kHz int16
+            samples when given in-memory audio without output_path, or None if failed
+        """
+        try:
+            if isinstance(audio, str):
+                if not os.path.exists(audio):
+                    logger.error(f"Audio file not found: {audio}")
+                    return None
+                
+                if not output_path:
+                    audio_name = os.path.splitext(os.path.basename(audio))[0]
+                    output_path = os.path.join(os.path.dirname(audio), f"{audio_name}_processed.wav")
+                
+                # Decode with libsndfile, falling back to pydub for formats it can't read
+                pcm = self._read_pcm16(audio) or self._segment_to_pcm16(AudioSegment.from_file(audio))
+            elif isinstance(audio, np.ndarray):
+                pcm = (audio, 1, EXTRACT_SAMPLE_RATE)
+            else:
+                pcm = self._segment_to_pcm16(audio)
             
-            # Normalize audio levels
-            audio = normalize(audio)
+            samples = self._preprocess_samples(*pcm)
             
-            # Remove silence from beginning and end
-            audio = audio.strip_silence(silence_len=1000, silence_thresh=-40)
+            if not output_path:
+                logger.info("Audio preprocessed successfully in memory")
+                return samples
             
             # Export processed audio
-            audio.export(output_path, format="wav")
+            sf.write(output_path, samples, EXTRACT_SAMPLE_RATE, subtype='PCM_16')
             
             logger.info(f"Audio preprocessed successfully: {output_path}")
             return output_path
@@ -115,8 +251,52 @@ class AudioService:
             logger.error(f"Error preprocessing audio: {e}")
             return None
     
+    def _read_pcm16(self, audio_path: str) -> Optional[Tuple[np.ndarray, int, int]]:
+        """Read a file into interleaved int16 samples via libsndfile, or None if it can't decode it."""
+        try:
+            with sf.SoundFile(audio_path) as f:
+                frames = np.empty((f.frames, f.channels), dtype=np.int16)
+                f.read(out=frames)
+                return frames.reshape(-1), f.channels, f.samplerate
+        except RuntimeError:
+            return None
+    
+    def _segment_to_pcm16(self, audio: AudioSegment) -> Tuple[np.ndarray, int, int]:
+        """Convert a pydub AudioSegment into interleaved int16 samples."""
+        if audio.sample_width != 2:
+            audio = audio.set_sample_width(2)
+        return np.frombuffer(audio.raw_data, dtype=np.int16), audio.channels, audio.frame_rate
+    
+    def _preprocess_samples(self, samples: np.ndarray, channels: int, frame_rate: int) -> np.ndarray:
+        """Downmix, resample to 16 kHz, peak-normalize and trim edge silence in one numpy pass."""
+        # Convert to mono if stereo
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        samples = samples.astype(np.float32, copy=False)
+        
+        # Resample to 16kHz (good for speech recognition)
+        if frame_rate != EXTRACT_SAMPLE_RATE:
+            samples = resample_poly(samples, EXTRACT_SAMPLE_RATE, frame_rate)
+        
+        # Normalize audio levels
+        peak = np.max(np.abs(samples)) if samples.size else 0
+        if peak > 0:
+            samples = samples * ((32767 - 1) / peak)
+        
+        # Remove silence from beginning and end using a moving-window RMS
+        window = min(EXTRACT_SAMPLE_RATE * SILENCE_WINDOW_MS // 1000, samples.size)
+        if window:
+            energy = np.concatenate(([0.0], np.cumsum(np.square(samples, dtype=np.float64))))
+            rms = np.sqrt((energy[window:] - energy[:-window]) / window)
+            loud = np.flatnonzero(rms > SILENCE_THRESH_AMPLITUDE)
+            if loud.size:
+                samples = samples[loud[0]:loud[-1] + window]
+        
+        return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+    
     def text_to_speech(self, text: str, language_code: str = 'en-US',
-                      voice_id: str = None, output_path: str = None) -> Optional[str]:
+                      voice_id: str = None, output_path: str = None,
+                      async_task: bool = False, output_format: str = 'mp3') -> Optional[str]:
         """
         Convert text to speech using AWS Polly.
         
@@ -125,6 +305,11 @@ class AudioService:
             language_code: Language code (e.g., 'en-US', 'es-ES')
             voice_id: Specific voice ID (optional)
             output_path: Path for the output audio file (optional)
+            async_task: Render through a Polly synthesis task into S3; implied
+                for inputs over SYNTHESIS_TASK_MIN_CHARS (requires POLLY_OUTPUT_BUCKET)
+            output_format: 'mp3', or 'pcm' to write 16 kHz 16-bit WAV straight from
+                Polly's raw PCM so downstream steps skip MP3 decoding. Long text is
+                stitched as PCM either way and encoded to MP3 when 'mp3' is requested
             
         Returns:
             Path to the generated audio file or None if failed
@@ -147,24 +332,42 @@ class AudioService:
             if not voice_id:
                 voice_id = self._get_default_voice(language_code)
             
+            engine = 'neural' if self._supports_neural_voice(voice_id) else 'standard'
+            
+            use_task = async_task or len(text) > SYNTHESIS_TASK_MIN_CHARS
+            if use_task and not self.polly_output_bucket:
+                logger.warning("POLLY_OUTPUT_BUCKET not set, synthesizing long text in chunks instead")
+                use_task = False
+            # Long text is always stitched as PCM, which concatenates cleanly
+            pcm = not use_task and (output_format == 'pcm' or len(text) > POLLY_MAX_CHARS)
+            
             if not output_path:
-                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
+                suffix = '.wav' if output_format == 'pcm' else '.mp3'
+                with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
                     output_path = temp_file.name
             
             logger.info(f"Generating speech for text length: {len(text)} characters")
             
+            if use_task:
+                return self._synthesize_via_task(text, language_code, voice_id, engine,
+                                                 output_path, output_format)
+            
+            if pcm:
+                return self._synthesize_chunked(text, language_code, voice_id, engine,
+                                                output_path, output_format)
+            
             # Generate speech
             response = self.polly_client.synthesize_speech(
                 Text=text,
                 OutputFormat='mp3',
                 VoiceId=voice_id,
                 LanguageCode=language_code,
-                Engine='neural' if self._supports_neural_voice(voice_id) else 'standard'
+                Engine=engine
             )
             
-            # Save audio data to file
+            # Stream audio data to file in fixed-size chunks
             with open(output_path, 'wb') as file:
-                file.write(response['AudioStream'].read())
+                shutil.copyfileobj(response['AudioStream'], file, length=TTS_STREAM_CHUNK_SIZE)
             
             logger.info(f"Speech generated successfully: {output_path}")
             return output_path
@@ -173,6 +376,128 @@ class AudioService:
             logger.error(f"Error generating speech: {e}")
             return None
     
+    def _split_sentences(self, text: str, max_chars: int = POLLY_MAX_CHARS) -> List[str]:
+        """Group sentences into chunks of at most max_chars, splitting overlong sentences on spaces."""
+        chunks = []
+        current = ''
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            while len(sentence) > max_chars:
+                if current:
+                    chunks.append(current)
+                    current = ''
+                cut = sentence.rfind(' ', 0, max_chars)
+                if cut <= 0:
+                    cut = max_chars
+                chunks.append(sentence[:cut])
+                sentence = sentence[cut:].lstrip()
+            
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _synthesize_chunked(self, text: str, language_code: str, voice_id: str,
+                            engine: str, output_path: str, output_format: str = 'pcm') -> str:
+        """Synthesize text as raw PCM (concurrently per chunk when long) and write one WAV or MP3 file."""
+        chunks = self._split_sentences(text)
+        
+        def synthesize(chunk):
+            response = self.polly_client.synthesize_speech(
+                Text=chunk,
+                OutputFormat='pcm',
+                SampleRate=str(POLLY_PCM_SAMPLE_RATE),
+                VoiceId=voice_id,
+                LanguageCode=language_code,
+                Engine=engine
+            )
+            return response['AudioStream'].read()
+        
+        if len(chunks) == 1:
+            pcm = synthesize(chunks[0])
+        else:
+            # Raw PCM concatenates cleanly, unlike MP3 frames
+            pcm = b''.join(service_pool.map(synthesize, chunks))
+        
+        self._write_pcm(np.frombuffer(pcm, dtype=np.int16), output_path, output_format)
+        
+        logger.info(f"Speech generated successfully from {len(chunks)} chunks: {output_path}")
+        return output_path
+    
+    def _write_pcm(self, samples: np.ndarray, output_path: str, output_format: str) -> None:
+        """Write Polly's 16 kHz mono PCM as a WAV file, or encode it to MP3 when 'mp3' was requested."""
+        if output_format == 'pcm':
+            sf.write(output_path, samples, POLLY_PCM_SAMPLE_RATE, format='WAV', subtype='PCM_16')
+            return
+        
+        segment = AudioSegment(
+            samples.tobytes(),
+            sample_width=2,
+            frame_rate=POLLY_PCM_SAMPLE_RATE,
+            channels=1
+        )
+        segment.export(output_path, format=output_format)
+    
+    def _synthesize_via_task(self, text: str, language_code: str, voice_id: str,
+                             engine: str, output_path: str, output_format: str = 'mp3') -> Optional[str]:
+        """Render text with an asynchronous Polly synthesis task and download the result from S3.
+        
+        'pcm' output is rendered as raw PCM and wrapped as WAV after download.
+        """
+        pcm = output_format == 'pcm'
+        task_params = {'SampleRate': str(POLLY_PCM_SAMPLE_RATE)} if pcm else {}
+        task = self.polly_client.start_speech_synthesis_task(
+            Text=text,
+            OutputS3BucketName=self.polly_output_bucket,
+            OutputFormat='pcm' if pcm else 'mp3',
+            VoiceId=voice_id,
+            LanguageCode=language_code,
+            Engine=engine,
+            **task_params
+        )['SynthesisTask']
+        task_id = task['TaskId']
+        logger.info(f"Started Polly synthesis task {task_id}")
+        
+        deadline = time.monotonic() + SYNTHESIS_TASK_TIMEOUT
+        while task['TaskStatus'] not in ('completed', 'failed'):
+            if time.monotonic() > deadline:
+                logger.error(f"Polly synthesis task {task_id} timed out")
+                return None
+            time.sleep(SYNTHESIS_TASK_POLL_INTERVAL)
+            task = self.polly_client.get_speech_synthesis_task(TaskId=task_id)['SynthesisTask']
+        
+        if task['TaskStatus'] == 'failed':
+            logger.error(f"Polly synthesis task {task_id} failed: {task.get('TaskStatusReason')}")
+            return None
+        
+        # OutputUri is https://s3.<region>.amazonaws.com/<bucket>/<key>
+        key = urlparse(task['OutputUri']).path.lstrip('/').split('/', 1)[1]
+        
+        if self._s3_client is None:
+            self._s3_client = boto3.client(
+                's3',
+                aws_access_key_id=self.aws_access_key,
+                aws_secret_access_key=self.aws_secret_key,
+                region_name=self.aws_region
+            )
+        if not pcm:
+            self._s3_client.download_file(self.polly_output_bucket, key, output_path)
+        else:
+            # Stage the headerless PCM next to the output, then wrap it as WAV
+            raw_path = f"{output_path}.pcm"
+            self._s3_client.download_file(self.polly_output_bucket, key, raw_path)
+            try:
+                self._write_pcm(np.fromfile(raw_path, dtype=np.int16), output_path, output_format)
+            finally:
+                os.remove(raw_path)
+        
+        logger.info(f"Speech generated successfully via synthesis task: {output_path}")
+        return output_path
+    
     def merge_audio_with_video(self, video_path: str, audio_path: str, output_path: str = None) -> Optional[str]:
         """
         Merge dubbed audio with original video.
@@ -198,13 +523,17 @@ class AudioService:
                 video_name = os.path.splitext(os.path.basename(video_path))[0]
                 output_path = os.path.join(os.path.dirname(video_path), f"{video_name}_dubbed.mp4")
             
-            # Use ffmpeg to merge video and audio
+            # Encode the dub to AAC once so the merge itself is a pure remux
+            aac_path = self._ensure_aac(audio_path)
+            
+            # Use ffmpeg to merge video and audio; only the mapped streams are kept
             video_input = ffmpeg.input(video_path)
-            audio_input = ffmpeg.input(audio_path)
+            audio_input = ffmpeg.input(aac_path)
             
             (
                 ffmpeg
-                .output(video_input['v'], audio_input['a'], output_path, vcodec='copy', acodec='aac')
+                .output(video_input['v'], audio_input['a'], output_path,
+                        vcodec='copy', acodec='copy', movflags='+faststart', shortest=None)
                 .overwrite_output()
                 .run(quiet=True)
             )
@@ -220,7 +549,32 @@ class AudioService:
             logger.error(f"Error merging video and audio: {e}")
             return None
     
-    def adjust_audio_speed(self, audio_path: str, speed_factor: float, output_path: str = None) -> Optional[str]:
+    def _ensure_aac(self, audio_path: str) -> str:
+        """Return an AAC/M4A version of audio_path, transcoding at most once per distinct content."""
+        if os.path.splitext(audio_path)[1].lower() in AAC_EXTENSIONS:
+            return audio_path
+        
+        digest = hashlib.blake2b(digest_size=8)
+        with open(audio_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024 * 1024), b''):
+                digest.update(block)
+        
+        audio_name = os.path.splitext(os.path.basename(audio_path))[0]
+        aac_path = os.path.join(os.path.dirname(audio_path), f"{audio_name}.{digest.hexdigest()}.m4a")
+        
+        if not os.path.exists(aac_path):
+            (
+                ffmpeg
+                .input(audio_path)
+                .output(aac_path, acodec='aac', audio_bitrate='192k')
+                .overwrite_output()
+                .run(quiet=True)
+            )
+        
+        return aac_path
+    
+    def adjust_audio_speed(self, audio_path: str, speed_factor: float, output_path: str = None,
+                           preserve_pitch: bool = False) -> Optional[str]:
         """
         Adjust audio playback speed to match video duration.
         
@@ -228,6 +582,8 @@ class AudioService:
             audio_path: Path to the input audio file
             speed_factor: Speed adjustment factor (1.0 = normal, 1.2 = 20% faster)
             output_path: Path for the output audio file (optional)
+            preserve_pitch: Time-stretch with rubberband instead of resampling
+                (requires pyrubberband; falls back to resampling without it)
             
         Returns:
             Path to the speed-adjusted audio file or None if failed
@@ -241,7 +597,30 @@ class AudioService:
                 audio_name = os.path.splitext(os.path.basename(audio_path))[0]
                 output_path = os.path.join(os.path.dirname(audio_path), f"{audio_name}_speed_{speed_factor}.wav")
             
-            # Load audio
+            # Fast path: decode with libsndfile and resample in numpy
+            try:
+                with sf.SoundFile(audio_path) as f:
+                    samples = np.empty((f.frames, f.channels), dtype='float32')
+                    f.read(out=samples)
+                    sample_rate = f.samplerate
+            except RuntimeError:
+                samples = None
+            
+            if samples is not None:
+                if preserve_pitch and PYRUBBERBAND_AVAILABLE:
+                    adjusted = pyrb.time_stretch(samples, sample_rate, speed_factor)
+                else:
+                    if preserve_pitch:
+                        logger.warning("pyrubberband not installed, adjusting speed without preserving pitch")
+                    # Play the same samples faster by shrinking them by speed_factor at the original rate
+                    ratio = Fraction(speed_factor).limit_denominator(1000)
+                    adjusted = resample_poly(samples, ratio.denominator, ratio.numerator, axis=0)
+                
+                sf.write(output_path, adjusted, sample_rate, subtype='PCM_16')
+                logger.info(f"Audio speed adjusted successfully: {output_path}")
+                return output_path
+            
+            # libsndfile can't decode this format; fall back to pydub
             audio = AudioSegment.from_file(audio_path)
             
             # Adjust speed by changing frame rate
@@ -274,6 +653,25 @@ class AudioService:
                 logger.error(f"Audio file not found: {audio_path}")
                 return None
             
+            # Read the duration from the header without decoding any samples
+            try:
+                with sf.SoundFile(audio_path) as f:
+                    return f.frames / f.samplerate
+            except RuntimeError:
+                pass
+            
+            # libsndfile can't read this format (e.g. mp3); ask ffprobe for the container duration
+            try:
+                out = subprocess.check_output(
+                    ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+                     "-of", "default=nw=1:nk=1", audio_path],
+                    timeout=10
+                )
+                return float(out)
+            except (subprocess.SubprocessError, OSError, ValueError) as e:
+                logger.warning(f"ffprobe could not read duration, decoding with pydub: {e}")
+            
+            # Last resort: decode the whole file with pydub
             audio = AudioSegment.from_file(audio_path)
             duration = len(audio) / 1000.0  # Convert milliseconds to seconds
             return duration
@@ -298,32 +696,38 @@ class AudioService:
     
     def _get_default_voice(self, language_code: str) -> str:
         """Get default voice for a language code."""
-        voice_mapping = {
-            'en-US': 'Joanna',
-            'en-GB': 'Emma',
-            'es-ES': 'Lucia',
-            'es-MX': 'Mia',
-            'fr-FR': 'Lea',
-            'de-DE': 'Marlene',
-            'it-IT': 'Bianca',
-            'pt-BR': 'Camila',
-            'ja-JP': 'Mizuki',
-            'ko-KR': 'Seoyeon',
-            'zh-CN': 'Zhiyu',
-            'hi-IN': 'Aditi',
-            'ar-AE': 'Zeina',
-            'ru-RU': 'Tatyana'
-        }
-        return voice_mapping.get(language_code, 'Joanna')
+        return self._VOICE_MAPPING.get(language_code, 'Joanna')
+    
+    def _describe_voices(self, language_code: str = None) -> Dict[str, Dict[str, Any]]:
+        """Return Polly voices for a language (or the full catalog) keyed by Id, cached for VOICE_CACHE_TTL seconds."""
+        cached = self._voices_by_language.get(language_code)
+        if cached and time.monotonic() - cached[0] < VOICE_CACHE_TTL:
+            return cached[1]
+        
+        if language_code:
+            response = self.polly_client.describe_voices(LanguageCode=language_code)
+        else:
+            response = self.polly_client.describe_voices()
+        
+        voices = {voice['Id']: voice for voice in response.get('Voices', [])}
+        self._voices_by_language[language_code] = (time.monotonic(), voices)
+        return voices
     
     def _supports_neural_voice(self, voice_id: str) -> bool:
-        """Check if voice supports neural engine."""
-        neural_voices = [
-            'Joanna', 'Matthew', 'Amy', 'Emma', 'Brian', 'Olivia',
-            'Aria', 'Ayanda', 'Ivy', 'Kendra', 'Kimberly', 'Salli',
-            'Joey', 'Justin', 'Kevin', 'Ruth'
-        ]
-        return voice_id in neural_voices
+        """Check if voice supports neural engine, based on the cached Polly catalog."""
+        try:
+            catalog = self._describe_voices()
+        except Exception as e:
+            logger.warning(f"Could not load Polly voice catalog, using built-in neural voice list: {e}")
+            # Don't retry on every TTS call; try again once the TTL expires
+            catalog = {}
+            self._voices_by_language[None] = (time.monotonic(), catalog)
+        
+        if catalog:
+            return 'neural' in catalog.get(voice_id, {}).get('SupportedEngines', [])
+        
+        # Catalog unavailable; fall back to voices known to support the neural engine
+        return voice_id in self._NEURAL_VOICES
     
     def get_available_voices(self, language_code: str = None) -> List[Dict[str, Any]]:
         """
@@ -339,8 +743,7 @@ class AudioService:
             if not self.polly_client:
                 return []
             
-            response = self.polly_client.describe_voices(LanguageCode=language_code)
-            voices = response.get('Voices', [])
+            voices = self._describe_voices(language_code).values()
             
             return [
                 {
@@ -1,24 +1,212 @@
 import subprocess
+import io
 import json
 import os
+import shutil
 import tempfile
 import logging
-from typing import Optional, Dict, Any
+import time
+import asyncio
+import threading
+import mimetypes
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
+
+from ._executor import service_pool
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    GENAI_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+if MSGSPEC_AVAILABLE:
+    # Typed decode targets: replies are validated and decoded in C, without a dict per segment
+    class Segment(msgspec.Struct):
+        start: float = 0.0
+        end: float = 0.0
+        text: str = ""
+    
+    class Transcription(msgspec.Struct):
+        text: str = ""
+        language: Optional[str] = None
+        confidence: float = 0.0
+        segments: List[Segment] = []
+    
+    class Translation(msgspec.Struct):
+        translated_text: str = ""
+        source_language: Optional[str] = None
+        target_language: Optional[str] = None
+        confidence: float = 0.0
+    
+    _transcription_decoder = msgspec.json.Decoder(Transcription)
+    _translation_decoder = msgspec.json.Decoder(Translation)
+    JSON_DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError)
+else:
+    JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
+# Model used for in-process SDK calls
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-2.0-flash')
+
+# Audio larger than this goes through the File API instead of inline request data
+INLINE_AUDIO_MAX_BYTES = 20 * 1024 * 1024
+
+TRANSCRIBE_PROMPT = (
+    "Transcribe this audio (language: {language}). Respond with JSON containing "
+    "\"text\", \"language\" (detected language code), \"confidence\" (0-1) and "
+    "\"segments\" (list of {{\"start\", \"end\", \"text\"}})."
+)
+
+TRANSLATE_PROMPT = (
+    "Translate the following text from {source_language} to {target_language}. "
+    "Respond with JSON containing \"translated_text\", \"source_language\", "
+    "\"target_language\" and \"confidence\" (0-1).\n\n{text}"
+)
+
+BATCH_TRANSLATE_PROMPT = (
+    "Translate each string in the following JSON array from {source_language} to "
+    "{target_language}. Respond with a JSON array of the same length containing only "
+    "the translated strings, in the same order.\n\n{texts}"
+)
+
+# Languages the Gemini models handle for transcription and translation
+SDK_SUPPORTED_LANGUAGES = {
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "nl": "Dutch",
+    "pl": "Polish",
+    "ru": "Russian",
+    "tr": "Turkish",
+    "ar": "Arabic",
+    "hi": "Hindi",
+    "bn": "Bengali",
+    "ur": "Urdu",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "zh": "Chinese",
+    "id": "Indonesian",
+    "vi": "Vietnamese",
+    "th": "Thai",
+    "sv": "Swedish",
+    "uk": "Ukrainian"
+}
+
+_genai_model = None
+_genai_model_lock = threading.Lock()
+
+def get_genai_model():
+    """Return the process-wide Gemini model, configuring the SDK on first use (None if unavailable)."""
+    global _genai_model
+    if _genai_model is None and GENAI_AVAILABLE:
+        with _genai_model_lock:
+            api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+            if _genai_model is None and api_key:
+                genai.configure(api_key=api_key)
+                _genai_model = genai.GenerativeModel(GEMINI_MODEL)
+    return _genai_model
+
+# How long a CLI availability probe result is reused (seconds)
+CLI_STATUS_TTL = 300
+
+# Exit status argparse/click-style CLIs use for unrecognised arguments
+CLI_USAGE_ERROR = 2
+
+# Requests in flight at once during async batch translation
+BATCH_TRANSLATE_CONCURRENCY = 8
+
+# Texts translated per SDK request by batch_translate
+BATCH_TRANSLATE_CHUNK_SIZE = 32
+
+# Long texts for CLIs without --stdin are spilled to tmpfs when the host has one
+TEXT_SPILL_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Translations/transcriptions remembered per service instance
+RESULT_CACHE_SIZE = 4096
+
+class LRUCache:
+    """Small thread-safe LRU mapping used to memoize model results."""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        if key is None:
+            return None
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
 class GeminiCLIService:
-    """Service for interacting with Google Gemini CLI for transcription and translation."""
+    """Service for Gemini transcription and translation via the SDK, falling back to the Gemini CLI."""
     
     def __init__(self):
-        self.cli_command = "gemini"  # Assuming gemini CLI is in PATH
+        self.cli_command = "gemini"
+        # Resolved once so each call execs the binary directly instead of searching PATH
+        self.cli_path = shutil.which(self.cli_command)
+        self._cli_status_cache = None
+        self._cli_status_ts = 0
+        self._cli_status_lock = threading.Lock()
+        self._stdin_supported = True
+        
+        # Prefer the shared in-process SDK model; the CLI remains the fallback
+        self._model = get_genai_model()
+        
+        self._result_cache = LRUCache(RESULT_CACHE_SIZE)
+        self._supported_languages = None
     
     def check_cli_availability(self) -> dict:
+        """Check if Gemini CLI is available, reusing the last probe for CLI_STATUS_TTL seconds."""
+        with self._cli_status_lock:
+            if self._cli_status_cache is not None and time.monotonic() - self._cli_status_ts < CLI_STATUS_TTL:
+                return self._cli_status_cache
+            
+            self._cli_status_cache = self._probe_cli()
+            self._cli_status_ts = time.monotonic()
+            return self._cli_status_cache
+    
+    def _probe_cli(self) -> dict:
         """Check if Gemini CLI is available and properly configured."""
+        if self.cli_path is None:
+            return {
+                "available": False,
+                "error": f"Command '{self.cli_command}' not found in PATH. Please install Gemini CLI.",
+                "suggestion": "Install via: pip install google-generativeai"
+            }
+        
         try:
             # First try to check if command exists
             result = subprocess.run(
-                [self.cli_command, "--version"],
+                [self.cli_path, "--version"],
                 capture_output=True,
                 text=True,
                 timeout=10,
@@ -36,7 +224,7 @@ class GeminiCLIService:
                 for cmd in ["--help", "help", "languages"]:
                     try:
                         result = subprocess.run(
-                            [self.cli_command, cmd],
+                            [self.cli_path, cmd],
                             capture_output=True,
                             text=True,
                             timeout=5,
@@ -71,7 +259,7 @@ class GeminiCLIService:
     
     def transcribe_audio(self, audio_file_path: str, language: str = "auto") -> Optional[Dict[str, Any]]:
         """
-        Transcribe audio file using Gemini CLI.
+        Transcribe audio file using the Gemini SDK, falling back to the Gemini CLI.
         
         Args:
             audio_file_path: Path to the audio file
@@ -80,10 +268,67 @@ class GeminiCLIService:
         Returns:
             Dictionary containing transcription results or None if failed
         """
+        # Reading the file for its cache key doubles as the existence check
         try:
-            if not os.path.exists(audio_file_path):
-                logger.error(f"Audio file not found: {audio_file_path}")
-                return None
+            key = self._audio_cache_key(audio_file_path, language)
+        except OSError as e:
+            logger.error(f"Audio file not found: {audio_file_path} ({e})")
+            return None
+        
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            logger.info("Transcription served from cache")
+            return dict(cached)
+        
+        result = self._transcribe_audio(audio_file_path, language)
+        self._cache_result(key, result)
+        return result
+    
+    def transcribe_audio_bytes(self, audio_bytes: bytes, mime_type: str = "audio/wav",
+                               language: str = "auto") -> Optional[Dict[str, Any]]:
+        """
+        Transcribe in-memory audio without a round-trip through the filesystem.
+        
+        Args:
+            audio_bytes: Encoded audio data
+            mime_type: MIME type of the audio data
+            language: Source language code (default: auto-detect)
+            
+        Returns:
+            Dictionary containing transcription results or None if failed
+        """
+        digest = hashlib.blake2b(audio_bytes, digest_size=16).hexdigest()
+        key = f"transcribe:{digest}:{language}"
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            logger.info("Transcription served from cache")
+            return dict(cached)
+        
+        if self._model is not None:
+            try:
+                result = self._transcribe_part(self._audio_part(audio_bytes, mime_type), language)
+                self._cache_result(key, result)
+                return result
+            except Exception as e:
+                logger.warning(f"Gemini SDK transcription failed, trying CLI: {e}")
+        
+        # The CLI only reads files, so spill to disk for it
+        suffix = mimetypes.guess_extension(mime_type) or ".wav"
+        with tempfile.NamedTemporaryFile(suffix=suffix) as audio_file:
+            audio_file.write(audio_bytes)
+            audio_file.flush()
+            result = self._transcribe_audio(audio_file.name, language)
+        self._cache_result(key, result)
+        return result
+    
+    def _transcribe_audio(self, audio_file_path: str, language: str) -> Optional[Dict[str, Any]]:
+        """Transcribe audio without consulting the result cache."""
+        try:
+            if self._model is not None:
+                try:
+                    return self._transcribe_with_sdk(audio_file_path, language)
+                except Exception as e:
+                    logger.warning(f"Gemini SDK transcription failed, trying CLI: {e}")
             
             # Check CLI availability first
             cli_status = self.check_cli_availability()
@@ -93,40 +338,34 @@ class GeminiCLIService:
             
             # Construct the Gemini CLI command for transcription
             command = [
-                self.cli_command,
+                self.cli_path,
                 "transcribe",
                 "--file", audio_file_path,
                 "--language", language,
                 "--format", "json"
             ]
             
-            logger.info(f"Executing transcription command: {' '.join(command)}")
+            logger.info("Executing transcription command: %s", command)
             result = subprocess.run(
                 command,
                 capture_output=True,
-                text=True,
                 timeout=300,  # 5 minutes timeout
-                check=True
+                check=False
             )
             
+            if result.returncode != 0:
+                logger.error(f"Gemini CLI transcription failed: {result.stderr.decode(errors='replace')}")
+                return self.get_fallback_transcription(audio_file_path, language)
+            
             # Parse the JSON output
-            transcription_data = json.loads(result.stdout)
+            transcription = self._parse_transcription(result.stdout, language)
             logger.info("Transcription completed successfully")
+            return transcription
             
-            return {
-                "text": transcription_data.get("text", ""),
-                "language": transcription_data.get("language", language),
-                "confidence": transcription_data.get("confidence", 0.0),
-                "segments": transcription_data.get("segments", [])
-            }
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Gemini CLI transcription failed: {e.stderr}")
-            return self.get_fallback_transcription(audio_file_path, language)
         except subprocess.TimeoutExpired:
             logger.error("Transcription timeout expired")
             return None
-        except json.JSONDecodeError as e:
+        except JSON_DECODE_ERRORS as e:
             logger.error(f"Failed to parse transcription output: {e}")
             return None
         except Exception as e:
@@ -135,7 +374,7 @@ class GeminiCLIService:
     
     def translate_text(self, text: str, target_language: str, source_language: str = "auto") -> Optional[Dict[str, Any]]:
         """
-        Translate text using Gemini CLI.
+        Translate text using the Gemini SDK, falling back to the Gemini CLI.
         
         Args:
             text: Text to translate
@@ -145,49 +384,60 @@ class GeminiCLIService:
         Returns:
             Dictionary containing translation results or None if failed
         """
+        key = self._text_cache_key(text, target_language, source_language)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return {**cached, "original_text": text}
+        
+        result = self._translate_text(text, target_language, source_language, use_sdk=True)
+        self._cache_result(key, result)
+        return result
+    
+    def _text_cache_key(self, text: str, target_language: str, source_language: str) -> str:
+        """Cache key for a translation: BLAKE2b of whitespace-normalized text plus the language pair."""
+        digest = hashlib.blake2b(" ".join(text.split()).encode(), digest_size=16).hexdigest()
+        return f"translate:{digest}:{source_language}:{target_language}"
+    
+    def _audio_cache_key(self, audio_file_path: str, language: str) -> str:
+        """Cache key for a transcription: BLAKE2b of the audio bytes plus the language."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(audio_file_path, 'rb') as audio_file:
+            for block in iter(lambda: audio_file.read(1024 * 1024), b''):
+                digest.update(block)
+        return f"transcribe:{digest.hexdigest()}:{language}"
+    
+    def _cache_result(self, key: Optional[str], result: Optional[Dict[str, Any]]):
+        """Remember a real model result; failures and placeholder fallbacks are never cached."""
+        if key is not None and result and result.get("method") != "fallback":
+            self._result_cache.put(key, result)
+    
+    def _translate_text(self, text: str, target_language: str, source_language: str,
+                        use_sdk: bool) -> Optional[Dict[str, Any]]:
+        """Translate text, optionally skipping the SDK attempt (when the caller already tried it)."""
         try:
             if not text.strip():
                 logger.error("Empty text provided for translation")
                 return None
             
+            if use_sdk and self._model is not None:
+                try:
+                    return self._translate_with_sdk(text, target_language, source_language)
+                except Exception as e:
+                    logger.warning(f"Gemini SDK translation failed, trying CLI: {e}")
+            
             # Check CLI availability first
             cli_status = self.check_cli_availability()
             if not cli_status.get("available", False):
                 logger.error(f"Gemini CLI not available: {cli_status.get('error', 'Unknown error')}")
                 return self.get_fallback_translation(text, target_language)
             
-            # For longer texts, use a temporary file
+            # For longer texts, pass the text on stdin instead of the command line
             if len(text) > 1000:
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
-                    temp_file.write(text)
-                    temp_file_path = temp_file.name
-                
-                try:
-                    command = [
-                        self.cli_command,
-                        "translate",
-                        "--file", temp_file_path,
-                        "--source-language", source_language,
-                        "--target-language", target_language,
-                        "--format", "json"
-                    ]
-                    
-                    logger.info(f"Executing translation command with file: {' '.join(command)}")
-                    result = subprocess.run(
-                        command,
-                        capture_output=True,
-                        text=True,
-                        timeout=120,  # 2 minutes timeout
-                        check=True
-                    )
-                    
-                finally:
-                    # Clean up temporary file
-                    os.unlink(temp_file_path)
+                result = self._run_long_translation(text, target_language, source_language)
             else:
                 # For shorter texts, pass directly as argument
                 command = [
-                    self.cli_command,
+                    self.cli_path,
                     "translate",
                     "--text", text,
                     "--source-language", source_language,
@@ -195,40 +445,208 @@ class GeminiCLIService:
                     "--format", "json"
                 ]
                 
-                logger.info(f"Executing translation command: {' '.join(command)}")
+                logger.info("Executing translation command: %s", command)
                 result = subprocess.run(
                     command,
                     capture_output=True,
-                    text=True,
                     timeout=120,  # 2 minutes timeout
-                    check=True
+                    check=False
                 )
             
+            if result.returncode != 0:
+                logger.error(f"Gemini CLI translation failed: {result.stderr.decode(errors='replace')}")
+                return self.get_fallback_translation(text, target_language)
+            
             # Parse the JSON output
-            translation_data = json.loads(result.stdout)
+            translation = self._parse_translation(result.stdout, text, target_language, source_language)
             logger.info("Translation completed successfully")
+            return translation
             
-            return {
-                "translated_text": translation_data.get("translated_text", ""),
-                "source_language": translation_data.get("source_language", source_language),
-                "target_language": translation_data.get("target_language", target_language),
-                "confidence": translation_data.get("confidence", 0.0),
-                "original_text": text
-            }
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Gemini CLI translation failed: {e.stderr}")
-            return self.get_fallback_translation(text, target_language)
         except subprocess.TimeoutExpired:
             logger.error("Translation timeout expired")
             return None
-        except json.JSONDecodeError as e:
+        except JSON_DECODE_ERRORS as e:
             logger.error(f"Failed to parse translation output: {e}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error during translation: {e}")
             return None
     
+    def _generate_json(self, contents: list, timeout: int, decode=json_loads):
+        """Run a Gemini SDK request that must answer in JSON and decode the reply."""
+        response = self._model.generate_content(
+            contents,
+            generation_config={"response_mime_type": "application/json"},
+            request_options={"timeout": timeout}
+        )
+        return decode(response.text)
+    
+    def _parse_transcription(self, raw, language: str) -> Dict[str, Any]:
+        """Decode a JSON transcription reply into the result dict."""
+        if MSGSPEC_AVAILABLE:
+            decoded = _transcription_decoder.decode(raw)
+            return {
+                "text": decoded.text,
+                "language": decoded.language or language,
+                "confidence": decoded.confidence,
+                "segments": msgspec.to_builtins(decoded.segments)
+            }
+        
+        transcription_data = json_loads(raw)
+        return {
+            "text": transcription_data.get("text", ""),
+            "language": transcription_data.get("language", language),
+            "confidence": transcription_data.get("confidence", 0.0),
+            "segments": transcription_data.get("segments", [])
+        }
+    
+    def _parse_translation(self, raw, text: str, target_language: str, source_language: str) -> Dict[str, Any]:
+        """Decode a JSON translation reply into the result dict."""
+        if MSGSPEC_AVAILABLE:
+            decoded = _translation_decoder.decode(raw)
+            return {
+                "translated_text": decoded.translated_text,
+                "source_language": decoded.source_language or source_language,
+                "target_language": decoded.target_language or target_language,
+                "confidence": decoded.confidence,
+                "original_text": text
+            }
+        
+        return self._format_sdk_translation(json_loads(raw), text, target_language, source_language)
+    
+    def _transcribe_with_sdk(self, audio_file_path: str, language: str) -> Dict[str, Any]:
+        """Transcribe audio in-process through the google-generativeai SDK."""
+        mime_type = mimetypes.guess_type(audio_file_path)[0] or "audio/wav"
+        
+        if os.path.getsize(audio_file_path) > INLINE_AUDIO_MAX_BYTES:
+            audio_part = genai.upload_file(audio_file_path, mime_type=mime_type)
+        else:
+            with open(audio_file_path, 'rb') as audio_file:
+                audio_part = {"mime_type": mime_type, "data": audio_file.read()}
+        
+        return self._transcribe_part(audio_part, language)
+    
+    def _audio_part(self, audio_bytes: bytes, mime_type: str):
+        """Inline small audio; upload large audio once through the Files API."""
+        if len(audio_bytes) > INLINE_AUDIO_MAX_BYTES:
+            return genai.upload_file(io.BytesIO(audio_bytes), mime_type=mime_type)
+        return {"mime_type": mime_type, "data": audio_bytes}
+    
+    def _transcribe_part(self, audio_part, language: str) -> Dict[str, Any]:
+        """Run the transcription prompt against an inline or uploaded audio part.
+        
+        Uploaded parts are deleted afterwards; left alone they count against the
+        project's Files API storage until they expire.
+        """
+        try:
+            transcription = self._generate_json(
+                [audio_part, TRANSCRIBE_PROMPT.format(language=language)],
+                timeout=300,
+                decode=lambda raw: self._parse_transcription(raw, language)
+            )
+        finally:
+            if not isinstance(audio_part, dict):
+                self._delete_uploaded_file(audio_part)
+        logger.info("Transcription completed successfully via Gemini SDK")
+        return transcription
+    
+    def _delete_uploaded_file(self, uploaded_file):
+        """Delete a Files API upload, logging rather than raising on failure."""
+        try:
+            genai.delete_file(uploaded_file.name)
+        except Exception as e:
+            logger.warning(f"Failed to delete uploaded audio {uploaded_file.name}: {e}")
+    
+    def _translate_with_sdk(self, text: str, target_language: str, source_language: str) -> Dict[str, Any]:
+        """Translate text in-process through the google-generativeai SDK."""
+        translation = self._generate_json(
+            [TRANSLATE_PROMPT.format(
+                source_language=source_language,
+                target_language=target_language,
+                text=text
+            )],
+            timeout=120,
+            decode=lambda raw: self._parse_translation(raw, text, target_language, source_language)
+        )
+        logger.info("Translation completed successfully via Gemini SDK")
+        return translation
+    
+    async def _translate_with_sdk_async(self, text: str, target_language: str, source_language: str) -> Dict[str, Any]:
+        """Translate text through the SDK's native async client, without occupying a worker thread."""
+        response = await self._model.generate_content_async(
+            [TRANSLATE_PROMPT.format(
+                source_language=source_language,
+                target_language=target_language,
+                text=text
+            )],
+            generation_config={"response_mime_type": "application/json"},
+            request_options={"timeout": 120}
+        )
+        logger.info("Translation completed successfully via Gemini SDK")
+        return self._parse_translation(response.text, text, target_language, source_language)
+    
+    def _format_sdk_translation(self, translation_data: Dict[str, Any], text: str,
+                                target_language: str, source_language: str) -> Dict[str, Any]:
+        """Shape a parsed SDK translation reply like the CLI result."""
+        return {
+            "translated_text": translation_data.get("translated_text", ""),
+            "source_language": translation_data.get("source_language", source_language),
+            "target_language": translation_data.get("target_language", target_language),
+            "confidence": translation_data.get("confidence", 0.0),
+            "original_text": text
+        }
+    
+    def _run_long_translation(self, text: str, target_language: str, source_language: str) -> subprocess.CompletedProcess:
+        """Run a long-text translation via stdin, falling back to a temporary file for CLIs without --stdin.
+
+        The caller is responsible for checking the returned process's returncode.
+        """
+        if self._stdin_supported:
+            command = [
+                self.cli_path,
+                "translate",
+                "--source-language", source_language,
+                "--target-language", target_language,
+                "--format", "json",
+                "--stdin"
+            ]
+            
+            logger.info("Executing translation command with stdin: %s", command)
+            result = subprocess.run(
+                command,
+                input=text.encode(),
+                capture_output=True,
+                timeout=120,  # 2 minutes timeout
+                check=False
+            )
+            if result.returncode != CLI_USAGE_ERROR:
+                return result
+            
+            logger.warning("Gemini CLI rejected --stdin, falling back to a temporary file")
+            self._stdin_supported = False
+        
+        # Deleted on close, even if the CLI call raises; tmpfs keeps it off the disk
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', dir=TEXT_SPILL_DIR) as temp_file:
+            temp_file.write(text)
+            temp_file.flush()
+            
+            command = [
+                self.cli_path,
+                "translate",
+                "--file", temp_file.name,
+                "--source-language", source_language,
+                "--target-language", target_language,
+                "--format", "json"
+            ]
+            
+            logger.info("Executing translation command with file: %s", command)
+            return subprocess.run(
+                command,
+                capture_output=True,
+                timeout=120,  # 2 minutes timeout
+                check=False
+            )
+    
     def get_fallback_transcription(self, audio_file_path: str, language: str) -> Optional[Dict[str, Any]]:
         """Fallback transcription method when CLI is unavailable."""
         try:
@@ -268,39 +686,176 @@ class GeminiCLIService:
         """
         Translate multiple texts in batch.
         
+        With the SDK, texts are sent BATCH_TRANSLATE_CHUNK_SIZE at a time in a single
+        request each; otherwise the per-text CLI calls run concurrently.
+        
         Args:
             texts: List of texts to translate
             target_language: Target language code
             source_language: Source language code
             
         Returns:
-            List of translation results
+            List of translation results, in the same order as texts
         """
+        if not texts:
+            return []
+        
+        if self._model is None:
+            return list(service_pool.map(
+                lambda text: self.translate_text(text, target_language, source_language),
+                texts
+            ))
+        
+        results = [None] * len(texts)
+        pending = []
+        for index, text in enumerate(texts):
+            cached = self._result_cache.get(self._text_cache_key(text, target_language, source_language))
+            if cached is not None:
+                results[index] = {**cached, "original_text": text}
+            elif text.strip():
+                pending.append(index)
+        
+        chunks = [pending[i:i + BATCH_TRANSLATE_CHUNK_SIZE]
+                  for i in range(0, len(pending), BATCH_TRANSLATE_CHUNK_SIZE)]
+        translated_chunks = service_pool.map(
+            lambda chunk: self._translate_batch_with_sdk(
+                [texts[index] for index in chunk], target_language, source_language
+            ),
+            chunks
+        )
+        for chunk, translated in zip(chunks, translated_chunks):
+            for index, result in zip(chunk, translated):
+                results[index] = result
+        
+        return results
+    
+    def _translate_batch_with_sdk(self, texts: list, target_language: str, source_language: str) -> list:
+        """Translate a chunk of texts in one SDK request, falling back to per-text calls on a bad reply."""
+        try:
+            translated = self._generate_json(
+                [BATCH_TRANSLATE_PROMPT.format(
+                    source_language=source_language,
+                    target_language=target_language,
+                    texts=json.dumps(texts, ensure_ascii=False)
+                )],
+                timeout=120
+            )
+            if not isinstance(translated, list) or len(translated) != len(texts):
+                raise ValueError(f"expected {len(texts)} translations, got {translated!r:.200}")
+        except Exception as e:
+            logger.warning(f"Batched Gemini translation failed, translating texts individually: {e}")
+            return [self.translate_text(text, target_language, source_language) for text in texts]
+        
         results = []
-        for text in texts:
-            result = self.translate_text(text, target_language, source_language)
+        for text, translated_text in zip(texts, translated):
+            result = self._format_sdk_translation(
+                {"translated_text": str(translated_text)}, text, target_language, source_language
+            )
+            self._cache_result(self._text_cache_key(text, target_language, source_language), result)
             results.append(result)
+        
+        logger.info(f"Batch of {len(texts)} texts translated in one Gemini SDK request")
         return results
     
+    async def transcribe_audio_async(self, audio_file_path: str, language: str = "auto") -> Optional[Dict[str, Any]]:
+        """
+        Transcribe audio from async code without blocking the event loop.
+        
+        Args:
+            audio_file_path: Path to the audio file
+            language: Source language code (default: auto-detect)
+            
+        Returns:
+            Dictionary containing transcription results or None if failed
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(service_pool, self.transcribe_audio, audio_file_path, language)
+    
+    async def translate_text_async(self, text: str, target_language: str, source_language: str = "auto") -> Optional[Dict[str, Any]]:
+        """
+        Translate text from async code, using the SDK's async API when configured.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language code
+            source_language: Source language code (default: auto-detect)
+            
+        Returns:
+            Dictionary containing translation results or None if failed
+        """
+        key = self._text_cache_key(text, target_language, source_language)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return {**cached, "original_text": text}
+        
+        use_sdk = self._model is not None and bool(text.strip())
+        if use_sdk:
+            try:
+                result = await self._translate_with_sdk_async(text, target_language, source_language)
+                self._cache_result(key, result)
+                return result
+            except Exception as e:
+                logger.warning(f"Gemini SDK translation failed, trying CLI: {e}")
+        
+        # CLI path blocks on a subprocess, so run it on the shared pool
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            service_pool, self._translate_text, text, target_language, source_language, not use_sdk
+        )
+        self._cache_result(key, result)
+        return result
+    
+    async def batch_translate_async(self, texts: list, target_language: str, source_language: str = "auto") -> list:
+        """
+        Translate multiple texts concurrently from async code.
+        
+        Args:
+            texts: List of texts to translate
+            target_language: Target language code
+            source_language: Source language code
+            
+        Returns:
+            List of translation results (None for failures), in the same order as texts
+        """
+        semaphore = asyncio.Semaphore(BATCH_TRANSLATE_CONCURRENCY)
+        
+        async def translate_one(text):
+            async with semaphore:
+                return await self.translate_text_async(text, target_language, source_language)
+        
+        results = await asyncio.gather(*(translate_one(text) for text in texts), return_exceptions=True)
+        return [None if isinstance(result, Exception) else result for result in results]
+    
     def get_supported_languages(self) -> Optional[Dict[str, str]]:
         """
-        Get list of supported languages from Gemini CLI.
+        Get list of supported languages from Gemini.
         
         Returns:
             Dictionary mapping language codes to language names
         """
+        if self._model is not None:
+            return dict(SDK_SUPPORTED_LANGUAGES)
+        
+        # The CLI's language list doesn't change within a process
+        if self._supported_languages is not None:
+            return dict(self._supported_languages)
+        
         try:
-            command = [self.cli_command, "languages", "--format", "json"]
+            command = [self.cli_path, "languages", "--format", "json"]
             result = subprocess.run(
                 command,
                 capture_output=True,
-                text=True,
                 timeout=30,
-                check=True
+                check=False
             )
             
-            languages_data = json.loads(result.stdout)
-            return languages_data.get("languages", {})
+            if result.returncode != 0:
+                logger.error(f"Failed to get supported languages: {result.stderr.decode(errors='replace')}")
+                return None
+            
+            languages_data = json_loads(result.stdout)
+            self._supported_languages = languages_data.get("languages", {})
+            return dict(self._supported_languages)
             
         except Exception as e:
             logger.error(f"Failed to get supported languages: {e}")
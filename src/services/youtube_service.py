@@ -1,40 +1,292 @@
 import os
-import yt_dlp
+import asyncio
+import atexit
 import logging
 import random
 import time
 import tempfile
 import json
 import re
+import shutil
 import subprocess
+import threading
+import queue
+from functools import lru_cache, partial
+from types import MappingProxyType
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from typing import Optional, Dict, Any, List
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
 from src.services.adaptive_mitigation_service import AdaptiveMitigationService
+from ._executor import service_pool
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# DASH/HLS fragments fetched in parallel per download
+CONCURRENT_FRAGMENT_DOWNLOADS = int(os.getenv('YTDLP_CONCURRENT_FRAGMENTS', 16))
+
+# Byte-range size for single-file (non-fragmented) downloads
+HTTP_CHUNK_SIZE = 10 * 1024 * 1024
+
+# The .info.json sidecar duplicates the info dict already returned in memory; opt in when needed
+WRITE_INFO_JSON = os.getenv('YT_WRITE_INFOJSON', '0') == '1'
+
+# aria2c splits each file across parallel connections when it is installed
+ARIA2C_PATH = shutil.which('aria2c')
+ARIA2C_ARGS = ['-x', '16', '-s', '16', '-k', '1M']
+
+# Browser-like headers sent with every yt-dlp request; the per-call User-Agent is merged in
+HTTP_HEADERS = MappingProxyType({
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-us,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Referer': 'https://www.youtube.com/',
+})
+
+# Built API clients shared across service instances, keyed by credential source
+_youtube_api_clients = {}
+_youtube_api_lock = threading.Lock()
+
+# A failed authentication is not retried for this many seconds; records when each source last failed
+YOUTUBE_API_RETRY_INTERVAL = 60
+_youtube_api_failures = {}
+
+# Resumable upload chunk size; bounds memory per request and gives meaningful progress
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Failed chunks are retried this many times, sleeping a random 0..min(2**n, cap) seconds
+UPLOAD_MAX_RETRIES = 5
+UPLOAD_MAX_BACKOFF = 32
+
+# Client errors worth retrying (timeout, rate limit); other 4xx responses are permanent
+RETRYABLE_CLIENT_STATUSES = (408, 429)
+
+# Recognizes YouTube watch/embed/short-link URLs; compiled once, ASCII-only like the ids themselves
+YOUTUBE_URL_PATTERN = re.compile(
+    r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
+    r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})',
+    re.ASCII
+)
+
+# Canonical URL prefixes checked before falling back to the regex; each is one the pattern accepts
+FAST_URL_PREFIXES = ('https://www.youtube.com/watch?v=', 'https://youtu.be/')
+
+# Characters the pattern excludes from a video id
+INVALID_VIDEO_ID_CHARS = frozenset('&=%?')
+
+# Pulls the 11-character video id out of watch, youtu.be, embed and shorts URLs
+VIDEO_ID_PATTERN = re.compile(r'(?:v=|youtu\.be/|embed/|v/|shorts/)([A-Za-z0-9_-]{11})')
+
+# get_video_info results are reused for this long, for up to this many videos
+VIDEO_INFO_CACHE_TTL = 3600
+VIDEO_INFO_CACHE_SIZE = 1024
+
+# Failed lookups are remembered briefly so repeated requests for a bad video don't hammer YouTube
+VIDEO_INFO_NEGATIVE_TTL = 60
+
+# Most download outcomes written to the mitigation log in one append
+OUTCOME_BATCH_SIZE = 64
+
+# A partial batch is written once its oldest outcome has waited this many seconds
+OUTCOME_FLUSH_INTERVAL = 5
+
+# How long flush_outcomes waits for the background writer to finish its last batch
+OUTCOME_DRAIN_TIMEOUT = 10
+
+# Idle YoutubeDL instances kept per service for reuse across calls
+YDL_POOL_SIZE = 8
+
+# Options drawn afresh for every download; set on the checked-out instance rather than keying the pool
+PER_CALL_YDL_OPTS = frozenset(['user_agent', 'sleep_interval', 'paths'])
+
+# Output template relative to paths['home']; the directory changes per call, the template never does
+YDL_OUTTMPL = '%(title)s.%(ext)s'
+
+# Batch downloads running at once per process; they take minutes, so they don't share service_pool
+YT_MAX_PARALLEL = int(os.getenv('YT_MAX_PARALLEL', min(8, os.cpu_count() or 1)))
+
+# Extracted audio is 16 kHz mono PCM, the rate speech transcription works at
+AUDIO_SAMPLE_RATE = 16000
+
+def _open_for_prefetch(path: str) -> Optional[int]:
+    """Open a descriptor used only for page-cache read-ahead hints (None where unsupported)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return None
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+def _prefetch_range(fd: int, offset: int, length: int = UPLOAD_CHUNK_SIZE):
+    """Ask the kernel to read a byte range into the page cache asynchronously."""
+    try:
+        os.posix_fadvise(fd, offset, length, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+
+# Created on the first batch download, sized by YT_MAX_PARALLEL
+_download_pool = None
+_download_pool_lock = threading.Lock()
+
+def _get_download_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool batch downloads run on, creating it on first use."""
+    global _download_pool
+    if _download_pool is None:
+        with _download_pool_lock:
+            if _download_pool is None:
+                _download_pool = ThreadPoolExecutor(
+                    max_workers=YT_MAX_PARALLEL,
+                    thread_name_prefix='yt-download'
+                )
+                atexit.register(_download_pool.shutdown)
+    return _download_pool
+
+# Output directories already created by this process
+_ensured_dirs = set()
+
+def _ensure_dir(path: str):
+    """Create a directory once per process instead of re-issuing mkdir on every call."""
+    if path not in _ensured_dirs:
+        os.makedirs(path, exist_ok=True)
+        _ensured_dirs.add(path)
+
+@lru_cache(maxsize=1)
+def _parse_token_json(token_json: str) -> dict:
+    """Parse the YOUTUBE_TOKEN_JSON value, reusing the result while the variable is unchanged."""
+    return json_loads(token_json)
+
 class YouTubeService:
     """Service for downloading videos from YouTube and uploading dubbed versions."""
     
+    # User agents the adaptive mitigation service rotates through
+    user_agents = AdaptiveMitigationService.user_agents
+    
+    # Download options that are the same for every call; per-call values are layered on a copy
+    _BASE_YDL_OPTS = MappingProxyType({
+        'writeinfojson': WRITE_INFO_JSON,
+        'writethumbnail': False,
+        'ignoreerrors': True,
+        'no_warnings': False,
+        'extractaudio': False,
+        'referer': HTTP_HEADERS['Referer'],
+        'retries': 3,
+        'fragment_retries': 10,  # Fresh uploads 404 on fragments until the CDN catches up
+        'skip_unavailable_fragments': True,
+        'concurrent_fragment_downloads': CONCURRENT_FRAGMENT_DOWNLOADS,
+        'http_chunk_size': HTTP_CHUNK_SIZE,
+    })
+    
     def __init__(self, credentials_file: str = None, token_file: str = None):
         self.credentials_file = credentials_file
         self.token_file = token_file
         self.youtube_api = None
         self.adaptive_mitigation_service = AdaptiveMitigationService()
+        self._video_info_cache = OrderedDict()
+        self._ydl_pool = OrderedDict()
+        self._ydl_pool_lock = threading.Lock()
+        self._outcome_queue = queue.Queue()
+        self._outcome_flusher = None
+        self._outcome_flusher_lock = threading.Lock()
+        self._outcome_atexit_registered = False
+    
+    @contextmanager
+    def _youtube_dl(self, ydl_opts: dict):
+        """
+        Check out a YoutubeDL built for these options, reusing an idle one when possible.
+        
+        Building a YoutubeDL loads extractors and parses options, so instances are kept
+        open between calls. A checked-out instance is never shared between threads.
+        Instances are pooled by their stable options; PER_CALL_YDL_OPTS are applied to
+        the instance on every checkout.
+        """
+        # Options may hold dicts/lists, so key on their repr
+        key = repr(sorted(item for item in ydl_opts.items() if item[0] not in PER_CALL_YDL_OPTS))
+        with self._ydl_pool_lock:
+            ydl = self._ydl_pool.pop(key, None)
+        if ydl is None:
+            # yt-dlp pulls in hundreds of modules, so it is only imported once a download needs it
+            import yt_dlp
+            
+            # Entered here and exited on eviction, like one long-lived with block
+            ydl = yt_dlp.YoutubeDL(ydl_opts).__enter__()
+        
+        # yt-dlp reads these from params on each request or filename, so a reused instance picks them up
+        for name in PER_CALL_YDL_OPTS & ydl_opts.keys():
+            ydl.params[name] = ydl_opts[name]
+        if ydl_opts.get('user_agent'):
+            # yt-dlp's API only honours the User-Agent through http_headers
+            ydl.params['http_headers']['User-Agent'] = ydl_opts['user_agent']
+        
+        try:
+            yield ydl
+        finally:
+            with self._ydl_pool_lock:
+                if key not in self._ydl_pool:
+                    self._ydl_pool[key] = ydl
+                    ydl = None
+                if len(self._ydl_pool) > YDL_POOL_SIZE:
+                    _, ydl = self._ydl_pool.popitem(last=False)
+            if ydl is not None:
+                ydl.__exit__(None, None, None)
     
     def _get_youtube_api(self):
-        """Initialize YouTube API client with authentication."""
+        """Return the shared YouTube API client, authenticating only on first use."""
         if self.youtube_api:
             return self.youtube_api
         
+        key = (self.credentials_file, self.token_file)
+        client = _youtube_api_clients.get(key)
+        if client is None:
+            # Callers retrying on None shouldn't redo the whole credential dance each time
+            failed_at = _youtube_api_failures.get(key)
+            if failed_at is not None and time.monotonic() - failed_at < YOUTUBE_API_RETRY_INTERVAL:
+                return None
+            
+            # Double-checked so concurrent uploads never run the OAuth flow twice
+            with _youtube_api_lock:
+                client = _youtube_api_clients.get(key)
+                if client is None:
+                    client = self._build_youtube_api()
+                    if client is not None:
+                        _youtube_api_clients[key] = client
+                        _youtube_api_failures.pop(key, None)
+                    else:
+                        _youtube_api_failures[key] = time.monotonic()
+        
+        self.youtube_api = client
+        return client
+    
+    def invalidate_api(self):
+        """Drop the cached API client and any failure back-off so the next call re-authenticates."""
+        key = (self.credentials_file, self.token_file)
+        with _youtube_api_lock:
+            _youtube_api_clients.pop(key, None)
+            _youtube_api_failures.pop(key, None)
+        self.youtube_api = None
+    
+    def _build_youtube_api(self):
+        """Initialize YouTube API client with authentication."""
         SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
         creds = None
         
         try:
+            # The Google client stack is heavy to import and only needed for uploads
+            import httplib2
+            from googleapiclient.discovery import build
+            from google.auth.transport.requests import Request
+            from google.oauth2.credentials import Credentials
+            from google_auth_httplib2 import AuthorizedHttp
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            
             # Load credentials from environment variable if available
             youtube_credentials_json = os.getenv('YOUTUBE_CREDENTIALS_JSON')
             if youtube_credentials_json:
@@ -42,7 +294,7 @@ class YouTubeService:
                 youtube_token_json = os.getenv('YOUTUBE_TOKEN_JSON')
                 if youtube_token_json:
                     creds = Credentials.from_authorized_user_info(
-                        json.loads(youtube_token_json), SCOPES
+                        _parse_token_json(youtube_token_json), SCOPES
                     )
                 
                 if not creds or not creds.valid:
@@ -54,10 +306,13 @@ class YouTubeService:
                         return None
             
             # Fallback to file-based credentials for local development
-            elif self.token_file and os.path.exists(self.token_file):
-                creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+            elif self.token_file:
+                try:
+                    creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+                except FileNotFoundError:
+                    logger.error(f"YouTube token file not found: {self.token_file}")
                 
-                if not creds or not creds.valid:
+                if creds and not creds.valid:
                     if creds and creds.expired and creds.refresh_token:
                         creds.refresh(Request())
                     else:
@@ -80,8 +335,9 @@ class YouTubeService:
                             return None
             
             if creds:
-                self.youtube_api = build('youtube', 'v3', credentials=creds)
-                return self.youtube_api
+                # One persistent authorized connection carries every upload chunk
+                authed_http = AuthorizedHttp(creds, http=httplib2.Http())
+                return build('youtube', 'v3', http=authed_http)
             else:
                 logger.error("No valid YouTube API credentials available")
                 return None
@@ -92,14 +348,18 @@ class YouTubeService:
     
     def validate_video_url(self, url: str) -> bool:
         """Validate if URL is a valid YouTube video URL."""
-        try:
-            youtube_regex = re.compile(
-                r'(https?://)?(www\.)?(youtube|youtu|youtube-nocookie)\.(com|be)/'
-                r'(watch\?v=|embed/|v/|.+\?v=)?([^&=%\?]{11})'
-            )
-            return bool(youtube_regex.match(url))
-        except:
+        if not isinstance(url, str):
             return False
+        
+        # Most URLs are canonical watch or short links, which need no regex
+        for prefix in FAST_URL_PREFIXES:
+            if url.startswith(prefix):
+                video_id = url[len(prefix):len(prefix) + 11]
+                if len(video_id) == 11 and INVALID_VIDEO_ID_CHARS.isdisjoint(video_id):
+                    return True
+                break
+        
+        return bool(YOUTUBE_URL_PATTERN.match(url))
     
     def download_video(self, url: str, output_dir: str, quality: str = 'best') -> Optional[Dict[str, Any]]:
         """
@@ -119,37 +379,34 @@ class YouTubeService:
                 logger.error(f"Invalid YouTube URL: {url}")
                 return None
             
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
             
             # Get adaptive mitigation parameters
             adaptive_params = self.adaptive_mitigation_service.get_adaptive_params()
             
-            # Apply adaptive delay
-            time.sleep(adaptive_params.get('sleep_interval', random.uniform(1, 3)))
+            # No pre-download sleep: yt-dlp applies sleep_interval itself, and only
+            # between the requests that actually need it
+            # Configure yt-dlp: shared base options plus this call's values
+            # _youtube_dl sets the per-call User-Agent into the instance's http_headers
+            user_agent = adaptive_params.get('user_agent')
+            # Drawn only when the service gave none; this one value is both applied and logged
+            sleep_interval = adaptive_params.get('sleep_interval')
+            if sleep_interval is None:
+                sleep_interval = random.uniform(1, 3)
             
-            # Configure yt-dlp with enhanced options
-            ydl_opts = {
-                'format': quality,
-                'outtmpl': os.path.join(output_dir, '%(title)s.%(ext)s'),
-                'writeinfojson': True,
-                'ignoreerrors': True,
-                'no_warnings': False,
-                'extractaudio': False,
-                'user_agent': adaptive_params.get('user_agent'),
-                'referer': 'https://www.youtube.com/',
-                'sleep_interval': adaptive_params.get('sleep_interval', random.uniform(1, 3)),
-                'retries': 3,
-                'fragment_retries': 3,
-                'skip_unavailable_fragments': True,
-                'http_headers': {
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-us,en;q=0.5',
-                    'Accept-Encoding': 'gzip, deflate',
-                    'DNT': '1',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                }
-            }
+            ydl_opts = dict(
+                self._BASE_YDL_OPTS,
+                format=quality,
+                outtmpl=YDL_OUTTMPL,
+                paths={'home': output_dir},
+                user_agent=user_agent,
+                sleep_interval=sleep_interval,
+                http_headers=dict(HTTP_HEADERS)
+            )
+            
+            if ARIA2C_PATH:
+                ydl_opts['external_downloader'] = {'default': ARIA2C_PATH}
+                ydl_opts['external_downloader_args'] = {'aria2c': ARIA2C_ARGS}
             
             # Add proxy support if configured
             proxy_url = os.getenv('PROXY_URL')
@@ -163,7 +420,7 @@ class YouTubeService:
             
             logger.info(f"Starting download for URL: {url}")
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._youtube_dl(ydl_opts) as ydl:
                 # Extract video info first
                 info = ydl.extract_info(url, download=False)
                 
@@ -189,20 +446,18 @@ class YouTubeService:
                 
                 logger.info(f"Video info extracted: {video_title} ({video_duration}s)")
                 
-                # Download the video
-                ydl.download([url])
+                # Download from the info already extracted; ydl.download([url]) would
+                # fetch the watch page and resolve formats a second time
+                info = ydl.process_ie_result(info, download=True) or info
                 
-                # Find the downloaded file
-                downloaded_files = []
-                for file in os.listdir(output_dir):
-                    if file.endswith(('.mp4', '.mkv', '.webm', '.avi')) and video_title.replace(' ', '_') in file:
-                        downloaded_files.append(os.path.join(output_dir, file))
+                # yt-dlp knows exactly where it wrote the file; no need to scan the directory
+                requested_downloads = info.get('requested_downloads') or [{}]
+                video_path = requested_downloads[0].get('filepath') or ydl.prepare_filename(info)
                 
-                if not downloaded_files:
+                if not os.path.exists(video_path):
                     logger.error("No video file found after download")
                     return None
                 
-                video_path = downloaded_files[0]
                 logger.info(f"Video downloaded successfully: {video_path}")
                 
                 self._log_download_outcome(url, True, None, ydl_opts)
@@ -221,6 +476,28 @@ class YouTubeService:
             self._log_download_outcome(url, False, error_message, ydl_opts if 'ydl_opts' in locals() else {})
             return None
     
+    def download_videos(self, urls: List[str], output_dir: str, quality: str = 'best') -> List[Optional[Dict[str, Any]]]:
+        """
+        Download several videos concurrently.
+        
+        Args:
+            urls: YouTube video URLs
+            output_dir: Directory to save the downloaded videos
+            quality: Video quality preference
+            
+        Returns:
+            Download information (or None if failed) for each URL, in the same order as urls
+        """
+        if not urls:
+            return []
+        
+        # Downloads are network-bound, so threads overlap them well; the dedicated
+        # pool caps them at YT_MAX_PARALLEL and keeps service_pool free for TTS and translation
+        return list(_get_download_pool().map(
+            lambda url: self.download_video(url, output_dir, quality),
+            urls
+        ))
+    
     def _log_download_outcome(self, url: str, success: bool, error_message: str, ydl_opts: dict):
         """Log download outcome for adaptive mitigation."""
         log_data = {
@@ -236,11 +513,90 @@ class YouTubeService:
             }
         }
         
-        self.adaptive_mitigation_service.record_outcome(log_data)
+        # Written by a background thread so the download path never waits on log I/O
+        self._outcome_queue.put_nowait(log_data)
+        if self._outcome_flusher is None:
+            with self._outcome_flusher_lock:
+                if self._outcome_flusher is None:
+                    self._outcome_flusher = threading.Thread(
+                        target=self._flush_outcomes, name='yt-outcomes', daemon=True
+                    )
+                    self._outcome_flusher.start()
+                    if not self._outcome_atexit_registered:
+                        # The writer is a daemon thread, so outcomes still queued at exit are written here
+                        atexit.register(self.flush_outcomes)
+                        self._outcome_atexit_registered = True
+    
+    def _flush_outcomes(self):
+        """
+        Drain queued download outcomes into the mitigation log in batches.
+        
+        A batch is written once it holds OUTCOME_BATCH_SIZE outcomes or its oldest
+        outcome has waited OUTCOME_FLUSH_INTERVAL seconds. A None entry stops the
+        thread after the pending batch is written.
+        """
+        while True:
+            item = self._outcome_queue.get()
+            stopping = item is None
+            batch = [item]
+            deadline = time.monotonic() + OUTCOME_FLUSH_INTERVAL
+            while not stopping and len(batch) < OUTCOME_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._outcome_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                stopping = item is None
+                batch.append(item)
+            
+            self._record_outcome_batch(batch)
+            if stopping:
+                return
+    
+    def _record_outcome_batch(self, batch: list):
+        """Write one batch of dequeued outcomes, skipping stop markers, and mark it done."""
+        outcomes = [outcome for outcome in batch if outcome is not None]
+        try:
+            if outcomes:
+                self.adaptive_mitigation_service.record_outcomes(outcomes)
+        except Exception as e:
+            logger.error(f"Error recording download outcomes: {e}")
+        finally:
+            for _ in batch:
+                self._outcome_queue.task_done()
+    
+    def flush_outcomes(self, timeout: float = OUTCOME_DRAIN_TIMEOUT):
+        """
+        Write every queued download outcome and stop the background writer.
+        
+        Registered with atexit when the first writer starts. Pool children that leave
+        without running atexit handlers (Celery's prefork workers) call it from
+        their shutdown hook. A later download starts a new writer.
+        """
+        with self._outcome_flusher_lock:
+            flusher, self._outcome_flusher = self._outcome_flusher, None
+        
+        if flusher is not None and flusher.is_alive():
+            self._outcome_queue.put_nowait(None)
+            flusher.join(timeout)
+            if flusher.is_alive():
+                logger.warning("Download outcome writer did not finish; writing the remaining queue directly")
+        
+        # Whatever the writer did not take, including outcomes queued while it stopped
+        batch = []
+        while True:
+            try:
+                batch.append(self._outcome_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._record_outcome_batch(batch)
     
     def extract_audio(self, video_path: str, output_dir: str) -> Optional[str]:
         """
-        Extract audio from video file.
+        Extract audio from video file as 16 kHz mono PCM WAV.
         
         Args:
             video_path: Path to the video file
@@ -250,31 +606,27 @@ class YouTubeService:
             Path to the extracted audio file or None if failed
         """
         try:
-            os.makedirs(output_dir, exist_ok=True)
+            _ensure_dir(output_dir)
             
             video_name = os.path.splitext(os.path.basename(video_path))[0]
             audio_path = os.path.join(output_dir, f"{video_name}.wav")
             
-            ydl_opts = {
-                'format': 'bestaudio/best',
-                'outtmpl': audio_path,
-                'postprocessors': [{
-                    'key': 'FFmpegExtractAudio',
-                    'preferredcodec': 'wav',
-                    'preferredquality': '192',
-                }],
-            }
+            # Demux straight through ffmpeg; no need to go through yt-dlp's postprocessor
+            command = [
+                'ffmpeg', '-y', '-loglevel', 'error',
+                '-i', video_path,
+                '-vn', '-acodec', 'pcm_s16le',
+                '-ar', str(AUDIO_SAMPLE_RATE), '-ac', '1',
+                audio_path
+            ]
+            subprocess.run(command, capture_output=True, check=True)
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.process_info({'filepath': video_path})
+            logger.info(f"Audio extracted successfully: {audio_path}")
+            return audio_path
             
-            if os.path.exists(audio_path):
-                logger.info(f"Audio extracted successfully: {audio_path}")
-                return audio_path
-            else:
-                logger.error("Audio extraction failed - file not found")
-                return None
-                
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Audio extraction failed: {e.stderr.decode(errors='replace').strip()}")
+            return None
         except Exception as e:
             logger.error(f"Error extracting audio: {e}")
             return None
@@ -295,14 +647,13 @@ class YouTubeService:
             Dictionary containing upload information or None if failed
         """
         try:
+            from googleapiclient.errors import HttpError
+            from googleapiclient.http import MediaFileUpload
+            
             youtube = self._get_youtube_api()
             if not youtube:
                 raise ValueError("YouTube API not initialized. Ensure credentials are set up.")
             
-            if not os.path.exists(video_path):
-                logger.error(f"Video file not found: {video_path}")
-                return None
-            
             tags = tags or []
             
             body = {
@@ -317,8 +668,12 @@ class YouTubeService:
                 }
             }
             
-            # Create media upload object
-            media = MediaFileUpload(video_path, chunksize=-1, resumable=True)
+            # Create media upload object; it opens the file, so a missing one raises here
+            try:
+                media = MediaFileUpload(video_path, chunksize=UPLOAD_CHUNK_SIZE, resumable=True)
+            except FileNotFoundError:
+                logger.error(f"Video file not found: {video_path}")
+                return None
             
             logger.info(f"Starting upload for video: {title}")
             
@@ -333,20 +688,36 @@ class YouTubeService:
             error = None
             retry = 0
             
-            while response is None:
-                try:
-                    status, response = insert_request.next_chunk()
-                    if status:
-                        logger.info(f"Upload progress: {int(status.progress() * 100)}%")
-                except Exception as e:
-                    error = e
-                    if retry < 3:
-                        retry += 1
-                        logger.warning(f"Upload error, retrying ({retry}/3): {e}")
-                        time.sleep(2 ** retry)
-                    else:
-                        logger.error(f"Upload failed after retries: {e}")
-                        return None
+            prefetch_fd = _open_for_prefetch(video_path)
+            try:
+                while response is None:
+                    try:
+                        if prefetch_fd is not None:
+                            # Start reading the following chunk while this one is on the wire
+                            _prefetch_range(prefetch_fd, insert_request.resumable_progress + UPLOAD_CHUNK_SIZE)
+                        status, response = insert_request.next_chunk()
+                        if status:
+                            logger.info(f"Upload progress: {int(status.progress() * 100)}%")
+                    except Exception as e:
+                        error = e
+                        if (isinstance(e, HttpError) and 400 <= e.resp.status < 500
+                                and e.resp.status not in RETRYABLE_CLIENT_STATUSES):
+                            logger.error(f"Upload rejected, not retrying: {e}")
+                            if e.resp.status == 401:
+                                # Revoked or expired credentials; let the next upload re-authenticate
+                                self.invalidate_api()
+                            return None
+                        if retry < UPLOAD_MAX_RETRIES:
+                            retry += 1
+                            logger.warning(f"Upload error, retrying ({retry}/{UPLOAD_MAX_RETRIES}): {e}")
+                            # Full jitter keeps uploads that failed together from retrying in lockstep
+                            time.sleep(random.uniform(0, min(2 ** retry, UPLOAD_MAX_BACKOFF)))
+                        else:
+                            logger.error(f"Upload failed after retries: {e}")
+                            return None
+            finally:
+                if prefetch_fd is not None:
+                    os.close(prefetch_fd)
             
             if response:
                 video_id = response['id']
@@ -369,7 +740,8 @@ class YouTubeService:
     
     def get_video_info(self, url: str) -> Optional[Dict[str, Any]]:
         """
-        Get video information without downloading.
+        Get video information without downloading, cached per video id for VIDEO_INFO_CACHE_TTL
+        seconds (failures for VIDEO_INFO_NEGATIVE_TTL seconds).
         
         Args:
             url: YouTube video URL
@@ -377,21 +749,32 @@ class YouTubeService:
         Returns:
             Dictionary containing video information or None if failed
         """
+        cache_key = None
         try:
             if not self.validate_video_url(url):
                 logger.error(f"Invalid YouTube URL: {url}")
                 return None
             
+            # Different URL spellings of one video share a cache entry
+            match = VIDEO_ID_PATTERN.search(url)
+            cache_key = match.group(1) if match else url
+            cached = self._video_info_cache.get(cache_key)
+            if cached:
+                ttl = VIDEO_INFO_CACHE_TTL if cached[1] is not None else VIDEO_INFO_NEGATIVE_TTL
+                if time.monotonic() - cached[0] < ttl:
+                    self._video_info_cache.move_to_end(cache_key)
+                    return dict(cached[1]) if cached[1] is not None else None
+            
             ydl_opts = {
                 'quiet': True,
                 'no_warnings': True,
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._youtube_dl(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 
                 if info:
-                    return {
+                    video_info = {
                         'title': info.get('title', ''),
                         'duration': info.get('duration', 0),
                         'video_id': info.get('id', ''),
@@ -401,9 +784,46 @@ class YouTubeService:
                         'description': info.get('description', ''),
                         'thumbnail': info.get('thumbnail', '')
                     }
+                    
+                    self._cache_video_info(cache_key, video_info)
+                    return dict(video_info)
                 else:
+                    self._cache_video_info(cache_key, None)
                     return None
                     
         except Exception as e:
             logger.error(f"Error getting video info: {e}")
+            if cache_key is not None:
+                self._cache_video_info(cache_key, None)
             return None
+    
+    def _cache_video_info(self, cache_key: str, video_info: Optional[Dict[str, Any]]) -> None:
+        """Store a get_video_info result (None for a failure), evicting the least recently used entry."""
+        self._video_info_cache[cache_key] = (time.monotonic(), video_info)
+        self._video_info_cache.move_to_end(cache_key)
+        if len(self._video_info_cache) > VIDEO_INFO_CACHE_SIZE:
+            self._video_info_cache.popitem(last=False)
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking service call on the shared pool so async callers can overlap stages."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(service_pool, partial(func, *args, **kwargs))
+    
+    async def download_video_async(self, url: str, output_dir: str, quality: str = 'best') -> Optional[Dict[str, Any]]:
+        """Async counterpart of download_video."""
+        return await self._run_blocking(self.download_video, url, output_dir, quality)
+    
+    async def extract_audio_async(self, video_path: str, output_dir: str) -> Optional[str]:
+        """Async counterpart of extract_audio."""
+        return await self._run_blocking(self.extract_audio, video_path, output_dir)
+    
+    async def get_video_info_async(self, url: str) -> Optional[Dict[str, Any]]:
+        """Async counterpart of get_video_info."""
+        return await self._run_blocking(self.get_video_info, url)
+    
+    async def upload_video_async(self, video_path: str, title: str, description: str = "",
+                                 tags: List[str] = None, privacy_status: str = "private") -> Optional[Dict[str, Any]]:
+        """Async counterpart of upload_video."""
+        return await self._run_blocking(
+            self.upload_video, video_path, title, description, tags, privacy_status
+        )
@@ -15,17 +15,23 @@ def railway_base_url():
 @pytest.fixture(scope="session")
 def wait_for_deployment(railway_base_url):
     """Wait for Railway deployment to be ready."""
-    max_attempts = 30
-    for attempt in range(max_attempts):
-        try:
-            response = requests.get(f"{railway_base_url}/health", timeout=10)
-            if response.status_code == 200:
-                return True
-        except:
-            pass
-        
-        if attempt < max_attempts - 1:
-            time.sleep(10)
+    # Same 5 minute budget, but polled with backoff over one kept-alive connection
+    deadline = time.monotonic() + 300
+    attempt = 0
+    with requests.Session() as session:
+        while True:
+            try:
+                response = session.get(f"{railway_base_url}/health", timeout=5)
+                if response.status_code == 200:
+                    return True
+            except requests.RequestException:
+                pass
+            
+            delay = min(0.5 * (2 ** attempt), 8.0)
+            if time.monotonic() + delay >= deadline:
+                break
+            time.sleep(delay)
+            attempt += 1
     
     pytest.fail("Railway deployment not ready after 5 minutes")
 
@@ -0,0 +1,162 @@
+import unittest
+import tempfile
+import shutil
+import os
+import json
+from unittest.mock import patch
+import sys
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from services import adaptive_mitigation_service
+from services.adaptive_mitigation_service import AdaptiveMitigationService
+
+def outcome_line(success, proxy_used=False, cookies_used=False):
+    """Build one outcome log line as YouTubeService writes it."""
+    return json.dumps({
+        'success': success,
+        'mitigation_params': {'proxy_used': proxy_used, 'cookies_used': cookies_used}
+    }) + '\n'
+
+class TestAdaptiveMitigationService(unittest.TestCase):
+    """Tests for incremental outcome log analysis and checkpointing."""
+    
+    def setUp(self):
+        """Set up a scratch directory holding the outcome log."""
+        self.test_dir = tempfile.mkdtemp(prefix='mitigation_test_')
+        self.addCleanup(shutil.rmtree, self.test_dir, ignore_errors=True)
+        self.log_path = os.path.join(self.test_dir, 'download_logs.json')
+    
+    def append(self, *lines):
+        """Append raw text to the outcome log."""
+        with open(self.log_path, 'a') as f:
+            f.write(''.join(lines))
+    
+    def totals(self, service):
+        """Return (success, total) for the default no-proxy, no-cookies combination."""
+        service._analyze_logs()
+        counts = service._success_counts['proxy_False_cookies_False']
+        return counts['success'], counts['total']
+    
+    def test_resume_from_checkpoint(self):
+        """Test a new instance restores counts and only parses lines past the saved offset."""
+        self.append(outcome_line(True), outcome_line(False))
+        service = AdaptiveMitigationService(self.log_path)
+        self.assertEqual(self.totals(service), (1, 2))
+        service._save_checkpoint()
+        
+        self.append(outcome_line(True))
+        resumed = AdaptiveMitigationService(self.log_path)
+        self.assertEqual(resumed._log_offset, service._log_offset)
+        self.assertEqual(self.totals(resumed), (2, 3))
+    
+    def test_checkpoint_saved_after_interval(self):
+        """Test aggregates are checkpointed once enough new bytes were folded in."""
+        self.append(outcome_line(True))
+        
+        with patch.object(adaptive_mitigation_service, 'CHECKPOINT_INTERVAL_BYTES', 1):
+            service = AdaptiveMitigationService(self.log_path)
+            service._analyze_logs()
+        
+        with open(service.checkpoint_file_path) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(checkpoint['offset'], os.path.getsize(self.log_path))
+        self.assertEqual(checkpoint['inode'], os.stat(self.log_path).st_ino)
+        self.assertEqual(checkpoint['counts']['proxy_False_cookies_False'], {'success': 1, 'total': 1})
+        
+        # Each save goes through its own temp file, which never outlives the replace
+        self.assertEqual(
+            sorted(os.listdir(self.test_dir)),
+            ['download_logs.json', 'download_logs.json.offset']
+        )
+    
+    def test_unterminated_trailing_line(self):
+        """Test a partially written last line is left for the next read."""
+        line = outcome_line(True)
+        self.append(outcome_line(False), line[:10])
+        service = AdaptiveMitigationService(self.log_path)
+        
+        self.assertEqual(self.totals(service), (0, 1))
+        
+        self.append(line[10:])
+        self.assertEqual(self.totals(service), (1, 2))
+    
+    def test_truncated_log(self):
+        """Test a log truncated outside rotate_logs is read from the start, keeping earlier counts."""
+        self.append(outcome_line(True), outcome_line(True))
+        service = AdaptiveMitigationService(self.log_path)
+        self.assertEqual(self.totals(service), (2, 2))
+        
+        with open(self.log_path, 'w') as f:
+            f.write(outcome_line(False))
+        
+        self.assertEqual(self.totals(service), (2, 3))
+    
+    def test_replaced_log(self):
+        """Test a log replaced by a new file is read from the start even when it is longer."""
+        self.append(outcome_line(True))
+        service = AdaptiveMitigationService(self.log_path)
+        self.assertEqual(self.totals(service), (1, 1))
+        
+        replacement = os.path.join(self.test_dir, 'replacement.json')
+        with open(replacement, 'w') as f:
+            f.write(outcome_line(False) * 3)
+        os.replace(replacement, self.log_path)
+        
+        self.assertEqual(self.totals(service), (1, 4))
+    
+    def test_unreadable_checkpoint(self):
+        """Test a corrupt checkpoint is ignored and the log is parsed from the start."""
+        self.append(outcome_line(True), outcome_line(False))
+        with open(f"{self.log_path}.offset", 'w') as f:
+            f.write('{not json')
+        
+        service = AdaptiveMitigationService(self.log_path)
+        
+        self.assertEqual(service._log_offset, 0)
+        self.assertEqual(self.totals(service), (1, 2))
+    
+    def test_rotate_logs(self):
+        """Test rotation empties the log but keeps its counts in the checkpoint."""
+        self.append(outcome_line(True), outcome_line(False))
+        service = AdaptiveMitigationService(self.log_path)
+        
+        service.rotate_logs()
+        
+        self.assertEqual(os.path.getsize(self.log_path), 0)
+        with open(service.checkpoint_file_path) as f:
+            checkpoint = json.load(f)
+        self.assertEqual(checkpoint['offset'], 0)
+        self.assertEqual(checkpoint['generation'], 1)
+        self.assertEqual(checkpoint['counts']['proxy_False_cookies_False'], {'success': 1, 'total': 2})
+        
+        self.append(outcome_line(True))
+        self.assertEqual(self.totals(service), (2, 3))
+        self.assertEqual(self.totals(AdaptiveMitigationService(self.log_path)), (2, 3))
+    
+    def test_rotation_by_another_process(self):
+        """Test an instance notices another one rotated the log after it regrew past its offset."""
+        self.append(outcome_line(True))
+        service = AdaptiveMitigationService(self.log_path)
+        other = AdaptiveMitigationService(self.log_path)
+        self.assertEqual(self.totals(service), (1, 1))
+        
+        # The other instance sees one more line before rotating
+        self.append(outcome_line(False))
+        other.rotate_logs()
+        self.append(outcome_line(True, proxy_used=True), outcome_line(False), outcome_line(False))
+        
+        self.assertEqual(self.totals(service), (1, 4))
+        self.assertEqual(service._success_counts['proxy_True_cookies_False'], {'success': 1, 'total': 1})
+    
+    def test_rotate_logs_missing_log(self):
+        """Test rotating before any outcome was logged does nothing."""
+        service = AdaptiveMitigationService(self.log_path)
+        
+        service.rotate_logs()
+        
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,35 +1,136 @@
 import unittest
 import tempfile
+import shutil
 import os
+import io
 import json
-from unittest.mock import patch, MagicMock, mock_open
+import functools
+import hashlib
+from types import MappingProxyType
+import numpy as np
+import soundfile as sf
+from unittest.mock import patch, Mock, MagicMock
+from pydub import AudioSegment
 import sys
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from services.audio_service import AudioService
+from services.audio_service import AudioService, POLLY_CLIENT_CONFIG
+
+# Recorded Polly responses, named after the API operation like placebo's files
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures', 'polly')
+
+def _freeze(value):
+    """Make a parsed JSON value read-only so a shared fixture can't leak state between tests."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+@functools.lru_cache(maxsize=None)
+def load_polly_fixture(name):
+    """Load a recorded Polly response once per process, frozen."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json")) as f:
+        return _freeze(json.load(f))
+
+class _FakeFile:
+    """Writable file stand-in that keeps written bytes in memory."""
+    
+    def __init__(self):
+        self.buf = bytearray()
+    
+    def write(self, data):
+        self.buf.extend(data)
+        return len(data)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+class _FakeOpen:
+    """Replacement for builtins.open that records the last path and mode it was given."""
+    
+    def __call__(self, path, mode='r', *args, **kwargs):
+        self.last_path, self.last_mode = path, mode
+        self.last = _FakeFile()
+        return self.last
+
+# Expected default voice per language code
+_DEFAULT_VOICE_CASES = (
+    ('en-US', 'Joanna'),
+    ('en-GB', 'Emma'),
+    ('es-ES', 'Lucia'),
+    ('fr-FR', 'Lea'),
+    ('de-DE', 'Marlene'),
+    ('unknown-XX', 'Joanna'),  # Should default to Joanna
+)
+
+# Voices known to support the neural engine, and standard-only ones
+_NEURAL_VOICES = ('Joanna', 'Matthew', 'Amy', 'Emma')
+_STANDARD_VOICES = ('Ivy', 'Russell', 'Nicole')
+
+# Polly client methods AudioService calls
+POLLY_METHODS = ['synthesize_speech', 'describe_voices', 'start_speech_synthesis_task', 'get_speech_synthesis_task']
 
 class TestAudioService(unittest.TestCase):
     """Comprehensive tests for Audio service."""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build one service with a stubbed Polly client for the whole class."""
+        # A plain Mock: reset_mock(return_value=True) would also reset MagicMock's __bool__.
+        # Spec'd to the Polly calls the service makes, so anything else fails loudly
+        with patch('boto3.client', return_value=Mock(spec=POLLY_METHODS)):
+            cls.service = AudioService(
+                aws_access_key="test_key",
+                aws_secret_key="test_secret",
+                aws_region="us-east-1"
+            )
+        cls.polly_client = cls.service.polly_client
+        
+        # Media library entry points stay patched for the whole class; setUp resets them
+        cls._patchers = [patch('ffmpeg.input'), patch('ffmpeg.output'), patch('pydub.AudioSegment.from_file')]
+        cls.mock_input, cls.mock_output, cls.mock_from_file = [patcher.start() for patcher in cls._patchers]
+        
+        # os.path.exists answers from a set each test fills with the paths it treats as present
+        cls._existing_paths = set()
+        exists_patcher = patch('os.path.exists', side_effect=cls._existing_paths.__contains__)
+        exists_patcher.start()
+        cls._patchers.append(exists_patcher)
+        
+        # One scratch directory per class; set RAMDISK_TMP=/dev/shm to keep test files on tmpfs
+        cls._tmpdir = tempfile.mkdtemp(prefix='audio_svc_test_', dir=os.environ.get('RAMDISK_TMP'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the class-wide patchers and remove the scratch directory."""
+        for patcher in cls._patchers:
+            patcher.stop()
+        shutil.rmtree(cls._tmpdir, ignore_errors=True)
+    
     def setUp(self):
         """Set up test fixtures."""
-        self.service = AudioService(
-            aws_access_key="test_key",
-            aws_secret_key="test_secret",
-            aws_region="us-east-1"
-        )
-        self.test_video_path = "/tmp/test_video.mp4"
-        self.test_audio_path = "/tmp/test_audio.wav"
+        # Reset the shared service to a fresh state instead of rebuilding it
+        self.polly_client.reset_mock(return_value=True, side_effect=True)
+        self.service.polly_client = self.polly_client
+        self.service.polly_output_bucket = None
+        self.service._s3_client = None
+        self.service._voices_by_language.clear()
+        self._existing_paths.clear()
+        
+        # Fresh return values rather than reset ones, so MagicMock's magic-method defaults survive
+        for mock in (self.mock_input, self.mock_output, self.mock_from_file):
+            mock.reset_mock(side_effect=True)
+            mock.return_value = MagicMock()
+        
+        self.test_video_path = os.path.join(self._tmpdir, "test_video.mp4")
+        self.test_audio_path = os.path.join(self._tmpdir, "test_audio.wav")
         self.test_text = "Hello, this is a test text for speech synthesis."
     
-    def tearDown(self):
-        """Clean up test fixtures."""
-        for path in [self.test_video_path, self.test_audio_path]:
-            if os.path.exists(path):
-                os.remove(path)
-    
     @patch('boto3.client')
     def test_init_with_credentials(self, mock_boto_client):
         """Test service initialization with AWS credentials."""
@@ -47,8 +148,11 @@ class TestAudioService(unittest.TestCase):
             'polly',
             aws_access_key_id="access_key",
             aws_secret_access_key="secret_key",
-            region_name="us-west-2"
+            region_name="us-west-2",
+            config=POLLY_CLIENT_CONFIG
         )
+        self.assertEqual(POLLY_CLIENT_CONFIG.read_timeout, 15)
+        self.assertEqual(POLLY_CLIENT_CONFIG.max_pool_connections, 20)
     
     def test_init_without_credentials(self):
         """Test service initialization without AWS credentials."""
@@ -56,98 +160,130 @@ class TestAudioService(unittest.TestCase):
         
         self.assertIsNone(service.polly_client)
     
-    @patch('ffmpeg.input')
-    @patch('ffmpeg.output')
-    @patch('os.path.exists')
-    def test_extract_audio_from_video_success(self, mock_exists, mock_output, mock_input):
+    def test_extract_audio_from_video_success(self):
         """Test successful audio extraction from video."""
-        mock_exists.side_effect = lambda path: path == self.test_video_path or path.endswith('_audio.wav')
-        
-        # Mock ffmpeg chain
-        mock_input_obj = MagicMock()
-        mock_input.return_value = mock_input_obj
-        
-        mock_output_obj = MagicMock()
-        mock_output.return_value = mock_output_obj
-        
-        mock_run_obj = MagicMock()
-        mock_output_obj.overwrite_output.return_value.run = mock_run_obj
+        audio_path = os.path.join(self._tmpdir, "test_video_audio.wav")
+        self._existing_paths.update({self.test_video_path, audio_path})
         
         result = self.service.extract_audio_from_video(self.test_video_path)
         
         self.assertIsNotNone(result)
-        self.assertTrue(result.endswith('_audio.wav'))
+        self.assertEqual(result, audio_path)
+        
+        # The chain is ffmpeg.input(...).output(...): output is a method on the input stream
+        self.mock_input.assert_called_once_with(self.test_video_path)
+        mock_stream_output = self.mock_input.return_value.output
+        mock_stream_output.assert_called_once_with(audio_path, acodec='pcm_s16le', ac=1, ar='16000')
+        mock_stream_output.return_value.overwrite_output.return_value.run.assert_called_once_with(quiet=True)
+        self.mock_output.assert_not_called()
+    
+    def test_missing_input_file_returns_none(self):
+        """Test every file-based operation returns None when its input file doesn't exist."""
+        cases = (
+            ('extract_audio_from_video', (self.test_video_path,)),
+            ('preprocess_audio', (self.test_audio_path,)),
+            ('adjust_audio_speed', (self.test_audio_path, 1.2)),
+            ('get_audio_duration', (self.test_audio_path,)),
+            ('merge_audio_with_video', (self.test_video_path, self.test_audio_path)),
+        )
         
-        # Verify ffmpeg was called correctly
-        mock_input.assert_called_once_with(self.test_video_path)
-        mock_output.assert_called_once()
-        mock_run_obj.assert_called_once_with(quiet=True)
+        for method, args in cases:
+            with self.subTest(method=method):
+                self.assertIsNone(getattr(self.service, method)(*args))
     
-    @patch('os.path.exists')
-    def test_extract_audio_from_video_file_not_found(self, mock_exists):
-        """Test audio extraction with non-existent video file."""
-        mock_exists.return_value = False
+    def test_extract_audio_from_video_exception(self):
+        """Test audio extraction with ffmpeg exception."""
+        self._existing_paths.add(self.test_video_path)
+        self.mock_input.side_effect = Exception("FFmpeg error")
         
         result = self.service.extract_audio_from_video(self.test_video_path)
         
         self.assertIsNone(result)
     
-    @patch('ffmpeg.input')
-    @patch('os.path.exists')
-    def test_extract_audio_from_video_exception(self, mock_exists, mock_input):
-        """Test audio extraction with ffmpeg exception."""
-        mock_exists.return_value = True
-        mock_input.side_effect = Exception("FFmpeg error")
-        
-        result = self.service.extract_audio_from_video(self.test_video_path)
+    @patch('subprocess.run')
+    def test_extract_audio_to_buffer_success(self, mock_run):
+        """Test audio extraction piped into a numpy buffer."""
+        self._existing_paths.add(self.test_video_path)
+        mock_run.return_value = MagicMock(stdout=np.array([0, 1, -1], dtype=np.int16).tobytes())
+        
+        result = self.service.extract_audio_to_buffer(self.test_video_path)
+        
+        self.assertEqual(result.dtype, np.int16)
+        self.assertEqual(result.tolist(), [0, 1, -1])
+        command = mock_run.call_args[0][0]
+        self.assertEqual(command[-1], "pipe:1")
+        self.assertIn(self.test_video_path, command)
+    
+    @patch('subprocess.run')
+    def test_extract_audio_to_buffer_file_not_found(self, mock_run):
+        """Test buffered audio extraction with non-existent video file."""
+        result = self.service.extract_audio_to_buffer(self.test_video_path)
         
         self.assertIsNone(result)
+        mock_run.assert_not_called()
+    
+    @patch('soundfile.write')
+    @patch('subprocess.run')
+    def test_extract_preprocessed_audio(self, mock_run, mock_write):
+        """Test extraction pipes into preprocessing without an intermediate WAV."""
+        self._existing_paths.add(self.test_video_path)
+        mock_run.return_value = MagicMock(stdout=np.full(16000, 1000, dtype=np.int16).tobytes())
+        
+        result = self.service.extract_preprocessed_audio(self.test_video_path)
+        
+        self.assertEqual(result, os.path.join(self._tmpdir, "test_video_audio_processed.wav"))
+        mock_write.assert_called_once()
+        self.assertEqual(mock_write.call_args[0][0], result)
     
-    @patch('pydub.AudioSegment.from_file')
-    @patch('os.path.exists')
-    def test_preprocess_audio_success(self, mock_exists, mock_from_file):
+    @patch('soundfile.write')
+    def test_preprocess_audio_success(self, mock_write):
         """Test successful audio preprocessing."""
-        mock_exists.side_effect = lambda path: path == self.test_audio_path or path.endswith('_processed.wav')
-        
-        # Mock audio segment
-        mock_audio = MagicMock()
+        processed_path = os.path.join(self._tmpdir, "test_audio_processed.wav")
+        self._existing_paths.update({self.test_audio_path, processed_path})
+        
+        # One second of stereo 44.1kHz tone padded with half a second of silence each side
+        tone = (1000 * np.sin(np.linspace(0, 440 * 2 * np.pi, 44100))).astype(np.int16)
+        silence = np.zeros(22050, dtype=np.int16)
+        mono = np.concatenate([silence, tone, silence])
+        mock_audio = Mock(spec=AudioSegment)
         mock_audio.channels = 2  # Stereo
-        mock_audio.set_channels.return_value = mock_audio
-        mock_audio.set_frame_rate.return_value = mock_audio
-        mock_audio.strip_silence.return_value = mock_audio
-        mock_from_file.return_value = mock_audio
-        
-        # Mock normalize function
-        with patch('pydub.effects.normalize') as mock_normalize:
-            mock_normalize.return_value = mock_audio
-            
-            result = self.service.preprocess_audio(self.test_audio_path)
-            
-            self.assertIsNotNone(result)
-            self.assertTrue(result.endswith('_processed.wav'))
-            
-            # Verify audio processing steps
-            mock_audio.set_channels.assert_called_once_with(1)  # Convert to mono
-            mock_audio.set_frame_rate.assert_called_once_with(16000)  # Set sample rate
-            mock_normalize.assert_called_once()
-            mock_audio.strip_silence.assert_called_once()
-            mock_audio.export.assert_called_once()
-    
-    @patch('os.path.exists')
-    def test_preprocess_audio_file_not_found(self, mock_exists):
-        """Test audio preprocessing with non-existent file."""
-        mock_exists.return_value = False
+        mock_audio.frame_rate = 44100
+        mock_audio.sample_width = 2
+        mock_audio.raw_data = np.repeat(mono, 2).tobytes()
+        self.mock_from_file.return_value = mock_audio
         
         result = self.service.preprocess_audio(self.test_audio_path)
         
-        self.assertIsNone(result)
+        self.assertIsNotNone(result)
+        self.assertEqual(result, processed_path)
+        
+        mock_write.assert_called_once()
+        written_path, samples, sample_rate = mock_write.call_args[0]
+        self.assertEqual(written_path, result)
+        self.assertEqual(sample_rate, 16000)  # Resampled
+        self.assertEqual(samples.ndim, 1)  # Downmixed to mono
+        self.assertEqual(samples.dtype, np.int16)
+        self.assertGreater(np.max(np.abs(samples)), 32000)  # Normalized
+        self.assertLess(abs(len(samples) - 16000), 800)  # Edge silence trimmed
+    
+    def test_preprocess_audio_buffer(self):
+        """Test in-memory preprocessing of extracted samples."""
+        samples = np.concatenate([
+            np.zeros(8000, dtype=np.int16),
+            np.full(16000, 500, dtype=np.int16),
+            np.zeros(8000, dtype=np.int16)
+        ])
+        
+        result = self.service.preprocess_audio(samples)
+        
+        self.assertIsInstance(result, np.ndarray)
+        self.assertLess(abs(len(result) - 16000), 800)
+        self.assertEqual(int(np.max(result)), 32766)
     
-    @patch('pydub.AudioSegment.from_file')
-    @patch('os.path.exists')
-    def test_preprocess_audio_exception(self, mock_exists, mock_from_file):
+    def test_preprocess_audio_exception(self):
         """Test audio preprocessing with exception."""
-        mock_exists.return_value = True
-        mock_from_file.side_effect = Exception("Audio processing error")
+        self._existing_paths.add(self.test_audio_path)
+        self.mock_from_file.side_effect = Exception("Audio processing error")
         
         result = self.service.preprocess_audio(self.test_audio_path)
         
@@ -162,15 +298,15 @@ class TestAudioService(unittest.TestCase):
         mock_tempfile.return_value.__enter__.return_value = mock_file
         
         # Mock Polly response
+        audio_stream = io.BytesIO(b"fake_audio_data")
         mock_response = {
-            'AudioStream': MagicMock()
+            'AudioStream': audio_stream
         }
-        mock_response['AudioStream'].read.return_value = b"fake_audio_data"
         
-        self.service.polly_client = MagicMock()
         self.service.polly_client.synthesize_speech.return_value = mock_response
         
-        with patch('builtins.open', mock_open()) as mock_file_open:
+        fake_open = _FakeOpen()
+        with patch('builtins.open', fake_open):
             result = self.service.text_to_speech(self.test_text, "en-US", "Joanna")
             
             self.assertIsNotNone(result)
@@ -186,7 +322,151 @@ class TestAudioService(unittest.TestCase):
             )
             
             # Verify file was written
-            mock_file_open.assert_called_once_with("/tmp/temp_audio.mp3", 'wb')
+            self.assertEqual((fake_open.last_path, fake_open.last_mode), ("/tmp/temp_audio.mp3", 'wb'))
+            self.assertEqual(fake_open.last.buf, b"fake_audio_data")
+            self.assertEqual(audio_stream.tell(), len(b"fake_audio_data"))  # Stream fully consumed
+    
+    @patch('soundfile.write')
+    def test_text_to_speech_long_text_chunked(self, mock_write):
+        """Test long text is synthesized as concurrent PCM chunks."""
+        long_text = " ".join(["This sentence is part of a very long narration."] * 200)
+        
+        self.service.polly_client.synthesize_speech.side_effect = lambda **kwargs: {
+            'AudioStream': io.BytesIO(b"\x01\x00" * 10)
+        }
+        
+        result = self.service.text_to_speech(long_text, "en-US", "Joanna",
+                                             output_path="/tmp/long.wav", output_format='pcm')
+        
+        self.assertEqual(result, "/tmp/long.wav")
+        calls = self.service.polly_client.synthesize_speech.call_args_list
+        self.assertGreater(len(calls), 1)
+        for call in calls:
+            self.assertEqual(call.kwargs['OutputFormat'], 'pcm')
+            self.assertLessEqual(len(call.kwargs['Text']), 2800)
+        
+        written_path, samples, sample_rate = mock_write.call_args[0]
+        self.assertEqual(written_path, "/tmp/long.wav")
+        self.assertEqual(len(samples), 10 * len(calls))
+        self.assertEqual(sample_rate, 16000)
+    
+    @patch('soundfile.write')
+    @patch('pydub.AudioSegment.export', autospec=True)
+    def test_text_to_speech_long_text_mp3(self, mock_export, mock_write):
+        """Test long text stitched as PCM is still encoded to the requested MP3."""
+        long_text = " ".join(["This sentence is part of a very long narration."] * 200)
+        
+        self.service.polly_client.synthesize_speech.side_effect = lambda **kwargs: {
+            'AudioStream': io.BytesIO(b"\x01\x00" * 10)
+        }
+        
+        result = self.service.text_to_speech(long_text, "en-US", "Joanna", output_path="/tmp/long.mp3")
+        
+        self.assertEqual(result, "/tmp/long.mp3")
+        calls = self.service.polly_client.synthesize_speech.call_args_list
+        self.assertGreater(len(calls), 1)
+        self.assertTrue(all(call.kwargs['OutputFormat'] == 'pcm' for call in calls))
+        
+        # No RIFF/WAV header is written under the .mp3 name
+        mock_write.assert_not_called()
+        segment, exported_path = mock_export.call_args.args
+        self.assertEqual(exported_path, "/tmp/long.mp3")
+        self.assertEqual(mock_export.call_args.kwargs, {'format': 'mp3'})
+        self.assertEqual(segment.frame_rate, 16000)
+        self.assertEqual(segment.channels, 1)
+        self.assertEqual(len(segment.raw_data), 20 * len(calls))
+    
+    @patch('soundfile.write')
+    def test_text_to_speech_pcm(self, mock_write):
+        """Test PCM output is written as WAV without an MP3 round-trip."""
+        self.service.polly_client.synthesize_speech.return_value = {
+            'AudioStream': io.BytesIO(np.array([1, 2, 3], dtype=np.int16).tobytes())
+        }
+        
+        result = self.service.text_to_speech(self.test_text, "en-US", "Joanna", output_format='pcm')
+        self.addCleanup(os.remove, result)
+        
+        self.assertTrue(result.endswith('.wav'))
+        call = self.service.polly_client.synthesize_speech.call_args
+        self.assertEqual(call.kwargs['OutputFormat'], 'pcm')
+        self.assertEqual(call.kwargs['SampleRate'], '16000')
+        written_path, samples, sample_rate = mock_write.call_args[0]
+        self.assertEqual(written_path, result)
+        self.assertEqual(samples.tolist(), [1, 2, 3])
+        self.assertEqual(sample_rate, 16000)
+    
+    @patch('time.sleep')
+    @patch('boto3.client')
+    def test_text_to_speech_synthesis_task(self, mock_boto_client, mock_sleep):
+        """Test opt-in synthesis task renders to S3 and downloads the result."""
+        self.service.polly_output_bucket = "polly-bucket"
+        self.service.polly_client.start_speech_synthesis_task.return_value = {
+            'SynthesisTask': {'TaskId': 'task-1', 'TaskStatus': 'scheduled'}
+        }
+        self.service.polly_client.get_speech_synthesis_task.return_value = {
+            'SynthesisTask': {
+                'TaskId': 'task-1',
+                'TaskStatus': 'completed',
+                'OutputUri': 'https://s3.us-east-1.amazonaws.com/polly-bucket/task-1.mp3'
+            }
+        }
+        
+        result = self.service.text_to_speech(self.test_text, "en-US", "Joanna",
+                                             output_path="/tmp/task.mp3", async_task=True)
+        
+        self.assertEqual(result, "/tmp/task.mp3")
+        self.service.polly_client.synthesize_speech.assert_not_called()
+        self.assertEqual(
+            self.service.polly_client.start_speech_synthesis_task.call_args.kwargs['OutputS3BucketName'],
+            "polly-bucket"
+        )
+        mock_boto_client.return_value.download_file.assert_called_once_with(
+            "polly-bucket", "task-1.mp3", "/tmp/task.mp3"
+        )
+    
+    @patch('time.sleep')
+    @patch('boto3.client')
+    def test_text_to_speech_synthesis_task_pcm(self, mock_boto_client, mock_sleep):
+        """Test a pcm request renders raw PCM in the synthesis task and writes it as WAV."""
+        self.service.polly_output_bucket = "polly-bucket"
+        self.service.polly_client.start_speech_synthesis_task.return_value = {
+            'SynthesisTask': {
+                'TaskId': 'task-1',
+                'TaskStatus': 'completed',
+                'OutputUri': 'https://s3.us-east-1.amazonaws.com/polly-bucket/task-1.pcm'
+            }
+        }
+        output_path = os.path.join(self._tmpdir, "task.wav")
+        self.addCleanup(os.remove, output_path)
+        
+        def download_file(bucket, key, path):
+            np.array([1, 2, 3], dtype=np.int16).tofile(path)
+        mock_boto_client.return_value.download_file.side_effect = download_file
+        
+        result = self.service.text_to_speech(self.test_text, "en-US", "Joanna", output_path=output_path,
+                                             async_task=True, output_format='pcm')
+        
+        self.assertEqual(result, output_path)
+        task_kwargs = self.service.polly_client.start_speech_synthesis_task.call_args.kwargs
+        self.assertEqual(task_kwargs['OutputFormat'], 'pcm')
+        self.assertEqual(task_kwargs['SampleRate'], '16000')
+        mock_boto_client.return_value.download_file.assert_called_once_with(
+            "polly-bucket", "task-1.pcm", f"{output_path}.pcm"
+        )
+        
+        # The download is wrapped in a WAV header and the raw staging file removed
+        samples, sample_rate = sf.read(output_path, dtype='int16')
+        self.assertEqual(samples.tolist(), [1, 2, 3])
+        self.assertEqual(sample_rate, 16000)
+        self.assertNotIn("task.wav.pcm", os.listdir(self._tmpdir))
+    
+    def test_split_sentences(self):
+        """Test sentence chunking respects the character limit."""
+        chunks = self.service._split_sentences("One. Two! Three? " + "word " * 30, max_chars=40)
+        
+        self.assertEqual(chunks[0], "One. Two! Three?")
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks))
+        self.assertEqual(" ".join(chunks).split(), ("One. Two! Three? " + "word " * 30).split())
     
     def test_text_to_speech_no_client(self):
         """Test text-to-speech without Polly client."""
@@ -198,7 +478,6 @@ class TestAudioService(unittest.TestCase):
     
     def test_text_to_speech_empty_text(self):
         """Test text-to-speech with empty text."""
-        self.service.polly_client = MagicMock()
         
         result = self.service.text_to_speech("")
         
@@ -207,19 +486,16 @@ class TestAudioService(unittest.TestCase):
     
     def test_text_to_speech_exception(self):
         """Test text-to-speech with Polly exception."""
-        self.service.polly_client = MagicMock()
         self.service.polly_client.synthesize_speech.side_effect = Exception("Polly error")
         
         result = self.service.text_to_speech(self.test_text)
         
         self.assertIsNone(result)
     
-    @patch('ffmpeg.input')
-    @patch('ffmpeg.output')
-    @patch('os.path.exists')
-    def test_merge_audio_with_video_success(self, mock_exists, mock_output, mock_input):
+    def test_merge_audio_with_video_success(self):
         """Test successful audio-video merging."""
-        mock_exists.side_effect = lambda path: True  # All files exist
+        dubbed_path = os.path.join(self._tmpdir, "test_video_dubbed.mp4")
+        self._existing_paths.update({self.test_video_path, self.test_audio_path, dubbed_path})
         
         # Mock ffmpeg objects
         mock_video_input = MagicMock()
@@ -227,57 +503,67 @@ class TestAudioService(unittest.TestCase):
         mock_video_input.__getitem__.return_value = "video_stream"
         mock_audio_input.__getitem__.return_value = "audio_stream"
         
-        mock_input.side_effect = [mock_video_input, mock_audio_input]
+        self.mock_input.side_effect = [mock_video_input, mock_audio_input]
         
         mock_output_obj = MagicMock()
-        mock_output.return_value = mock_output_obj
+        self.mock_output.return_value = mock_output_obj
         
         mock_run_obj = MagicMock()
         mock_output_obj.overwrite_output.return_value.run = mock_run_obj
         
-        result = self.service.merge_audio_with_video(
-            self.test_video_path, 
-            self.test_audio_path
-        )
+        with patch.object(self.service, '_ensure_aac', return_value="/tmp/test_audio.m4a") as mock_ensure_aac:
+            result = self.service.merge_audio_with_video(
+                self.test_video_path, 
+                self.test_audio_path
+            )
         
         self.assertIsNotNone(result)
-        self.assertTrue(result.endswith('_dubbed.mp4'))
+        self.assertEqual(result, dubbed_path)
         
         # Verify ffmpeg was called correctly
-        self.assertEqual(mock_input.call_count, 2)
-        mock_output.assert_called_once()
+        mock_ensure_aac.assert_called_once_with(self.test_audio_path)
+        self.assertEqual(self.mock_input.call_count, 2)
+        self.mock_input.assert_called_with("/tmp/test_audio.m4a")
+        self.mock_output.assert_called_once()
+        self.assertEqual(self.mock_output.call_args.kwargs['acodec'], 'copy')
         mock_run_obj.assert_called_once_with(quiet=True)
     
-    @patch('os.path.exists')
-    def test_merge_audio_with_video_files_not_found(self, mock_exists):
-        """Test audio-video merging with missing files."""
-        mock_exists.return_value = False
+    def test_ensure_aac(self):
+        """Test dubbed audio is transcoded to AAC once and reused."""
+        with open(self.test_audio_path, 'wb') as file:
+            file.write(b"fake_wav_data")
+        self.addCleanup(os.remove, self.test_audio_path)
+        self._existing_paths.add(self.test_audio_path)
         
-        result = self.service.merge_audio_with_video(
-            self.test_video_path, 
-            self.test_audio_path
-        )
+        self.assertEqual(self.service._ensure_aac("/tmp/dub.m4a"), "/tmp/dub.m4a")
         
-        self.assertIsNone(result)
+        aac_path = self.service._ensure_aac(self.test_audio_path)
+        
+        digest = hashlib.blake2b(b"fake_wav_data", digest_size=8).hexdigest()
+        self.assertEqual(aac_path, os.path.join(self._tmpdir, f"test_audio.{digest}.m4a"))
+        self.mock_input.assert_called_once_with(self.test_audio_path)
+        
+        with patch('os.path.exists', return_value=True):
+            self.assertEqual(self.service._ensure_aac(self.test_audio_path), aac_path)
+        self.mock_input.assert_called_once()
     
-    @patch('pydub.AudioSegment.from_file')
-    @patch('os.path.exists')
-    def test_adjust_audio_speed_success(self, mock_exists, mock_from_file):
+    def test_adjust_audio_speed_success(self):
         """Test successful audio speed adjustment."""
-        mock_exists.side_effect = lambda path: path == self.test_audio_path or path.endswith('_speed_1.2.wav')
+        speed_path = os.path.join(self._tmpdir, "test_audio_speed_1.2.wav")
+        self._existing_paths.update({self.test_audio_path, speed_path})
         
         # Mock audio segment
-        mock_audio = MagicMock()
+        mock_audio = Mock(spec=AudioSegment)
         mock_audio.frame_rate = 44100
         mock_audio.raw_data = b"fake_audio_data"
         mock_audio._spawn.return_value = mock_audio
         mock_audio.set_frame_rate.return_value = mock_audio
-        mock_from_file.return_value = mock_audio
+        self.mock_from_file.return_value = mock_audio
         
         result = self.service.adjust_audio_speed(self.test_audio_path, 1.2)
         
         self.assertIsNotNone(result)
-        self.assertTrue(result.endswith('_speed_1.2.wav'))
+        self.assertEqual(result, speed_path)
         
         # Verify speed adjustment
         expected_new_rate = int(44100 * 1.2)
@@ -288,95 +574,77 @@ class TestAudioService(unittest.TestCase):
         mock_audio.set_frame_rate.assert_called_once_with(44100)
         mock_audio.export.assert_called_once()
     
-    @patch('os.path.exists')
-    def test_adjust_audio_speed_file_not_found(self, mock_exists):
-        """Test audio speed adjustment with non-existent file."""
-        mock_exists.return_value = False
-        
-        result = self.service.adjust_audio_speed(self.test_audio_path, 1.2)
-        
-        self.assertIsNone(result)
+    def test_adjust_audio_speed_resamples(self):
+        """Test speed adjustment resamples decodable audio at the original rate."""
+        sf.write(self.test_audio_path, np.zeros((16000, 2), dtype='float32'), 16000)
+        self.addCleanup(os.remove, self.test_audio_path)
+        self._existing_paths.add(self.test_audio_path)
+        
+        result = self.service.adjust_audio_speed(self.test_audio_path, 2.0)
+        self.addCleanup(os.remove, result)
+        
+        info = sf.info(result)
+        self.assertEqual(info.samplerate, 16000)
+        self.assertEqual(info.channels, 2)
+        self.assertEqual(info.frames, 8000)
     
-    @patch('pydub.AudioSegment.from_file')
-    @patch('os.path.exists')
-    def test_get_audio_duration_success(self, mock_exists, mock_from_file):
+    def test_get_audio_duration_success(self):
         """Test successful audio duration retrieval."""
-        mock_exists.return_value = True
+        self._existing_paths.add(self.test_audio_path)
         
-        mock_audio = MagicMock()
+        mock_audio = MagicMock(spec=AudioSegment)
         mock_audio.__len__.return_value = 5000  # 5 seconds in milliseconds
-        mock_from_file.return_value = mock_audio
+        self.mock_from_file.return_value = mock_audio
         
         result = self.service.get_audio_duration(self.test_audio_path)
         
         self.assertEqual(result, 5.0)  # Should be converted to seconds
     
-    @patch('os.path.exists')
-    def test_get_audio_duration_file_not_found(self, mock_exists):
-        """Test audio duration retrieval with non-existent file."""
-        mock_exists.return_value = False
+    @patch('soundfile.SoundFile')
+    def test_get_audio_duration_from_header(self, mock_soundfile):
+        """Test audio duration is read from the file header without decoding."""
+        self._existing_paths.add(self.test_audio_path)
+        mock_file = mock_soundfile.return_value.__enter__.return_value
+        mock_file.frames = 48000
+        mock_file.samplerate = 16000
         
         result = self.service.get_audio_duration(self.test_audio_path)
         
-        self.assertIsNone(result)
-    
-    def test_get_default_voice(self):
-        """Test default voice selection for different languages."""
-        test_cases = [
-            ('en-US', 'Joanna'),
-            ('en-GB', 'Emma'),
-            ('es-ES', 'Lucia'),
-            ('fr-FR', 'Lea'),
-            ('de-DE', 'Marlene'),
-            ('unknown-XX', 'Joanna')  # Should default to Joanna
-        ]
-        
-        for language_code, expected_voice in test_cases:
-            with self.subTest(language_code=language_code):
-                result = self.service._get_default_voice(language_code)
-                self.assertEqual(result, expected_voice)
+        self.assertEqual(result, 3.0)
+        mock_file.read.assert_not_called()
+        self.mock_from_file.assert_not_called()
     
-    def test_supports_neural_voice(self):
-        """Test neural voice support detection."""
-        neural_voices = ['Joanna', 'Matthew', 'Amy', 'Emma']
-        standard_voices = ['Ivy', 'Russell', 'Nicole']
+    @patch('subprocess.check_output')
+    @patch('soundfile.SoundFile')
+    def test_get_audio_duration_ffprobe(self, mock_soundfile, mock_check_output):
+        """Test audio duration falls back to ffprobe for formats libsndfile can't read."""
+        self._existing_paths.add(self.test_audio_path)
+        mock_soundfile.side_effect = RuntimeError("Format not recognised")
+        mock_check_output.return_value = b"12.5\n"
         
-        for voice in neural_voices:
-            with self.subTest(voice=voice):
-                self.assertTrue(self.service._supports_neural_voice(voice))
+        result = self.service.get_audio_duration(self.test_audio_path)
         
-        for voice in standard_voices:
-            with self.subTest(voice=voice):
-                # Note: Some of these might actually support neural now
-                # This test checks the current implementation
-                result = self.service._supports_neural_voice(voice)
-                self.assertIsInstance(result, bool)
+        self.assertEqual(result, 12.5)
+        self.assertEqual(mock_check_output.call_args[0][0][0], "ffprobe")
+        self.mock_from_file.assert_not_called()
     
-    def test_get_available_voices_success(self):
-        """Test successful retrieval of available voices."""
-        mock_response = {
+    def test_supports_neural_voice_from_catalog(self):
+        """Test neural support is derived from one cached describe_voices call."""
+        self.service.polly_client.describe_voices.return_value = {
             'Voices': [
-                {
-                    'Id': 'Joanna',
-                    'Name': 'Joanna',
-                    'LanguageCode': 'en-US',
-                    'LanguageName': 'US English',
-                    'Gender': 'Female',
-                    'SupportedEngines': ['neural', 'standard']
-                },
-                {
-                    'Id': 'Matthew',
-                    'Name': 'Matthew',
-                    'LanguageCode': 'en-US',
-                    'LanguageName': 'US English',
-                    'Gender': 'Male',
-                    'SupportedEngines': ['neural', 'standard']
-                }
+                {'Id': 'Danielle', 'SupportedEngines': ['neural', 'long-form']},
+                {'Id': 'Ivy', 'SupportedEngines': ['standard']}
             ]
         }
         
-        self.service.polly_client = MagicMock()
-        self.service.polly_client.describe_voices.return_value = mock_response
+        self.assertTrue(self.service._supports_neural_voice('Danielle'))
+        self.assertFalse(self.service._supports_neural_voice('Ivy'))
+        self.assertFalse(self.service._supports_neural_voice('Joanna'))
+        self.service.polly_client.describe_voices.assert_called_once_with()
+    
+    def test_get_available_voices_success(self):
+        """Test successful retrieval of available voices."""
+        self.service.polly_client.describe_voices.return_value = load_polly_fixture('DescribeVoices_1')
         
         result = self.service.get_available_voices('en-US')
         
@@ -387,6 +655,10 @@ class TestAudioService(unittest.TestCase):
         self.assertEqual(result[1]['id'], 'Matthew')
         
         self.service.polly_client.describe_voices.assert_called_once_with(LanguageCode='en-US')
+        
+        # A repeated lookup for the same language is served from the cache
+        self.assertEqual(self.service.get_available_voices('en-US'), result)
+        self.service.polly_client.describe_voices.assert_called_once()
     
     def test_get_available_voices_no_client(self):
         """Test getting available voices without Polly client."""
@@ -398,39 +670,61 @@ class TestAudioService(unittest.TestCase):
     
     def test_get_available_voices_exception(self):
         """Test getting available voices with exception."""
-        self.service.polly_client = MagicMock()
         self.service.polly_client.describe_voices.side_effect = Exception("API error")
         
         result = self.service.get_available_voices()
         
         self.assertEqual(result, [])
 
+class TestVoiceSelection(unittest.TestCase):
+    """Table-driven tests for voice lookups that need no Polly client."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build one audio service without AWS credentials for every case."""
+        cls.service = AudioService()
+    
+    def test_get_default_voice(self):
+        """Test default voice selection for different languages."""
+        for language_code, expected_voice in _DEFAULT_VOICE_CASES:
+            with self.subTest(language_code=language_code):
+                self.assertEqual(self.service._get_default_voice(language_code), expected_voice)
+    
+    def test_supports_neural_voice(self):
+        """Test neural voice support detection."""
+        for voice in _NEURAL_VOICES:
+            with self.subTest(voice=voice):
+                self.assertTrue(self.service._supports_neural_voice(voice))
+        
+        for voice in _STANDARD_VOICES:
+            with self.subTest(voice=voice):
+                # Note: Some of these might actually support neural now
+                # This test checks the current implementation
+                self.assertIsInstance(self.service._supports_neural_voice(voice), bool)
+
+@unittest.skipUnless(
+    os.getenv('RUN_INTEGRATION_TESTS') == 'true',
+    "Integration tests disabled. Set RUN_INTEGRATION_TESTS=true to enable."
+)
 class TestAudioServiceIntegration(unittest.TestCase):
     """Integration tests for Audio service (requires actual AWS credentials)."""
     
-    def setUp(self):
-        """Set up integration test fixtures."""
+    @classmethod
+    def setUpClass(cls):
+        """Build one credentialed service shared by every integration test."""
         # Only run if AWS credentials are available
-        self.aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-        self.aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-        
-        if self.aws_access_key and self.aws_secret_key:
-            self.service = AudioService(
-                aws_access_key=self.aws_access_key,
-                aws_secret_key=self.aws_secret_key
-            )
-        else:
-            self.service = None
+        aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
+        aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
+        if not (aws_access_key and aws_secret_key):
+            raise unittest.SkipTest("AWS credentials not available")
+        
+        cls.service = AudioService(
+            aws_access_key=aws_access_key,
+            aws_secret_key=aws_secret_key
+        )
     
-    @unittest.skipUnless(
-        os.getenv('RUN_INTEGRATION_TESTS') == 'true',
-        "Integration tests disabled. Set RUN_INTEGRATION_TESTS=true to enable."
-    )
     def test_get_available_voices_integration(self):
         """Integration test for getting available voices."""
-        if not self.service or not self.service.polly_client:
-            self.skipTest("AWS credentials not available")
-        
         result = self.service.get_available_voices('en-US')
         
         self.assertIsInstance(result, list)
@@ -439,30 +733,28 @@ class TestAudioServiceIntegration(unittest.TestCase):
             self.assertIn('language_code', result[0])
             self.assertIn('gender', result[0])
     
-    @unittest.skipUnless(
-        os.getenv('RUN_INTEGRATION_TESTS') == 'true',
-        "Integration tests disabled. Set RUN_INTEGRATION_TESTS=true to enable."
-    )
     def test_text_to_speech_integration(self):
         """Integration test for text-to-speech conversion."""
-        if not self.service or not self.service.polly_client:
-            self.skipTest("AWS credentials not available")
-        
         test_text = "Hello, this is a test."
         
         result = self.service.text_to_speech(test_text, 'en-US', 'Joanna')
         
         if result:  # Only assert if TTS succeeded
+            self.addCleanup(os.remove, result)
             self.assertTrue(os.path.exists(result))
             self.assertTrue(result.endswith('.mp3'))
-            
-            # Clean up
-            os.remove(result)
 
 if __name__ == '__main__':
-    # Configure logging for tests
+    # Configure logging for tests; set TEST_LOG_LEVEL=DEBUG for the full service output
     import logging
-    logging.basicConfig(level=logging.DEBUG)
+    level = getattr(logging, os.environ.get('TEST_LOG_LEVEL', 'WARNING').upper())
+    logging.basicConfig(level=level)
+    # The services package configures INFO logging on import, so filter at the logger itself
+    logging.getLogger('services').setLevel(level)
+    
+    # Tests are independent (setUp resets all shared stubs), so keep definition order
+    # rather than sorting; for parallel runs use: pytest -n auto tests/test_audio_service.py
+    unittest.TestLoader.sortTestMethodsUsing = None
     
     # Run tests
     unittest.main(verbosity=2)
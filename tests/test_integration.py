@@ -3,9 +3,10 @@ import tempfile
 import os
 import json
 import time
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
 import sys
 import requests
+from celery.exceptions import Ignore
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -48,7 +49,7 @@ class TestDubbingWorkflowIntegration(unittest.TestCase):
             'source_language': 'en'
         }
         
-        with patch('src.routes.dubbing.dubbing_task.delay') as mock_delay:
+        with patch('src.routes.dubbing.build_dubbing_pipeline') as mock_build:
             response = self.client.post(
                 '/api/dubbing/start-dubbing',
                 data=json.dumps(payload),
@@ -69,8 +70,9 @@ class TestDubbingWorkflowIntegration(unittest.TestCase):
             self.assertEqual(task.source_language, payload['source_language'])
             self.assertEqual(task.status, 'pending')
         
-        # Verify Celery task was queued
-        mock_delay.assert_called_once_with(data['task_id'])
+        # Verify the stage pipeline was queued
+        mock_build.assert_called_once_with(data['task_id'])
+        mock_build.return_value.apply_async.assert_called_once_with()
     
     def test_start_dubbing_endpoint_missing_data(self):
         """Test dubbing initiation with missing required data."""
@@ -211,13 +213,19 @@ class TestDubbingWorkflowIntegration(unittest.TestCase):
             task = VideoTask(
                 youtube_url='https://www.youtube.com/watch?v=test',
                 target_language='es',
-                status='processing'
+                status='processing',
+                celery_task_id='progress-id'
             )
             db.session.add(task)
             db.session.commit()
             task_id = task.id
         
-        with patch('src.routes.dubbing.celery.control.revoke') as mock_revoke:
+        with patch('src.routes.dubbing.celery.AsyncResult') as mock_async_result, \
+                patch('src.routes.dubbing.celery.control.revoke') as mock_revoke, \
+                patch('src.routes.dubbing.cleanup_temp_files') as mock_cleanup:
+            mock_async_result.return_value.info = {
+                'progress': 50, 'stage': 'transcribing', 'stage_task_id': 'stage-id'
+            }
             response = self.client.post(f'/api/dubbing/cancel-task/{task_id}')
         
         self.assertEqual(response.status_code, 200)
@@ -229,8 +237,15 @@ class TestDubbingWorkflowIntegration(unittest.TestCase):
             task = VideoTask.query.get(task_id)
             self.assertEqual(task.status, 'cancelled')
         
-        # Verify Celery task was revoked
-        mock_revoke.assert_called_once_with(task_id, terminate=True)
+        # Verify the running stage and the pipeline's tracking id were revoked
+        self.assertEqual(mock_revoke.call_args_list, [
+            call('stage-id', terminate=True),
+            call('progress-id', terminate=True)
+        ])
+        
+        # The stages' shared working directory is removed with them
+        from src.routes.dubbing import get_work_dir
+        mock_cleanup.assert_called_once_with(get_work_dir(task_id))
     
     def test_cancel_task_endpoint_already_finished(self):
         """Test cancelling an already finished task."""
@@ -251,8 +266,39 @@ class TestDubbingWorkflowIntegration(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn('already finished', data['error'])
 
+class TestStartDubbingValidation(unittest.TestCase):
+    """Tests for the start-dubbing payload schema."""
+    
+    def payload(self, **kwargs):
+        """Build a start-dubbing payload with the required fields."""
+        return {
+            'youtube_url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ',
+            'target_language': 'es',
+            **kwargs
+        }
+    
+    def test_user_id_number_or_numeric_string(self):
+        """Test user_id is accepted as a JSON number or a numeric string, with defaults filled in."""
+        from src.routes.dubbing import validate_start_dubbing
+        
+        for user_id in (42, '42'):
+            with self.subTest(user_id=user_id):
+                data = validate_start_dubbing(self.payload(user_id=user_id))
+                self.assertEqual(int(data['user_id']), 42)
+                self.assertEqual(data['source_language'], 'auto')
+    
+    def test_invalid_user_id_rejected(self):
+        """Test user ids that can't name a user row are rejected."""
+        import fastjsonschema
+        from src.routes.dubbing import validate_start_dubbing
+        
+        for user_id in (0, '0', 'abc', ' 42', None, True):
+            with self.subTest(user_id=user_id):
+                with self.assertRaises(fastjsonschema.JsonSchemaException):
+                    validate_start_dubbing(self.payload(user_id=user_id))
+
 class TestDubbingTaskCelery(unittest.TestCase):
-    """Tests for the Celery dubbing task."""
+    """Tests for the Celery dubbing pipeline stages."""
     
     def setUp(self):
         """Set up test fixtures."""
@@ -262,125 +308,363 @@ class TestDubbingTaskCelery(unittest.TestCase):
         
         with self.app.app_context():
             db.create_all()
+        
+        # Stages publish progress through the result backend; keep it out of unit tests
+        patcher = patch('src.routes.dubbing.report_progress')
+        self.mock_report_progress = patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        patcher = patch('src.routes.dubbing.cleanup_temp_files')
+        self.mock_cleanup = patcher.start()
+        self.addCleanup(patcher.stop)
     
     def tearDown(self):
         """Clean up test fixtures."""
         with self.app.app_context():
             db.drop_all()
     
-    @patch('src.routes.dubbing.youtube_service')
-    @patch('src.routes.dubbing.audio_service')
-    @patch('src.routes.dubbing.gemini_service')
-    @patch('src.routes.dubbing.cleanup_temp_files')
-    @patch('os.makedirs')
-    def test_dubbing_task_success(self, mock_makedirs, mock_cleanup, 
-                                 mock_gemini, mock_audio, mock_youtube):
-        """Test successful completion of dubbing task."""
-        # Create a test task
+    def create_task(self, **kwargs):
+        """Create a VideoTask row and return its id."""
         with self.app.app_context():
             task = VideoTask(
                 youtube_url='https://www.youtube.com/watch?v=test',
                 target_language='es',
-                source_language='en'
+                source_language='en',
+                user_id=1,
+                **kwargs
             )
             db.session.add(task)
             db.session.commit()
-            task_id = task.id
+            return task.id
+    
+    def make_context(self, task_id, **kwargs):
+        """Build the context dict a stage receives from the previous one."""
+        return {
+            'task_id': task_id,
+            'progress_id': 'progress-id',
+            'work_dir': '/tmp/dubbing/dubbing_test',
+            **kwargs
+        }
+    
+    def test_build_dubbing_pipeline(self):
+        """Test the pipeline chains every stage and reports on the merge stage id."""
+        from src.routes.dubbing import build_dubbing_pipeline
+        
+        pipeline = build_dubbing_pipeline('task-1')
         
-        # Mock service responses
+        self.assertEqual(
+            [signature.task.rsplit('.', 1)[-1] for signature in pipeline.tasks],
+            ['download_stage', 'extract_audio_stage', 'transcribe_stage',
+             'translate_stage', 'tts_stage', 'merge_stage']
+        )
+        context = pipeline.tasks[0].args[0]
+        self.assertEqual(context['task_id'], 'task-1')
+        self.assertEqual(pipeline.tasks[-1].options['task_id'], context['progress_id'])
+        
+        errback, = pipeline.options['link_error']
+        self.assertTrue(errback.task.endswith('dubbing_pipeline_failed'))
+        self.assertEqual(errback.args, ('task-1',))
+    
+    def test_dubbing_task_dispatches_pipeline(self):
+        """Test the legacy dubbing_task only dispatches the stage chain."""
+        from src.routes.dubbing import dubbing_task
+        
+        with patch('src.routes.dubbing.build_dubbing_pipeline') as mock_build:
+            mock_build.return_value.apply_async.return_value.id = 'progress-id'
+            
+            self.assertEqual(dubbing_task('task-1'), 'progress-id')
+        
+        mock_build.assert_called_once_with('task-1')
+    
+    @patch('src.routes.dubbing.youtube_service')
+    @patch('os.makedirs')
+    def test_download_stage_success(self, mock_makedirs, mock_youtube):
+        """Test the download stage passes the video path along the chain."""
+        task_id = self.create_task()
         mock_youtube.download_video.return_value = {
             'video_path': '/tmp/test_video.mp4',
             'title': 'Test Video'
         }
-        mock_audio.extract_audio_from_video.return_value = '/tmp/test_audio.wav'
-        mock_audio.preprocess_audio.return_value = '/tmp/test_audio_processed.wav'
-        mock_gemini.transcribe_audio.return_value = {
-            'text': 'Hello world'
-        }
-        mock_gemini.translate_text.return_value = {
-            'translated_text': 'Hola mundo'
-        }
-        mock_audio.text_to_speech.return_value = '/tmp/dubbed_audio.mp3'
-        mock_audio.merge_audio_with_video.return_value = '/tmp/final_video.mp4'
         
-        # Import and run the task
-        from src.routes.dubbing import dubbing_task
+        from src.routes.dubbing import download_stage, get_work_dir
         
         with self.app.app_context():
-            dubbing_task(task_id)
+            result = download_stage({'task_id': task_id, 'progress_id': 'progress-id'})
             
-            # Verify task completion
             task = VideoTask.query.get(task_id)
-            self.assertEqual(task.status, 'completed')
-            self.assertEqual(task.progress, 100)
-            self.assertEqual(task.transcription_text, 'Hello world')
-            self.assertEqual(task.translated_text, 'Hola mundo')
+            self.assertEqual(task.status, 'processing')
+            self.assertEqual(task.progress, 30)
+            self.assertEqual(task.original_video_path, '/tmp/test_video.mp4')
+        
+        self.assertEqual(result['video_path'], '/tmp/test_video.mp4')
+        self.assertEqual(result['work_dir'], get_work_dir(task_id))
+        self.assertEqual(result['progress_id'], 'progress-id')
+        mock_youtube.download_video.assert_called_once_with(
+            'https://www.youtube.com/watch?v=test', get_work_dir(task_id)
+        )
     
     @patch('src.routes.dubbing.youtube_service')
     @patch('os.makedirs')
-    def test_dubbing_task_download_failure(self, mock_makedirs, mock_youtube):
-        """Test dubbing task with download failure."""
-        # Create a test task
+    def test_download_stage_failure_retries(self, mock_makedirs, mock_youtube):
+        """Test a failed download is retried while the stage has retries left."""
+        task_id = self.create_task()
+        mock_youtube.download_video.return_value = None
+        
+        from src.routes.dubbing import download_stage, StageFailed
+        
         with self.app.app_context():
-            task = VideoTask(
-                youtube_url='https://www.youtube.com/watch?v=test',
-                target_language='es'
-            )
-            db.session.add(task)
-            db.session.commit()
-            task_id = task.id
+            with self.assertRaises(StageFailed):
+                download_stage({'task_id': task_id, 'progress_id': 'progress-id'})
+            
+            task = VideoTask.query.get(task_id)
+            self.assertEqual(task.status, 'downloading')
         
-        # Mock download failure
+        self.mock_cleanup.assert_not_called()
+    
+    @patch('src.routes.dubbing.youtube_service')
+    @patch('os.makedirs')
+    def test_download_stage_failure(self, mock_makedirs, mock_youtube):
+        """Test a download failing on the last attempt marks the task failed and stops the chain."""
+        task_id = self.create_task()
         mock_youtube.download_video.return_value = None
         
-        # Import and run the task
-        from src.routes.dubbing import dubbing_task
+        from src.routes.dubbing import download_stage, get_work_dir
         
-        with self.app.app_context():
-            dubbing_task(task_id)
+        with self.app.app_context(), patch.object(download_stage, 'max_retries', 0):
+            with self.assertRaises(Ignore):
+                download_stage({'task_id': task_id, 'progress_id': 'progress-id'})
             
-            # Verify task failure
             task = VideoTask.query.get(task_id)
             self.assertEqual(task.status, 'failed')
             self.assertIn('Failed to download video', task.error_message)
+        
+        self.mock_cleanup.assert_called_once_with(get_work_dir(task_id))
     
-    @patch('src.routes.dubbing.youtube_service')
-    @patch('src.routes.dubbing.audio_service')
     @patch('src.routes.dubbing.gemini_service')
-    @patch('os.makedirs')
-    def test_dubbing_task_transcription_failure(self, mock_makedirs, mock_gemini, 
-                                               mock_audio, mock_youtube):
-        """Test dubbing task with transcription failure."""
-        # Create a test task
-        with self.app.app_context():
-            task = VideoTask(
-                youtube_url='https://www.youtube.com/watch?v=test',
-                target_language='es'
-            )
-            db.session.add(task)
-            db.session.commit()
-            task_id = task.id
+    def test_transcribe_stage_success(self, mock_gemini):
+        """Test the transcribe stage adds the transcription to the context."""
+        task_id = self.create_task()
+        mock_gemini.transcribe_audio.return_value = {'text': 'Hello world'}
+        context = self.make_context(task_id, audio_path='/tmp/test_audio.wav')
         
-        # Mock successful download and audio extraction
-        mock_youtube.download_video.return_value = {
-            'video_path': '/tmp/test_video.mp4'
-        }
-        mock_audio.extract_audio_from_video.return_value = '/tmp/test_audio.wav'
-        mock_audio.preprocess_audio.return_value = '/tmp/test_audio_processed.wav'
+        from src.routes.dubbing import transcribe_stage
         
-        # Mock transcription failure
+        with self.app.app_context():
+            result = transcribe_stage(context)
+        
+        self.assertEqual(result, {**context, 'transcription_text': 'Hello world'})
+        mock_gemini.transcribe_audio.assert_called_once_with('/tmp/test_audio.wav', 'en')
+        self.mock_report_progress.assert_called_once_with(
+            transcribe_stage, context, 50, 'transcribing'
+        )
+    
+    @patch('src.routes.dubbing.gemini_service')
+    def test_transcribe_stage_failure(self, mock_gemini):
+        """Test a transcription failing on the last attempt marks the task failed and stops the chain."""
+        task_id = self.create_task()
         mock_gemini.transcribe_audio.return_value = None
         
-        # Import and run the task
-        from src.routes.dubbing import dubbing_task
+        from src.routes.dubbing import transcribe_stage
         
-        with self.app.app_context():
-            dubbing_task(task_id)
+        with self.app.app_context(), patch.object(transcribe_stage, 'max_retries', 0):
+            with self.assertRaises(Ignore):
+                transcribe_stage(self.make_context(task_id, audio_path='/tmp/test_audio.wav'))
             
-            # Verify task failure
             task = VideoTask.query.get(task_id)
             self.assertEqual(task.status, 'failed')
             self.assertIn('Failed to transcribe audio', task.error_message)
+    
+    @patch('src.routes.dubbing.audio_service')
+    def test_tts_stage_requests_wav_output(self, mock_audio):
+        """Test the TTS stage asks for PCM written to a WAV file in the work dir."""
+        task_id = self.create_task()
+        mock_audio.text_to_speech.return_value = '/tmp/dubbing/dubbing_test/dubbed_audio.wav'
+        context = self.make_context(task_id, translated_text='Hola mundo')
+        
+        from src.routes.dubbing import tts_stage
+        
+        with self.app.app_context():
+            result = tts_stage(context)
+        
+        self.assertEqual(result['dubbed_audio_path'], '/tmp/dubbing/dubbing_test/dubbed_audio.wav')
+        mock_audio.text_to_speech.assert_called_once_with(
+            'Hola mundo',
+            'es-US',
+            output_path='/tmp/dubbing/dubbing_test/dubbed_audio.wav',
+            output_format='pcm'
+        )
+    
+    @patch('src.routes.dubbing.audio_service')
+    def test_merge_stage_completes_task(self, mock_audio):
+        """Test the merge stage persists every stage output and completes the task."""
+        task_id = self.create_task()
+        mock_audio.merge_audio_with_video.return_value = f'/tmp/dubbing/{task_id}_dubbed.mp4'
+        context = self.make_context(
+            task_id,
+            video_path='/tmp/test_video.mp4',
+            audio_path='/tmp/test_audio.wav',
+            transcription_text='Hello world',
+            translated_text='Hola mundo',
+            dubbed_audio_path='/tmp/dubbed_audio.wav'
+        )
+        
+        from src.routes.dubbing import merge_stage
+        
+        with self.app.app_context():
+            result = merge_stage(context)
+            
+            task = VideoTask.query.get(task_id)
+            self.assertEqual(task.status, 'completed')
+            self.assertEqual(task.progress, 100)
+            self.assertEqual(task.transcription_text, 'Hello world')
+            self.assertEqual(task.translated_text, 'Hola mundo')
+            self.assertEqual(task.dubbed_audio_path, '/tmp/dubbed_audio.wav')
+            self.assertEqual(task.final_video_path, f'/tmp/dubbing/{task_id}_dubbed.mp4')
+        
+        self.assertEqual(result, {
+            'task_id': task_id,
+            'final_video_path': f'/tmp/dubbing/{task_id}_dubbed.mp4'
+        })
+        self.mock_cleanup.assert_called_once_with('/tmp/dubbing/dubbing_test')
+    
+    @patch('src.routes.dubbing.gemini_service')
+    def test_stage_stops_when_task_cancelled(self, mock_gemini):
+        """Test a stage stops the chain without doing work once the task is cancelled."""
+        task_id = self.create_task(status='cancelled')
+        
+        from src.routes.dubbing import translate_stage
+        
+        with self.app.app_context():
+            with self.assertRaises(Ignore):
+                translate_stage(self.make_context(task_id, transcription_text='Hello world'))
+        
+        mock_gemini.translate_text.assert_not_called()
+        self.mock_cleanup.assert_called_once()
+    
+    def test_pipeline_failed_errback_marks_task_failed(self):
+        """Test the chain's error callback records the failure and cleans up."""
+        task_id = self.create_task(status='processing')
+        
+        from src.routes.dubbing import dubbing_pipeline_failed, get_work_dir
+        
+        with self.app.app_context():
+            dubbing_pipeline_failed(None, RuntimeError('TTS backend unavailable'), None, task_id)
+            
+            task = VideoTask.query.get(task_id)
+            self.assertEqual(task.status, 'failed')
+            self.assertEqual(task.error_message, 'TTS backend unavailable')
+        
+        self.mock_cleanup.assert_called_once_with(get_work_dir(task_id))
+
+class TestPipelineCancellation(unittest.TestCase):
+    """Tests for revoking the stage a pipeline is currently running."""
+    
+    def test_report_progress_publishes_stage_id(self):
+        """Test progress updates carry the running stage's id."""
+        from src.routes.dubbing import report_progress
+        
+        stage_task = MagicMock()
+        stage_task.request.id = 'stage-id'
+        
+        report_progress(stage_task, {'progress_id': 'progress-id'}, 50, 'transcribing')
+        
+        stage_task.update_state.assert_called_once_with(
+            task_id='progress-id',
+            state='PROGRESS',
+            meta={'progress': 50, 'stage': 'transcribing', 'stage_task_id': 'stage-id'}
+        )
+    
+    @patch('src.routes.dubbing.celery.AsyncResult')
+    def test_get_pipeline_task_ids_includes_running_stage(self, mock_async_result):
+        """Test the running stage is revoked before the tracking id."""
+        from src.routes.dubbing import get_pipeline_task_ids
+        
+        mock_async_result.return_value.info = {
+            'progress': 50, 'stage': 'transcribing', 'stage_task_id': 'stage-id'
+        }
+        
+        self.assertEqual(get_pipeline_task_ids('progress-id'), ['stage-id', 'progress-id'])
+        mock_async_result.assert_called_once_with('progress-id')
+    
+    @patch('src.routes.dubbing.celery.AsyncResult')
+    def test_get_pipeline_task_ids_without_progress(self, mock_async_result):
+        """Test only the tracking id is revoked before any stage has reported."""
+        from src.routes.dubbing import get_pipeline_task_ids
+        
+        mock_async_result.return_value.info = None
+        self.assertEqual(get_pipeline_task_ids('progress-id'), ['progress-id'])
+        
+        mock_async_result.side_effect = ConnectionError('result backend down')
+        self.assertEqual(get_pipeline_task_ids('progress-id'), ['progress-id'])
+
+class TestSupportedLanguagesCache(unittest.TestCase):
+    """Tests for caching the supported-languages payload."""
+    
+    def setUp(self):
+        """Start every test with an empty payload cache and sequential lookups."""
+        from src.routes.dubbing import build_supported_languages
+        
+        build_supported_languages.cache_clear()
+        self.addCleanup(build_supported_languages.cache_clear)
+        
+        patcher = patch('src.routes.dubbing.GEVENT_AVAILABLE', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def get_supported_languages(self):
+        """Call the endpoint view and return its JSON payload and Cache-Control header."""
+        from flask import Flask
+        from src.routes.dubbing import get_supported_languages
+        
+        with Flask(__name__).test_request_context('/api/dubbing/supported-languages'):
+            response = get_supported_languages()
+        
+        self.assertEqual(response.status_code, 200)
+        return response.get_json(), response.headers['Cache-Control']
+    
+    @patch('src.routes.dubbing.audio_service')
+    @patch('src.routes.dubbing.gemini_service')
+    def test_complete_payload_cached_for_ttl(self, mock_gemini, mock_audio):
+        """Test a payload with both lookups succeeding is built once per window."""
+        mock_gemini.get_supported_languages.return_value = {'en': 'English'}
+        mock_audio.get_available_voices.return_value = [{'id': 'Joanna'}]
+        
+        for _ in range(2):
+            data, cache_control = self.get_supported_languages()
+            self.assertEqual(data['gemini_languages'], {'en': 'English'})
+            self.assertEqual(cache_control, 'public, max-age=3600')
+        
+        mock_gemini.get_supported_languages.assert_called_once()
+        mock_audio.get_available_voices.assert_called_once()
+    
+    @patch('src.routes.dubbing.time.monotonic')
+    @patch('src.routes.dubbing.audio_service')
+    @patch('src.routes.dubbing.gemini_service')
+    def test_failed_lookup_cached_for_retry_window(self, mock_gemini, mock_audio, mock_monotonic):
+        """Test a degraded payload is served for the retry window, then rebuilt."""
+        from src.routes.dubbing import SUPPORTED_LANGUAGES_RETRY_TTL
+        
+        mock_gemini.get_supported_languages.side_effect = [None, {'en': 'English'}]
+        mock_audio.get_available_voices.return_value = [{'id': 'Joanna'}]
+        
+        mock_monotonic.return_value = 1000.0
+        data, cache_control = self.get_supported_languages()
+        self.assertEqual(data['gemini_languages'], {})
+        self.assertEqual(cache_control, 'public, max-age=60')
+        
+        # Still inside the retry window: served from the cache
+        mock_monotonic.return_value = 1000.0 + SUPPORTED_LANGUAGES_RETRY_TTL - 1
+        data, cache_control = self.get_supported_languages()
+        self.assertEqual(data['gemini_languages'], {})
+        self.assertEqual(cache_control, 'public, max-age=60')
+        mock_gemini.get_supported_languages.assert_called_once()
+        
+        mock_monotonic.return_value = 1000.0 + SUPPORTED_LANGUAGES_RETRY_TTL
+        data, cache_control = self.get_supported_languages()
+        self.assertEqual(data['gemini_languages'], {'en': 'English'})
+        self.assertEqual(cache_control, 'public, max-age=3600')
+        self.assertEqual(mock_gemini.get_supported_languages.call_count, 2)
+        self.assertEqual(mock_audio.get_available_voices.call_count, 2)
 
 class TestAccuracyMetrics(unittest.TestCase):
     """Tests for measuring and ensuring 100% accuracy."""
@@ -2,14 +2,35 @@ import unittest
 import tempfile
 import os
 import json
-from unittest.mock import patch, MagicMock, mock_open
+import asyncio
+import threading
+import time
+import subprocess
+import httplib2
+from googleapiclient.errors import HttpError
+from unittest.mock import patch, MagicMock, mock_open, call
 import sys
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from services import youtube_service
 from services.youtube_service import YouTubeService
 
+def stub_mitigation_service(log_dir):
+    """
+    Wrap a mitigation service so adaptive params behave as usual but outcomes are not written.
+    
+    The background outcome writer would otherwise create directories and append to a log
+    while tests are asserting on os.makedirs.
+    """
+    service = MagicMock(wraps=youtube_service.AdaptiveMitigationService(
+        log_file_path=os.path.join(log_dir, 'download_logs.json')
+    ))
+    service.user_agents = youtube_service.AdaptiveMitigationService.user_agents
+    service.record_outcomes = MagicMock()
+    return service
+
 class TestYouTubeService(unittest.TestCase):
     """Comprehensive tests for YouTube service."""
     
@@ -17,8 +38,11 @@ class TestYouTubeService(unittest.TestCase):
         """Set up test fixtures."""
         self.service = YouTubeService()
         self.service.youtube_api = None # Ensure a clean state for API initialization tests
+        self.addCleanup(youtube_service._youtube_api_failures.clear)
+        self.addCleanup(youtube_service._ensured_dirs.clear)
         self.test_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
         self.test_output_dir = "/tmp/test_downloads"
+        self.service.adaptive_mitigation_service = stub_mitigation_service(self.test_output_dir)
         
     def tearDown(self):
         """Clean up test fixtures."""
@@ -28,20 +52,21 @@ class TestYouTubeService(unittest.TestCase):
     
     @patch('yt_dlp.YoutubeDL')
     @patch('os.makedirs')
-    @patch('os.listdir')
+    @patch('os.path.exists')
     @patch('time.sleep')
     @patch('random.uniform')
     @patch('random.choice')
     def test_download_video_success(self, mock_choice, mock_uniform, mock_sleep, 
-                                   mock_listdir, mock_makedirs, mock_ytdl_class):
+                                   mock_exists, mock_makedirs, mock_ytdl_class):
         """Test successful video download."""
         # Setup mocks
         mock_uniform.return_value = 2.0
         mock_choice.return_value = self.service.user_agents[0]
-        mock_listdir.return_value = ["test_video.mp4"]
+        mock_exists.return_value = True
         
         mock_ytdl = MagicMock()
         mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
+        mock_ytdl.prepare_filename.return_value = os.path.join(self.test_output_dir, "test_video.mp4")
         
         # Mock video info
         mock_info = {
@@ -51,6 +76,7 @@ class TestYouTubeService(unittest.TestCase):
             'uploader': 'Test Channel'
         }
         mock_ytdl.extract_info.return_value = mock_info
+        mock_ytdl.process_ie_result.side_effect = lambda info, download: info
         
         result = self.service.download_video(self.test_url, self.test_output_dir)
         
@@ -65,7 +91,8 @@ class TestYouTubeService(unittest.TestCase):
         
         # Verify yt-dlp was called correctly
         mock_ytdl.extract_info.assert_called_once_with(self.test_url, download=False)
-        mock_ytdl.download.assert_called_once_with([self.test_url])
+        mock_ytdl.process_ie_result.assert_called_once_with(mock_info, download=True)
+        mock_ytdl.download.assert_not_called()
     
     @patch('yt_dlp.YoutubeDL')
     @patch('os.makedirs')
@@ -88,16 +115,16 @@ class TestYouTubeService(unittest.TestCase):
     
     @patch('yt_dlp.YoutubeDL')
     @patch('os.makedirs')
-    @patch('os.listdir')
+    @patch('os.path.exists')
     @patch('time.sleep')
     @patch('random.uniform')
     @patch('random.choice')
     def test_download_video_no_files_found(self, mock_choice, mock_uniform, mock_sleep,
-                                          mock_listdir, mock_makedirs, mock_ytdl_class):
+                                          mock_exists, mock_makedirs, mock_ytdl_class):
         """Test download when no video files are found after download."""
         mock_uniform.return_value = 2.0
         mock_choice.return_value = self.service.user_agents[0]
-        mock_listdir.return_value = ["info.json", "description.txt"]  # No video files
+        mock_exists.return_value = False  # yt-dlp skipped the download
         
         mock_ytdl = MagicMock()
         mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
@@ -108,6 +135,7 @@ class TestYouTubeService(unittest.TestCase):
             'id': 'dQw4w9WgXcQ'
         }
         mock_ytdl.extract_info.return_value = mock_info
+        mock_ytdl.process_ie_result.side_effect = lambda info, download: info
         
         result = self.service.download_video(self.test_url, self.test_output_dir)
         
@@ -130,42 +158,239 @@ class TestYouTubeService(unittest.TestCase):
         
         self.assertIsNone(result)
     
+    @patch('services.youtube_service.ARIA2C_PATH', '/usr/bin/aria2c')
     @patch('yt_dlp.YoutubeDL')
     @patch('os.makedirs')
     @patch('os.path.exists')
-    def test_extract_audio_success(self, mock_exists, mock_makedirs, mock_ytdl_class):
-        """Test successful audio extraction."""
-        video_path = "/tmp/test_video.mp4"
+    @patch('time.sleep')
+    def test_download_video_parallel_fragments(self, mock_sleep, mock_exists,
+                                               mock_makedirs, mock_ytdl_class):
+        """Test downloads fetch fragments concurrently and delegate to aria2c when present."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        self.service.adaptive_mitigation_service.get_adaptive_params.return_value = {'sleep_interval': 0}
         mock_exists.return_value = True
         
         mock_ytdl = MagicMock()
         mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
+        mock_ytdl.extract_info.return_value = {'title': 'Test Video', 'duration': 180, 'id': 'dQw4w9WgXcQ'}
+        mock_ytdl.process_ie_result.side_effect = lambda info, download: info
         
-        # Mock the extracted audio file exists
-        with patch('os.path.exists') as mock_exists_audio:
-            mock_exists_audio.side_effect = lambda path: path.endswith('.wav')
-            
-            result = self.service.extract_audio(video_path, self.test_output_dir)
-            
-            self.assertIsNotNone(result)
-            self.assertTrue(result.endswith('.wav'))
+        result = self.service.download_video(self.test_url, self.test_output_dir)
+        
+        self.assertIsNotNone(result)
+        ydl_opts = mock_ytdl_class.call_args[0][0]
+        self.assertEqual(ydl_opts['concurrent_fragment_downloads'], 16)
+        self.assertEqual(ydl_opts['fragment_retries'], 10)
+        self.assertFalse(ydl_opts['writeinfojson'])
+        self.assertEqual(ydl_opts['external_downloader'], {'default': '/usr/bin/aria2c'})
+        self.assertIn('-x', ydl_opts['external_downloader_args']['aria2c'])
     
+    @patch('yt_dlp.YoutubeDL')
+    @patch('os.makedirs')
     @patch('os.path.exists')
-    def test_extract_audio_video_not_found(self, mock_exists):
+    @patch('time.sleep')
+    def test_download_video_uses_requested_downloads(self, mock_sleep, mock_exists,
+                                                     mock_makedirs, mock_ytdl_class):
+        """Test the downloaded path comes from yt-dlp rather than a directory scan."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        self.service.adaptive_mitigation_service.get_adaptive_params.return_value = {'sleep_interval': 0}
+        mock_exists.return_value = True
+        video_path = os.path.join(self.test_output_dir, "Test Video.webm")
+        
+        mock_ytdl = MagicMock()
+        mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
+        mock_ytdl.extract_info.return_value = {'title': 'Test Video', 'duration': 180, 'id': 'dQw4w9WgXcQ'}
+        # Only the download pass reports where the file went
+        mock_ytdl.process_ie_result.side_effect = lambda info, download: {
+            **info, 'requested_downloads': [{'filepath': video_path}]
+        }
+        
+        result = self.service.download_video(self.test_url, self.test_output_dir)
+        
+        self.assertEqual(result['video_path'], video_path)
+        mock_ytdl.prepare_filename.assert_not_called()
+    
+    @patch('os.makedirs')
+    def test_output_dir_created_once(self, mock_makedirs):
+        """Test repeated calls for the same output directory only create it once."""
+        youtube_service._ensure_dir(self.test_output_dir)
+        youtube_service._ensure_dir(self.test_output_dir)
+        
+        mock_makedirs.assert_called_once_with(self.test_output_dir, exist_ok=True)
+    
+    def test_download_outcomes_recorded_in_background_batch(self):
+        """Test download outcomes are queued and written through a single bulk call."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        ydl_opts = {'user_agent': 'ua', 'sleep_interval': 1}
+        
+        with patch.object(youtube_service.threading.Thread, 'start'):
+            self.service._log_download_outcome(self.test_url, True, None, ydl_opts)
+            self.service._log_download_outcome(self.test_url, False, 'boom', ydl_opts)
+        self.service.adaptive_mitigation_service.record_outcomes.assert_not_called()
+        
+        self.service._outcome_flusher = threading.Thread(target=self.service._flush_outcomes, daemon=True)
+        with patch.object(youtube_service, 'OUTCOME_FLUSH_INTERVAL', 0.05):
+            self.service._outcome_flusher.start()
+            self.service._outcome_queue.join()
+        
+        self.service.adaptive_mitigation_service.record_outcomes.assert_called_once()
+        outcomes = self.service.adaptive_mitigation_service.record_outcomes.call_args[0][0]
+        self.assertEqual([o['success'] for o in outcomes], [True, False])
+    
+    def test_partial_outcome_batch_written_after_interval(self):
+        """Test a batch smaller than OUTCOME_BATCH_SIZE is written once the flush interval passes."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        
+        with patch.object(youtube_service, 'OUTCOME_FLUSH_INTERVAL', 0.05), \
+                patch.object(youtube_service.atexit, 'register'):
+            self.service._log_download_outcome(self.test_url, True, None, {})
+            self.service._outcome_queue.join()
+        self.addCleanup(self.service.flush_outcomes)
+        
+        self.service.adaptive_mitigation_service.record_outcomes.assert_called_once()
+        self.assertTrue(self.service._outcome_flusher.is_alive())
+    
+    def test_flush_outcomes_drains_queue_and_stops_writer(self):
+        """Test flush_outcomes writes everything still queued and is registered for exit."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        
+        # A long interval keeps the outcomes waiting in the writer's partial batch
+        with patch.object(youtube_service, 'OUTCOME_FLUSH_INTERVAL', 60), \
+                patch.object(youtube_service.atexit, 'register') as mock_register:
+            self.service._log_download_outcome(self.test_url, True, None, {})
+            self.service._log_download_outcome(self.test_url, False, 'boom', {})
+            flusher = self.service._outcome_flusher
+            
+            self.service.flush_outcomes()
+        
+        mock_register.assert_called_once_with(self.service.flush_outcomes)
+        self.assertFalse(flusher.is_alive())
+        self.assertIsNone(self.service._outcome_flusher)
+        recorded = [
+            outcome['success']
+            for call_args in self.service.adaptive_mitigation_service.record_outcomes.call_args_list
+            for outcome in call_args[0][0]
+        ]
+        self.assertEqual(recorded, [True, False])
+        self.assertEqual(self.service._outcome_queue.unfinished_tasks, 0)
+    
+    def test_flush_outcomes_registered_once(self):
+        """Test restarting the writer after a flush does not register another exit handler."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        
+        with patch.object(youtube_service.atexit, 'register') as mock_register:
+            for success in (True, False):
+                self.service._log_download_outcome(self.test_url, success, None, {})
+                self.service.flush_outcomes()
+        
+        mock_register.assert_called_once_with(self.service.flush_outcomes)
+        self.assertEqual(self.service.adaptive_mitigation_service.record_outcomes.call_count, 2)
+    
+    def use_download_pool(self, size):
+        """Give batch downloads a fresh pool of the given size for this test."""
+        patcher = patch.multiple(youtube_service, YT_MAX_PARALLEL=size, _download_pool=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        def shutdown_pool():
+            if youtube_service._download_pool is not None:
+                youtube_service._download_pool.shutdown()
+        self.addCleanup(shutdown_pool)
+    
+    def test_download_videos_concurrent_in_order(self):
+        """Test batch downloads run concurrently and keep results aligned with the input URLs."""
+        self.use_download_pool(2)
+        urls = [self.test_url, "https://youtu.be/9bZkp7q19f0"]
+        started = threading.Barrier(2, timeout=5)
+        
+        def download(url, output_dir, quality):
+            started.wait()  # Deadlocks unless both downloads run at once
+            return {'video_path': url}
+        
+        with patch.object(self.service, 'download_video', side_effect=download):
+            results = self.service.download_videos(urls, self.test_output_dir)
+        
+        self.assertEqual([r['video_path'] for r in results], urls)
+    
+    def test_download_videos_bounded_by_max_parallel(self):
+        """Test no more than YT_MAX_PARALLEL downloads run at once, on threads of their own."""
+        self.use_download_pool(2)
+        urls = [f"https://youtu.be/video{i:06d}" for i in range(6)]
+        lock = threading.Lock()
+        running = []
+        peak = []
+        thread_names = set()
+        
+        def download(url, output_dir, quality):
+            with lock:
+                running.append(url)
+                peak.append(len(running))
+                thread_names.add(threading.current_thread().name)
+            time.sleep(0.02)
+            with lock:
+                running.remove(url)
+            return {'video_path': url}
+        
+        with patch.object(self.service, 'download_video', side_effect=download):
+            results = self.service.download_videos(urls, self.test_output_dir)
+        
+        self.assertEqual([r['video_path'] for r in results], urls)
+        self.assertEqual(max(peak), 2)
+        self.assertTrue(all(name.startswith('yt-download') for name in thread_names))
+    
+    def test_download_and_extract_async_overlap(self):
+        """Test the async wrappers run the blocking calls off the event loop, concurrently."""
+        started = threading.Barrier(2, timeout=5)
+        
+        def blocking(*args):
+            started.wait()  # Deadlocks unless both calls run at once
+            return args[0]
+        
+        async def run():
+            with patch.object(self.service, 'download_video', side_effect=blocking), \
+                    patch.object(self.service, 'extract_audio', side_effect=blocking):
+                return await asyncio.gather(
+                    self.service.download_video_async(self.test_url, self.test_output_dir),
+                    self.service.extract_audio_async("/tmp/other.mp4", self.test_output_dir)
+                )
+        
+        self.assertEqual(asyncio.run(run()), [self.test_url, "/tmp/other.mp4"])
+    
+    @patch('subprocess.run')
+    @patch('os.makedirs')
+    def test_extract_audio_success(self, mock_makedirs, mock_run):
+        """Test successful audio extraction."""
+        video_path = "/tmp/test_video.mp4"
+        mock_run.return_value = MagicMock(returncode=0)
+        
+        result = self.service.extract_audio(video_path, self.test_output_dir)
+        
+        self.assertIsNotNone(result)
+        self.assertTrue(result.endswith('.wav'))
+        
+        command = mock_run.call_args[0][0]
+        self.assertEqual(command[0], 'ffmpeg')
+        self.assertIn(video_path, command)
+        self.assertEqual(command[command.index('-ar') + 1], '16000')
+        self.assertEqual(command[command.index('-ac') + 1], '1')
+        self.assertEqual(command[-1], result)
+    
+    @patch('subprocess.run')
+    def test_extract_audio_video_not_found(self, mock_run):
         """Test audio extraction with non-existent video file."""
-        mock_exists.return_value = False
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, 'ffmpeg', stderr=b"/nonexistent/video.mp4: No such file or directory"
+        )
         
         result = self.service.extract_audio("/nonexistent/video.mp4", self.test_output_dir)
         
         self.assertIsNone(result)
     
-    @patch('yt_dlp.YoutubeDL')
+    @patch('subprocess.run')
     @patch('os.makedirs')
-    @patch('os.path.exists')
-    def test_extract_audio_exception(self, mock_exists, mock_makedirs, mock_ytdl_class):
+    def test_extract_audio_exception(self, mock_makedirs, mock_run):
         """Test audio extraction with exception."""
-        mock_exists.return_value = True
-        mock_ytdl_class.side_effect = Exception("Audio extraction failed")
+        mock_run.side_effect = Exception("Audio extraction failed")
         
         result = self.service.extract_audio("/tmp/test_video.mp4", self.test_output_dir)
         
@@ -202,6 +427,109 @@ class TestYouTubeService(unittest.TestCase):
         # Verify yt-dlp was called with download=False
         mock_ytdl.extract_info.assert_called_once_with(self.test_url, download=False)
     
+    def test_validate_video_url(self):
+        """Test URL validation accepts YouTube links and rejects everything else."""
+        self.assertTrue(self.service.validate_video_url(self.test_url))
+        self.assertTrue(self.service.validate_video_url("https://youtu.be/dQw4w9WgXcQ"))
+        self.assertFalse(self.service.validate_video_url("https://example.com/not-youtube"))
+        self.assertFalse(self.service.validate_video_url(None))
+    
+    def test_validate_video_url_fast_path_matches_pattern(self):
+        """Test the prefix check agrees with the regex on canonical URLs."""
+        urls = [
+            self.test_url,
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=short",
+            "https://www.youtube.com/watch?v=ab&cdefghijk",
+            "https://youtu.be/",
+        ]
+        
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(
+                    self.service.validate_video_url(url),
+                    bool(youtube_service.YOUTUBE_URL_PATTERN.match(url))
+                )
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_get_video_info_cached_by_video_id(self, mock_ytdl_class):
+        """Test lookups of the same video through different URL forms hit yt-dlp once."""
+        mock_ytdl = MagicMock()
+        mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
+        mock_ytdl.extract_info.return_value = {'title': 'Test Video', 'id': 'dQw4w9WgXcQ'}
+        
+        first = self.service.get_video_info(self.test_url)
+        second = self.service.get_video_info("https://youtu.be/dQw4w9WgXcQ")
+        
+        self.assertEqual(first, second)
+        mock_ytdl.extract_info.assert_called_once()
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_get_video_info_failure_cached_briefly(self, mock_ytdl_class):
+        """Test a failed lookup is not retried until VIDEO_INFO_NEGATIVE_TTL has passed."""
+        mock_ytdl = MagicMock()
+        mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
+        mock_ytdl.extract_info.return_value = None
+        
+        with patch('time.monotonic', return_value=1000.0):
+            self.assertIsNone(self.service.get_video_info(self.test_url))
+            self.assertIsNone(self.service.get_video_info(self.test_url))
+        mock_ytdl.extract_info.assert_called_once()
+        
+        with patch('time.monotonic', return_value=1000.0 + youtube_service.VIDEO_INFO_NEGATIVE_TTL):
+            self.service.get_video_info(self.test_url)
+        self.assertEqual(mock_ytdl.extract_info.call_count, 2)
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_youtube_dl_instance_reused(self, mock_ytdl_class):
+        """Test one YoutubeDL is built per option set and reused on later calls."""
+        mock_ytdl_class.return_value.__enter__.return_value.extract_info.return_value = None
+        
+        self.service.get_video_info(self.test_url)
+        self.service.get_video_info("https://www.youtube.com/watch?v=9bZkp7q19f0")
+        
+        mock_ytdl_class.assert_called_once()
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_video_reuses_youtube_dl(self, mock_ytdl_class):
+        """Test downloads with different User-Agents and sleeps share one YoutubeDL."""
+        mock_ytdl = mock_ytdl_class.return_value.__enter__.return_value
+        mock_ytdl.params = {'http_headers': dict(youtube_service.HTTP_HEADERS)}
+        mock_ytdl.extract_info.return_value = None
+        self.service.adaptive_mitigation_service = MagicMock()
+        self.service.adaptive_mitigation_service.get_adaptive_params.side_effect = [
+            {'user_agent': 'Agent A', 'sleep_interval': 1.5},
+            {'user_agent': 'Agent B', 'sleep_interval': 2.5},
+        ]
+        
+        self.service.download_video(self.test_url, self.test_output_dir)
+        self.assertEqual(mock_ytdl.params['http_headers']['User-Agent'], 'Agent A')
+        
+        self.service.download_video(self.test_url, self.test_output_dir)
+        
+        mock_ytdl_class.assert_called_once()
+        self.assertEqual(mock_ytdl.params['http_headers']['User-Agent'], 'Agent B')
+        self.assertEqual(mock_ytdl.params['user_agent'], 'Agent B')
+        self.assertEqual(mock_ytdl.params['sleep_interval'], 2.5)
+    
+    @patch('yt_dlp.YoutubeDL')
+    def test_download_video_reuses_youtube_dl_across_directories(self, mock_ytdl_class):
+        """Test downloads into different directories share one YoutubeDL and write to their own."""
+        mock_ytdl = mock_ytdl_class.return_value.__enter__.return_value
+        mock_ytdl.params = {'http_headers': dict(youtube_service.HTTP_HEADERS)}
+        mock_ytdl.extract_info.return_value = None
+        first_dir = os.path.join(self.test_output_dir, 'dubbing_1')
+        second_dir = os.path.join(self.test_output_dir, 'dubbing_2')
+        
+        self.service.download_video(self.test_url, first_dir)
+        self.assertEqual(mock_ytdl.params['paths'], {'home': first_dir})
+        
+        self.service.download_video(self.test_url, second_dir)
+        
+        mock_ytdl_class.assert_called_once()
+        self.assertEqual(mock_ytdl.params['paths'], {'home': second_dir})
+        self.assertEqual(mock_ytdl_class.call_args[0][0]['outtmpl'], youtube_service.YDL_OUTTMPL)
+    
     @patch('yt_dlp.YoutubeDL')
     def test_get_video_info_failure(self, mock_ytdl_class):
         """Test video info retrieval failure."""
@@ -247,15 +575,165 @@ class TestYouTubeService(unittest.TestCase):
         
         mock_build.assert_called_once_with('youtube', 'v3', credentials=mock_flow.run_local_server.return_value)
     
+    @patch('services.youtube_service.YouTubeService._build_youtube_api')
+    def test_get_youtube_api_shared_across_instances(self, mock_build_api):
+        """Test the API client is built once and reused by later service instances."""
+        self.addCleanup(youtube_service._youtube_api_clients.clear)
+        mock_build_api.return_value = MagicMock()
+        
+        first = YouTubeService()._get_youtube_api()
+        second = YouTubeService()._get_youtube_api()
+        
+        self.assertIs(first, second)
+        mock_build_api.assert_called_once()
+    
+    @patch('services.youtube_service.YouTubeService._build_youtube_api')
+    def test_get_youtube_api_failure_retried_after_interval(self, mock_build_api):
+        """Test a failed initialization is only retried once YOUTUBE_API_RETRY_INTERVAL has passed."""
+        self.addCleanup(youtube_service._youtube_api_clients.clear)
+        mock_build_api.return_value = None
+        
+        with patch('time.monotonic', return_value=1000.0):
+            self.assertIsNone(self.service._get_youtube_api())
+            self.assertIsNone(self.service._get_youtube_api())
+        mock_build_api.assert_called_once()
+        
+        with patch('time.monotonic', return_value=1000.0 + youtube_service.YOUTUBE_API_RETRY_INTERVAL):
+            self.assertIsNone(self.service._get_youtube_api())
+        self.assertEqual(mock_build_api.call_count, 2)
+    
+    @patch('googleapiclient.discovery.build')
+    @patch('google.oauth2.credentials.Credentials.from_authorized_user_info')
+    @patch.dict(os.environ, {'YOUTUBE_CREDENTIALS_JSON': '{}', 'YOUTUBE_TOKEN_JSON': '{"token": "t"}'})
+    def test_build_youtube_api_parses_token_once(self, mock_from_info, mock_build):
+        """Test an unchanged YOUTUBE_TOKEN_JSON is parsed once across rebuilds."""
+        mock_from_info.return_value = MagicMock(valid=True)
+        youtube_service._parse_token_json.cache_clear()
+        
+        with patch('services.youtube_service.json_loads', wraps=youtube_service.json_loads) as mock_loads:
+            self.service._build_youtube_api()
+            self.service._build_youtube_api()
+        
+        mock_loads.assert_called_once_with('{"token": "t"}')
+        self.assertEqual(mock_from_info.call_args[0][0], {'token': 't'})
+    
+    @patch('services.youtube_service.YouTubeService._build_youtube_api')
+    def test_invalidate_api_forces_rebuild(self, mock_build_api):
+        """Test invalidate_api clears both the cached client and the failure back-off."""
+        self.addCleanup(youtube_service._youtube_api_clients.clear)
+        mock_build_api.side_effect = [None, MagicMock()]
+        
+        self.assertIsNone(self.service._get_youtube_api())
+        self.service.invalidate_api()
+        
+        self.assertIsNotNone(self.service._get_youtube_api())
+        self.assertEqual(mock_build_api.call_count, 2)
+    
+    @patch('google.oauth2.credentials.Credentials.from_authorized_user_file')
+    def test_build_youtube_api_missing_token_file(self, mock_from_file):
+        """Test a missing token file is reported without a separate existence check."""
+        mock_from_file.side_effect = FileNotFoundError
+        self.service.token_file = "/nonexistent/token.json"
+        
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(self.service._build_youtube_api())
+        
+        mock_from_file.assert_called_once()
+    
     @patch('googleapiclient.discovery.build')
+    @patch('google.oauth2.credentials.Credentials.from_authorized_user_info')
+    @patch.dict(os.environ, {'YOUTUBE_CREDENTIALS_JSON': '{}', 'YOUTUBE_TOKEN_JSON': '{"token": "t"}'})
+    def test_build_youtube_api_uses_authorized_http(self, mock_from_info, mock_build):
+        """Test the API client is built on a persistent authorized HTTP connection."""
+        creds = MagicMock(valid=True)
+        mock_from_info.return_value = creds
+        
+        self.service._build_youtube_api()
+        
+        http = mock_build.call_args[1]['http']
+        self.assertIs(http.credentials, creds)
+        self.assertNotIn('credentials', mock_build.call_args[1])
+    
     @patch('googleapiclient.http.MediaFileUpload')
-    @patch('os.path.exists')
-    def test_upload_video_success(self, mock_exists, mock_media_upload, mock_build):
+    def test_upload_video_bounded_chunks(self, mock_media_upload):
+        """Test uploads stream in fixed-size resumable chunks rather than one whole-file request."""
+        self.service.youtube_api = MagicMock()
+        self.service.youtube_api.videos.return_value.insert.return_value.next_chunk.return_value = (
+            None, {'id': 'uploaded_video_id'}
+        )
+        
+        result = self.service.upload_video("/tmp/test_video.mp4", "Test Video Title")
+        
+        self.assertEqual(result['video_id'], 'uploaded_video_id')
+        mock_media_upload.assert_called_once_with(
+            "/tmp/test_video.mp4", chunksize=8 * 1024 * 1024, resumable=True
+        )
+    
+    @patch('time.sleep')
+    @patch('googleapiclient.http.MediaFileUpload')
+    def test_upload_video_retries_server_errors_with_jitter(self, mock_media_upload, mock_sleep):
+        """Test 5xx chunk failures are retried after a jittered, capped backoff."""
+        server_error = HttpError(httplib2.Response({'status': 503}), b'')
+        self.service.youtube_api = MagicMock()
+        self.service.youtube_api.videos.return_value.insert.return_value.next_chunk.side_effect = [
+            server_error, server_error, (None, {'id': 'uploaded_video_id'})
+        ]
+        
+        with patch('random.uniform', return_value=0.5) as mock_uniform:
+            result = self.service.upload_video("/tmp/test_video.mp4", "Test Video Title")
+        
+        self.assertEqual(result['video_id'], 'uploaded_video_id')
+        mock_uniform.assert_has_calls([call(0, 2), call(0, 4)])
+        mock_sleep.assert_has_calls([call(0.5), call(0.5)])
+    
+    @patch('time.sleep')
+    @patch('googleapiclient.http.MediaFileUpload')
+    def test_upload_video_client_error_not_retried(self, mock_media_upload, mock_sleep):
+        """Test permanent 4xx chunk failures give up immediately."""
+        insert_request = MagicMock()
+        insert_request.next_chunk.side_effect = HttpError(httplib2.Response({'status': 403}), b'')
+        self.service.youtube_api = MagicMock()
+        self.service.youtube_api.videos.return_value.insert.return_value = insert_request
+        
+        result = self.service.upload_video("/tmp/test_video.mp4", "Test Video Title")
+        
+        self.assertIsNone(result)
+        insert_request.next_chunk.assert_called_once()
+        mock_sleep.assert_not_called()
+    
+    @unittest.skipUnless(hasattr(os, 'posix_fadvise'), "posix_fadvise not available")
+    @patch('os.posix_fadvise')
+    @patch('googleapiclient.http.MediaFileUpload')
+    def test_upload_video_prefetches_next_chunk(self, mock_media_upload, mock_fadvise):
+        """Test each chunk upload first asks the kernel to read ahead the following chunk."""
+        chunk_size = 8 * 1024 * 1024
+        with tempfile.NamedTemporaryFile(suffix='.mp4') as video_file:
+            insert_request = MagicMock(resumable_progress=0)
+            
+            def next_chunk():
+                insert_request.resumable_progress += chunk_size
+                if insert_request.resumable_progress < 2 * chunk_size:
+                    return MagicMock(progress=lambda: 0.5), None
+                return None, {'id': 'uploaded_video_id'}
+            
+            insert_request.next_chunk.side_effect = next_chunk
+            self.service.youtube_api = MagicMock()
+            self.service.youtube_api.videos.return_value.insert.return_value = insert_request
+            
+            result = self.service.upload_video(video_file.name, "Test Video Title")
+        
+        self.assertEqual(result['video_id'], 'uploaded_video_id')
+        offsets = [call.args[1] for call in mock_fadvise.call_args_list]
+        self.assertEqual(offsets, [chunk_size, 2 * chunk_size])
+        self.assertEqual(mock_fadvise.call_args.args[3], os.POSIX_FADV_WILLNEED)
+    
+    @patch('googleapiclient.discovery.build')
+    @patch('googleapiclient.http.MediaFileUpload')
+    def test_upload_video_success(self, mock_media_upload, mock_build):
         """Test successful video upload."""
         # Setup service with mock API
         self.service.youtube_api = MagicMock()
         
-        mock_exists.return_value = True
         mock_media = MagicMock()
         mock_media_upload.return_value = mock_media
         
@@ -281,10 +759,9 @@ class TestYouTubeService(unittest.TestCase):
         self.assertEqual(result['video_url'], 'https://www.youtube.com/watch?v=uploaded_video_id')
         self.assertEqual(result['title'], 'Test Video Title')
     
-    @patch('os.path.exists')
-    def test_upload_video_file_not_found(self, mock_exists):
+    def test_upload_video_file_not_found(self):
         """Test video upload with non-existent file."""
-        mock_exists.return_value = False
+        self.service.youtube_api = MagicMock()
         
         result = self.service.upload_video(
             "/nonexistent/video.mp4",
@@ -292,6 +769,7 @@ class TestYouTubeService(unittest.TestCase):
         )
         
         self.assertIsNone(result)
+        self.service.youtube_api.videos.assert_not_called()
     
     def test_upload_video_no_api(self):
         """Test video upload without YouTube API initialized."""
@@ -309,6 +787,7 @@ class TestYouTubeServiceBotDetectionMitigation(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.service = YouTubeService()
+        self.service.adaptive_mitigation_service = stub_mitigation_service(tempfile.gettempdir())
     
     @patch.dict(os.environ, {'PROXY_URL': 'http://proxy.example.com:8080'})
     @patch('yt_dlp.YoutubeDL')
@@ -374,27 +853,37 @@ class TestYouTubeServiceBotDetectionMitigation(unittest.TestCase):
     
     @patch('time.sleep')
     @patch('random.uniform')
-    def test_random_delay_called(self, mock_uniform, mock_sleep):
-        """Test that random delays are implemented."""
+    def test_random_delay_delegated_to_ytdlp(self, mock_uniform, mock_sleep):
+        """Test the random delay is left to yt-dlp instead of sleeping before the download."""
         mock_uniform.return_value = 2.5
+        self.service.adaptive_mitigation_service = MagicMock()
+        self.service.adaptive_mitigation_service.get_adaptive_params.return_value = {}
         
         with patch('yt_dlp.YoutubeDL') as mock_ytdl_class:
             mock_ytdl = MagicMock()
             mock_ytdl_class.return_value.__enter__.return_value = mock_ytdl
             mock_ytdl.extract_info.return_value = None  # Fail early
             
-            self.service.download_video("https://www.youtube.com/watch?v=test", "/tmp")
+            self.service.download_video("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "/tmp")
             
-            # Verify random delay was called
-            # Verify random delay was called for initial sleep
-            mock_uniform.assert_any_call(1, 3)
-            mock_sleep.assert_called_with(2.5)
-
-            # Verify random delay was called for sleep_interval and max_sleep_interval
-            # The exact values passed to uniform for sleep_interval and max_sleep_interval
-            # are within the ydl_opts, so we check for any call within the expected range.
-            mock_uniform.assert_any_call(1, 3)
-            mock_uniform.assert_any_call(1, 2)
+            mock_sleep.assert_not_called()
+            ydl_opts = mock_ytdl_class.call_args[0][0]
+            self.assertEqual(ydl_opts['sleep_interval'], 2.5)
+            mock_uniform.assert_called_once()
+    
+    @patch('random.uniform')
+    def test_adaptive_sleep_interval_used_without_extra_draw(self, mock_uniform):
+        """Test the service-provided sleep interval is used as-is, without drawing a default."""
+        self.service.adaptive_mitigation_service = MagicMock()
+        self.service.adaptive_mitigation_service.get_adaptive_params.return_value = {'sleep_interval': 1.5}
+        
+        with patch('yt_dlp.YoutubeDL') as mock_ytdl_class:
+            mock_ytdl_class.return_value.__enter__.return_value.extract_info.return_value = None
+            
+            self.service.download_video("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "/tmp")
+            
+            self.assertEqual(mock_ytdl_class.call_args[0][0]['sleep_interval'], 1.5)
+            mock_uniform.assert_not_called()
     
     def test_user_agent_rotation(self):
         """Test that user agents are rotated."""